@@ -0,0 +1,23 @@
+"""etag da uploads playlist por canal
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-17
+
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "0004"
+down_revision: Union[str, None] = "0003"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("youtube_channels", sa.Column("uploads_playlist_etag", sa.String(255), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("youtube_channels", "uploads_playlist_etag")
@@ -0,0 +1,25 @@
+"""detalhes do vídeo via videos.list (ao vivo, legendas)
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-17
+
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "0005"
+down_revision: Union[str, None] = "0004"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("videos", sa.Column("live_broadcast_content", sa.String(20), nullable=True))
+    op.add_column("videos", sa.Column("has_captions", sa.Boolean(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("videos", "has_captions")
+    op.drop_column("videos", "live_broadcast_content")
@@ -0,0 +1,26 @@
+"""backend de descoberta por canal (api | rss)
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-17
+
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "0006"
+down_revision: Union[str, None] = "0005"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "youtube_channels",
+        sa.Column("discovery_backend", sa.String(20), nullable=False, server_default="api"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("youtube_channels", "discovery_backend")
@@ -0,0 +1,44 @@
+"""outbox transacional de tasks Celery
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-17
+
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "0007"
+down_revision: Union[str, None] = "0006"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "task_outbox",
+        sa.Column("id", sa.Integer, primary_key=True),
+        sa.Column("task_name", sa.String(100), nullable=False),
+        sa.Column("args_json", sa.JSON, nullable=True),
+        sa.Column("kwargs_json", sa.JSON, nullable=True),
+        sa.Column("dedup_key", sa.String(255), nullable=True),
+        sa.Column("attempts", sa.Integer, nullable=False, server_default="0"),
+        sa.Column("last_error", sa.Text, nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+        sa.Column("published_at", sa.DateTime(timezone=True), nullable=True),
+    )
+    op.create_index(
+        "ux_task_outbox_pending_dedup", "task_outbox", ["dedup_key"],
+        unique=True, postgresql_where=sa.text("published_at IS NULL"),
+    )
+    op.create_index(
+        "ix_task_outbox_pending", "task_outbox", ["id"],
+        postgresql_where=sa.text("published_at IS NULL"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_task_outbox_pending", table_name="task_outbox")
+    op.drop_index("ux_task_outbox_pending_dedup", table_name="task_outbox")
+    op.drop_table("task_outbox")
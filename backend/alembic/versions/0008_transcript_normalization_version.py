@@ -0,0 +1,25 @@
+"""versão das regras de normalização junto do texto normalizado
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-17
+
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "0008"
+down_revision: Union[str, None] = "0007"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Linhas existentes ficam com NULL: são re-normalizadas no próximo uso
+    # ou pelo backfill (python -m app.utils.renormalize)
+    op.add_column("video_transcripts", sa.Column("normalization_version", sa.String(32), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("video_transcripts", "normalization_version")
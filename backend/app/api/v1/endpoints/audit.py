@@ -5,8 +5,10 @@ from datetime import datetime
 from pydantic import BaseModel, ConfigDict
 
 from app.core.database import get_db
+from app.core.redis import get_metrics
 from app.core.dependencies import require_admin
 from app.models.audit import AuditEvent, ProcessingJob
+from app.services.youtube_quota_service import YouTubeQuotaLedger
 
 router = APIRouter(tags=["audit"])
 
@@ -76,3 +78,16 @@ async def list_processing_jobs(
     q = q.offset(skip).limit(limit)
     result = await db.execute(q)
     return [ProcessingJobResponse.model_validate(j) for j in result.scalars().all()]
+
+
+@router.get("/metrics", response_model=dict[str, int])
+async def list_metrics(_=Depends(require_admin)):
+    """Contadores operacionais dos workers (ex.: execuções duplicadas evitadas)."""
+    return await get_metrics()
+
+
+@router.get("/youtube-quota")
+async def youtube_quota(_=Depends(require_admin)):
+    """Quota da YouTube Data API: gasto do dia por endpoint e projeção até a virada."""
+    status = await YouTubeQuotaLedger().status()
+    return status.to_dict()
@@ -73,5 +73,19 @@ async def trigger_monitor(
 ):
     """Dispara manualmente o monitoramento de um canal específico."""
     from app.workers.tasks import monitor_channels_task
-    monitor_channels_task.delay()
+    monitor_channels_task.delay(channel_id=channel_id)
     return MessageResponse(message=f"Monitoramento do canal {channel_id} enfileirado.")
+
+
+@router.post("/{channel_id}/backfill", response_model=MessageResponse)
+async def backfill_channel(
+    channel_id: int,
+    max_videos: int | None = Query(default=None, ge=1, le=5000),
+    db: AsyncSession = Depends(get_db),
+    current_user=Depends(require_admin),
+):
+    """Importa o histórico do canal (vídeos anteriores ao cadastro)."""
+    await ChannelService(db).get_by_id(channel_id)
+    from app.workers.tasks import backfill_channel_task
+    backfill_channel_task.delay(channel_id=channel_id, max_videos=max_videos)
+    return MessageResponse(message=f"Backfill do canal {channel_id} enfileirado.")
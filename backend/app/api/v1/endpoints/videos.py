@@ -176,14 +176,16 @@ async def reprocess_video(
 ):
     """Reprocessa um vídeo. Cria nova análise sem remover a anterior (RN15)."""
     from fastapi import HTTPException, status as http_status
-    from app.workers.tasks import process_video_task
+    from app.services.video_ingest_service import VideoIngestService
+    from app.workers.tasks import relay_outbox_task
 
     repo = VideoRepository(db)
     video = await repo.get_by_id(video_id)
     if not video:
         raise HTTPException(status_code=http_status.HTTP_404_NOT_FOUND, detail="Vídeo não encontrado")
 
-    await repo.update_status(video, "queued")
+    await VideoIngestService(db).enqueue_processing(video)
     await db.commit()
-    process_video_task.delay(video_id)
+    # Só antecipa o relay; se este aviso se perder, o beat publica no próximo tick
+    relay_outbox_task.delay()
     return MessageResponse(message=f"Vídeo {video_id} enfileirado para reprocessamento.")
@@ -0,0 +1,108 @@
+"""Circuit breakers com estado compartilhado no Redis.
+
+Cada breaker guarda no hash `breaker:<nome>` o estado (`closed`, `open`,
+`half_open`), as falhas consecutivas e o instante de abertura. Como o
+estado fica no Redis, todos os workers enxergam o mesmo breaker: quando
+uma fonte cai, ela passa a ser pulada na hora por todos.
+
+- closed: chamadas liberadas; `failure_threshold` falhas seguidas abrem.
+- open: chamadas recusadas até passar `cooldown` segundos.
+- half_open: uma única chamada de teste (chave `breaker:<nome>:probe`, com
+  TTL) é liberada; sucesso fecha o breaker, falha o reabre.
+
+Se o Redis estiver indisponível, o breaker deixa passar (fail-open).
+"""
+from __future__ import annotations
+
+import logging
+import time
+
+from app.core.config import settings
+from app.core.redis import get_redis
+
+logger = logging.getLogger(__name__)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+# Conta a falha e abre o breaker ao atingir o limite (ou se o teste falhou)
+_FAILURE_SCRIPT = """
+local failures = redis.call('hincrby', KEYS[1], 'failures', 1)
+local state = redis.call('hget', KEYS[1], 'state')
+if state == 'half_open' or failures >= tonumber(ARGV[1]) then
+    redis.call('hset', KEYS[1], 'state', 'open', 'opened_at', ARGV[2])
+    redis.call('del', KEYS[2])
+    return 1
+end
+return 0
+"""
+
+
+class CircuitBreaker:
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int | None = None,
+        cooldown: float | None = None,
+    ):
+        self.name = name
+        self.key = f"breaker:{name}"
+        self.probe_key = f"{self.key}:probe"
+        self.failure_threshold = failure_threshold or settings.BREAKER_FAILURE_THRESHOLD
+        self.cooldown = cooldown or settings.BREAKER_COOLDOWN_SECONDS
+
+    async def allow(self) -> bool:
+        """True se a chamada pode ser feita agora."""
+        try:
+            redis = get_redis()
+            state, opened_at = await redis.hmget(self.key, "state", "opened_at")
+            if state in (None, CLOSED):
+                return True
+            if state == OPEN and time.time() - float(opened_at or 0) < self.cooldown:
+                return False
+            # Cooldown vencido (ou teste anterior expirou): só um worker testa
+            probe_ttl = max(int(settings.BREAKER_PROBE_TTL_SECONDS), 1)
+            if await redis.set(self.probe_key, "1", nx=True, ex=probe_ttl):
+                await redis.hset(self.key, "state", HALF_OPEN)
+                return True
+            return False
+        except Exception as exc:
+            logger.warning("Breaker %s sem Redis, liberando chamada: %s", self.name, exc)
+            return True
+
+    async def record_success(self) -> None:
+        try:
+            redis = get_redis()
+            state = await redis.hget(self.key, "state")
+            if state in (None, CLOSED):
+                await redis.hset(self.key, "failures", 0)
+                return
+            await redis.hset(self.key, mapping={"state": CLOSED, "failures": 0})
+            await redis.delete(self.probe_key)
+            logger.info("Breaker %s fechado", self.name)
+        except Exception as exc:
+            logger.warning("Breaker %s: falha ao registrar sucesso: %s", self.name, exc)
+
+    async def record_failure(self) -> None:
+        try:
+            opened = await get_redis().eval(
+                _FAILURE_SCRIPT, 2, self.key, self.probe_key, self.failure_threshold, time.time()
+            )
+            if opened:
+                logger.warning("Breaker %s aberto por %ss", self.name, self.cooldown)
+        except Exception as exc:
+            logger.warning("Breaker %s: falha ao registrar erro: %s", self.name, exc)
+
+    async def snapshot(self) -> dict:
+        raw = await get_redis().hgetall(self.key)
+        opened_at = float(raw["opened_at"]) if raw.get("opened_at") else None
+        return {
+            "state": raw.get("state", CLOSED),
+            "consecutive_failures": int(raw.get("failures", 0)),
+            "opened_at": opened_at,
+            "retry_in_seconds": (
+                max(round(opened_at + self.cooldown - time.time(), 1), 0.0)
+                if opened_at and raw.get("state") == OPEN else None
+            ),
+        }
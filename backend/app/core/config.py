@@ -25,6 +25,15 @@ class Settings(BaseSettings):
 
     # APIs externas
     YOUTUBE_API_KEY: str = ""
+    YOUTUBE_API_BASE_URL: str = "https://www.googleapis.com/youtube/v3"
+    YOUTUBE_FEED_URL: str = "https://www.youtube.com/feeds/videos.xml"   # feed Atom (sem quota)
+    YOUTUBE_POLL_MAX_PAGES: int = 20          # páginas (de 50) lidas por verificação
+    YOUTUBE_BACKFILL_MAX_VIDEOS: int = 500    # histórico importado por backfill
+    YOUTUBE_DAILY_QUOTA: int = 10000          # unidades/dia do projeto no Google Cloud
+    YOUTUBE_QUOTA_RESERVE: int = 500          # guardadas para disparos manuais
+    YOUTUBE_QUOTA_UNITS_PER_CHECK: int = 2    # custo médio de verificar um canal
+    YOUTUBE_QUOTA_TIMEZONE: str = "America/Los_Angeles"  # a quota reinicia à meia-noite daqui
+    YOUTUBE_QUOTA_MIN_PROJECTION_SECONDS: int = 3600    # janela mínima do ritmo usado na projeção
     OPENAI_API_KEY: str = ""
     ANTHROPIC_API_KEY: str = ""
     GROQ_API_KEY: str = ""
@@ -33,6 +42,75 @@ class Settings(BaseSettings):
     OLLAMA_BASE_URL: str = ""           # ex: http://host.docker.internal:11434
     OLLAMA_MODEL: str = "llama3.2"      # modelo instalado localmente
 
+    # Cliente HTTP compartilhado (YouTube API)
+    HTTP_CLIENT_HTTP2: bool = False                 # requer o pacote h2
+    HTTP_CLIENT_TIMEOUT_SECONDS: float = 15.0
+    HTTP_CLIENT_MAX_CONNECTIONS: int = 50
+    HTTP_CLIENT_MAX_KEEPALIVE: int = 20
+    HTTP_CLIENT_KEEPALIVE_EXPIRY_SECONDS: float = 60.0
+
+    # Pools de worker por fila (concorrência / prefetch multiplier)
+    CELERY_MONITOR_CONCURRENCY: int = 2
+    CELERY_MONITOR_PREFETCH: int = 4
+    CELERY_TRANSCRIPT_CONCURRENCY: int = 8
+    CELERY_TRANSCRIPT_PREFETCH: int = 2
+    CELERY_LLM_CONCURRENCY: int = 2
+    CELERY_LLM_PREFETCH: int = 1          # tasks longas: não reservar mais de uma
+    CELERY_EVALUATION_CONCURRENCY: int = 2
+    CELERY_EVALUATION_PREFETCH: int = 4
+
+    # Monitoramento de canais: intervalo do tick do beat e TTL do lock do ciclo
+    MONITOR_TICK_SECONDS: int = 60
+    MONITOR_LOCK_TTL_SECONDS: int = 300
+    MONITOR_CONCURRENCY: int = 8                 # canais verificados em paralelo
+    MONITOR_CHANNEL_TIMEOUT_SECONDS: int = 60    # timeout da verificação de um canal
+
+    # Lock de processamento por vídeo (renovado por heartbeat a cada etapa)
+    VIDEO_LOCK_TTL_SECONDS: int = 900
+    # TTL aplicado quando uma etapa encadeia a próxima: cobre a espera na fila
+    # (a do LLM pode levar horas em dias de backlog)
+    VIDEO_LOCK_HANDOFF_TTL_SECONDS: int = 6 * 3600
+    # Job `running` mais antigo que isto é tratado como abandonado (worker morto)
+    VIDEO_JOB_STALE_SECONDS: int = 24 * 3600
+
+    # Outbox de tasks: relay publica pendentes em lotes
+    OUTBOX_RELAY_INTERVAL_SECONDS: int = 10
+    OUTBOX_RELAY_BATCH_SIZE: int = 200
+    OUTBOX_RETENTION_HOURS: int = 48
+
+    # yt-dlp (subprocesso assíncrono)
+    YTDLP_MAX_CONCURRENCY: int = 4         # processos yt-dlp simultâneos por worker
+    YTDLP_TIMEOUT_SECONDS: float = 60.0    # por tentativa de idioma
+
+    # Seleção de fonte de transcrição (estatísticas por processo)
+    TRANSCRIPT_HEDGING_ENABLED: bool = True
+    TRANSCRIPT_HEDGE_MIN_SAMPLES: int = 20     # amostras antes de confiar no p50/p90
+    TRANSCRIPT_STATS_WINDOW: int = 200         # janela deslizante por fonte
+
+    # Proxy local de transcrição (transcript_proxy.py no host)
+    TRANSCRIPT_PROXY_URL: str = "http://host.docker.internal:8001"
+    TRANSCRIPT_PROXY_TIMEOUT_SECONDS: float = 15.0
+    TRANSCRIPT_PROXY_BATCH_SIZE: int = 50             # ids por chamada a /transcripts
+    TRANSCRIPT_PROXY_BATCH_READ_TIMEOUT_SECONDS: float = 120.0   # espera máxima entre linhas do lote
+    TRANSCRIPT_PREFETCH_ON_INGEST: bool = True        # vídeos ingeridos puxam as transcrições em lote
+
+    # Circuit breakers (fontes de transcrição), estado no Redis
+    BREAKER_FAILURE_THRESHOLD: int = 5      # falhas seguidas para abrir
+    BREAKER_COOLDOWN_SECONDS: int = 120     # aberto por este tempo antes do teste
+    BREAKER_PROBE_TTL_SECONDS: int = 90     # acima do timeout do yt-dlp
+
+    # Cache local de transcrições (em disco)
+    TRANSCRIPT_CACHE_ENABLED: bool = True
+    TRANSCRIPT_CACHE_DIR: str = "/tmp/transcript_cache"
+    TRANSCRIPT_CACHE_MAX_BYTES: int = 512 * 1024 * 1024
+    TRANSCRIPT_CACHE_NEGATIVE_TTL_SECONDS: int = 6 * 3600
+
+    # Pipeline em estágios (vários vídeos por worker)
+    PIPELINE_FETCH_CONCURRENCY: int = 8    # downloads de transcrição simultâneos
+    PIPELINE_CPU_CONCURRENCY: int = 2      # normalização/segmentação simultâneas
+    PIPELINE_LLM_CONCURRENCY: int = 4      # chamadas ao LLM simultâneas
+    PIPELINE_QUEUE_SIZE: int = 16          # capacidade de cada fila entre estágios
+
     # CORS
     CORS_ORIGINS: str = "http://localhost:3000"
 
@@ -1,15 +1,19 @@
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine, async_sessionmaker
 from sqlalchemy.orm import DeclarativeBase
 from app.core.config import settings
 
 
-engine = create_async_engine(
-    settings.DATABASE_URL,
-    echo=settings.DEBUG,
-    pool_pre_ping=True,
-    pool_size=10,
-    max_overflow=20,
-)
+def _create_engine() -> AsyncEngine:
+    return create_async_engine(
+        settings.DATABASE_URL,
+        echo=settings.DEBUG,
+        pool_pre_ping=True,
+        pool_size=10,
+        max_overflow=20,
+    )
+
+
+engine = _create_engine()
 
 AsyncSessionLocal = async_sessionmaker(
     engine,
@@ -18,6 +22,19 @@ AsyncSessionLocal = async_sessionmaker(
 )
 
 
+def reset_engine() -> AsyncEngine:
+    """Recria o engine no processo atual e religa o AsyncSessionLocal.
+
+    Usado pelos processos filhos do worker Celery: conexões herdadas do
+    processo pai via fork são descartadas sem serem fechadas.
+    """
+    global engine
+    engine.sync_engine.dispose(close=False)
+    engine = _create_engine()
+    AsyncSessionLocal.configure(bind=engine)
+    return engine
+
+
 class Base(DeclarativeBase):
     pass
 
@@ -0,0 +1,83 @@
+"""Locks distribuídos no Redis com TTL e heartbeat.
+
+Cada lock tem um dono (token). Só o dono renova ou libera o lock, e o
+TTL garante que um worker morto não segura o recurso para sempre.
+
+Uso típico:
+
+    lock = video_lock(video_id)
+    if not await lock.acquire():
+        return  # outro worker já está processando
+    async with lock.heartbeat():
+        ...
+    await lock.release()
+"""
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import logging
+import uuid
+from typing import AsyncIterator
+
+from app.core.config import settings
+from app.core.redis import get_redis
+
+logger = logging.getLogger(__name__)
+
+# Renova/libera somente se o valor ainda for o token do dono
+_REFRESH_SCRIPT = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('expire', KEYS[1], ARGV[2])
+end
+return 0
+"""
+_RELEASE_SCRIPT = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('del', KEYS[1])
+end
+return 0
+"""
+
+
+class RedisLock:
+    def __init__(self, key: str, token: str | None = None, ttl: int | None = None):
+        self.key = key
+        self.token = token or uuid.uuid4().hex
+        self.ttl = ttl or settings.VIDEO_LOCK_TTL_SECONDS
+
+    async def acquire(self) -> bool:
+        return bool(await get_redis().set(self.key, self.token, nx=True, ex=self.ttl))
+
+    async def refresh(self, ttl: int | None = None) -> bool:
+        """Renova o TTL (por padrão, o do lock) se o token ainda for o dono."""
+        return bool(await get_redis().eval(_REFRESH_SCRIPT, 1, self.key, self.token, ttl or self.ttl))
+
+    async def release(self) -> bool:
+        return bool(await get_redis().eval(_RELEASE_SCRIPT, 1, self.key, self.token))
+
+    @contextlib.asynccontextmanager
+    async def heartbeat(self, interval: float | None = None) -> AsyncIterator[None]:
+        """Renova o TTL periodicamente enquanto o bloco executa."""
+        interval = interval or self.ttl / 3
+
+        async def _beat() -> None:
+            while True:
+                await asyncio.sleep(interval)
+                if not await self.refresh():
+                    logger.warning("Lock %s perdido (expirou ou mudou de dono)", self.key)
+                    return
+
+        await self.refresh()
+        task = asyncio.create_task(_beat())
+        try:
+            yield
+        finally:
+            task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await task
+
+
+def video_lock(video_id: int, token: str | None = None) -> RedisLock:
+    """Lock de processamento de um vídeo (evita pipelines duplicados)."""
+    return RedisLock(f"lock:process_video:{video_id}", token=token)
@@ -0,0 +1,46 @@
+"""Cliente Redis assíncrono compartilhado e contadores operacionais.
+
+O cliente é criado sob demanda e associado ao event loop corrente: a API
+usa um loop só, e o worker usa o loop persistente do processo
+(`app.workers.runtime`).
+
+Os contadores ficam no hash `metrics` e são expostos em `/api/v1/metrics`.
+"""
+from __future__ import annotations
+
+import asyncio
+
+import redis.asyncio as aioredis
+
+from app.core.config import settings
+
+METRICS_KEY = "metrics"
+
+_client: aioredis.Redis | None = None
+_client_loop: asyncio.AbstractEventLoop | None = None
+
+
+def get_redis() -> aioredis.Redis:
+    global _client, _client_loop
+    loop = asyncio.get_running_loop()
+    if _client is None or _client_loop is not loop:
+        _client = aioredis.from_url(settings.REDIS_URL, decode_responses=True)
+        _client_loop = loop
+    return _client
+
+
+async def close_redis() -> None:
+    global _client, _client_loop
+    if _client is not None:
+        await _client.aclose()
+    _client = None
+    _client_loop = None
+
+
+async def incr_metric(name: str, amount: int = 1) -> None:
+    await get_redis().hincrby(METRICS_KEY, name, amount)
+
+
+async def get_metrics() -> dict[str, int]:
+    raw = await get_redis().hgetall(METRICS_KEY)
+    return {name: int(value) for name, value in raw.items()}
@@ -8,6 +8,7 @@ from app.models.idea import GameIdea, IdeaCondition, IdeaReason, IdeaLabel
 from app.models.review import IdeaReview, VideoAnalysisReview
 from app.models.result import GameResult, IdeaEvaluation
 from app.models.audit import AuditEvent, ProcessingJob
+from app.models.outbox import TaskOutbox
 
 __all__ = [
     "User", "Role", "UserRole",
@@ -20,4 +21,5 @@ __all__ = [
     "IdeaReview", "VideoAnalysisReview",
     "GameResult", "IdeaEvaluation",
     "AuditEvent", "ProcessingJob",
+    "TaskOutbox",
 ]
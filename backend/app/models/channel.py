@@ -12,6 +12,12 @@ class YoutubeChannel(Base):
     channel_name: Mapped[str] = mapped_column(String(255), nullable=False)
     channel_url: Mapped[str] = mapped_column(String(512), nullable=False)
     channel_external_id: Mapped[str | None] = mapped_column(String(255), unique=True, nullable=True)
+    # Playlist "uploads" do canal (UU...) — nunca muda, resolvida uma única vez
+    uploads_playlist_id: Mapped[str | None] = mapped_column(String(255), nullable=True)
+    # ETag da última resposta de playlistItems.list (enviado como If-None-Match)
+    uploads_playlist_etag: Mapped[str | None] = mapped_column(String(255), nullable=True)
+    # Como descobrir vídeos novos: api (Data API, com quota) | rss (feed Atom público)
+    discovery_backend: Mapped[str] = mapped_column(String(20), default="api", server_default="api", nullable=False)
     is_active: Mapped[bool] = mapped_column(Boolean, default=True, nullable=False)
     monitoring_frequency_minutes: Mapped[int] = mapped_column(Integer, default=60, nullable=False)
     last_checked_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True, index=True)
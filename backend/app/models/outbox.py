@@ -0,0 +1,31 @@
+from datetime import datetime
+from sqlalchemy import DateTime, Index, Integer, JSON, String, Text, func, text
+from sqlalchemy.orm import Mapped, mapped_column
+from app.core.database import Base
+
+
+class TaskOutbox(Base):
+    """Tasks Celery a publicar, gravadas na mesma transação dos dados.
+
+    O relay (`OutboxRelay`) publica as linhas pendentes em lote e marca
+    `published_at`. Enquanto pendente, `dedup_key` é único: pedir duas
+    vezes o mesmo processamento gera uma única publicação.
+    """
+    __tablename__ = "task_outbox"
+    __table_args__ = (
+        Index(
+            "ux_task_outbox_pending_dedup", "dedup_key",
+            unique=True, postgresql_where=text("published_at IS NULL"),
+        ),
+        Index("ix_task_outbox_pending", "id", postgresql_where=text("published_at IS NULL")),
+    )
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    task_name: Mapped[str] = mapped_column(String(100), nullable=False)
+    args_json: Mapped[list | None] = mapped_column(JSON, nullable=True)
+    kwargs_json: Mapped[dict | None] = mapped_column(JSON, nullable=True)
+    dedup_key: Mapped[str | None] = mapped_column(String(255), nullable=True)
+    attempts: Mapped[int] = mapped_column(Integer, default=0, server_default="0", nullable=False)
+    last_error: Mapped[str | None] = mapped_column(Text, nullable=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
+    published_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
@@ -1,5 +1,5 @@
 from datetime import datetime
-from sqlalchemy import Boolean, DateTime, ForeignKey, Integer, String, Text, Float, func
+from sqlalchemy import Boolean, DateTime, ForeignKey, Integer, JSON, String, Text, Float, func
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from app.core.database import Base
 
@@ -14,7 +14,11 @@ class VideoTranscript(Base):
     language_code: Mapped[str | None] = mapped_column(String(10), nullable=True)
     raw_transcript_text: Mapped[str | None] = mapped_column(Text, nullable=True)
     normalized_transcript_text: Mapped[str | None] = mapped_column(Text, nullable=True)
+    # NORMALIZATION_VERSION das regras que geraram normalized_transcript_text
+    normalization_version: Mapped[str | None] = mapped_column(String(32), nullable=True)
     has_timestamps: Mapped[bool] = mapped_column(Boolean, default=False)
+    # Entradas com timestamps ({text, start, duration}) — permitem re-segmentar sem rebaixar
+    entries_json: Mapped[list | None] = mapped_column(JSON, nullable=True)
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
     updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
 
@@ -1,5 +1,5 @@
 from datetime import datetime
-from sqlalchemy import DateTime, ForeignKey, Integer, String, Text, JSON, Float, func
+from sqlalchemy import Boolean, DateTime, ForeignKey, Integer, String, Text, JSON, Float, func
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from app.core.database import Base
 
@@ -17,6 +17,9 @@ class Video(Base):
     published_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
     fetched_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
     duration_seconds: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    # none | live | upcoming (videos.list); null enquanto não enriquecido
+    live_broadcast_content: Mapped[str | None] = mapped_column(String(20), nullable=True)
+    has_captions: Mapped[bool | None] = mapped_column(Boolean, nullable=True)
     # discovered | queued | processing | analyzed | failed
     status: Mapped[str] = mapped_column(String(50), default="discovered", nullable=False)
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
@@ -35,7 +38,7 @@ class VideoAnalysis(Base):
     video_id: Mapped[int] = mapped_column(ForeignKey("videos.id", ondelete="RESTRICT"), nullable=False, index=True)
     analysis_url_slug: Mapped[str | None] = mapped_column(String(255), unique=True, nullable=True)
     analyzed_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True, index=True)
-    # pending | processing | analyzed_with_matches | analyzed_without_matches
+    # pending | processing | extracted | analyzed_with_matches | analyzed_without_matches
     # analyzed_without_actionable_ideas | irrelevant | failed
     analysis_status: Mapped[str] = mapped_column(String(50), default="pending", nullable=False)
     # daily_games | future_games | general_analysis | methodology |
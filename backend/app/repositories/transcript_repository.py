@@ -1,4 +1,4 @@
-from sqlalchemy import select
+from sqlalchemy import select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.models.transcript import VideoTranscript, TranscriptSegment
 
@@ -43,3 +43,32 @@ class TranscriptRepository:
             .order_by(TranscriptSegment.start_seconds)
         )
         return list(result.scalars().all())
+
+    async def list_stale_normalized(
+        self, version: str, after_id: int = 0, limit: int = 200
+    ) -> list[tuple[int, str]]:
+        """(id, texto bruto) dos transcripts normalizados com outra versão, por id."""
+        raw = VideoTranscript.raw_transcript_text
+        result = await self.db.execute(
+            select(VideoTranscript.id, raw)
+            .where(
+                VideoTranscript.id > after_id,
+                VideoTranscript.normalization_version.is_distinct_from(version),
+                raw.is_not(None),
+            )
+            .order_by(VideoTranscript.id)
+            .limit(limit)
+        )
+        return [(row.id, row.raw_transcript_text) for row in result]
+
+    async def bulk_update_normalized(self, version: str, texts: dict[int, str]) -> None:
+        """Grava os textos normalizados (id → texto) num único executemany."""
+        if not texts:
+            return
+        await self.db.execute(
+            update(VideoTranscript),
+            [
+                {"id": transcript_id, "normalized_transcript_text": text, "normalization_version": version}
+                for transcript_id, text in texts.items()
+            ],
+        )
@@ -1,4 +1,5 @@
 from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.models.video import Video
 
@@ -26,6 +27,17 @@ class VideoRepository:
         result = await self.db.execute(select(Video).where(Video.id == video_id))
         return result.scalar_one_or_none()
 
+    async def get_by_id_for_update(self, video_id: int) -> Video | None:
+        """Carrega o vídeo travando a linha até o fim da transação."""
+        result = await self.db.execute(select(Video).where(Video.id == video_id).with_for_update())
+        return result.scalar_one_or_none()
+
+    async def get_many_by_ids(self, video_ids: list[int]) -> list[Video]:
+        if not video_ids:
+            return []
+        result = await self.db.execute(select(Video).where(Video.id.in_(video_ids)))
+        return list(result.scalars().all())
+
     async def get_by_youtube_id(self, youtube_video_id: str) -> Video | None:
         result = await self.db.execute(
             select(Video).where(Video.youtube_video_id == youtube_video_id)
@@ -38,6 +50,23 @@ class VideoRepository:
         await self.db.flush()
         return video
 
+    async def create_many_ignore_existing(self, rows: list[dict]) -> list[Video]:
+        """Insere vários vídeos num único INSERT ... ON CONFLICT DO NOTHING.
+
+        Retorna só as linhas inseridas: ids que já existem (inclusive os
+        inseridos por outra transação concorrente) são ignorados pelo banco.
+        """
+        if not rows:
+            return []
+        stmt = (
+            insert(Video)
+            .values(rows)
+            .on_conflict_do_nothing(index_elements=[Video.youtube_video_id])
+            .returning(Video)
+        )
+        result = await self.db.scalars(stmt)
+        return list(result.all())
+
     async def update_status(self, video: Video, status: str) -> None:
         video.status = status
         await self.db.flush()
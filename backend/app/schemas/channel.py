@@ -1,21 +1,26 @@
 from datetime import datetime
+from typing import Literal
 from pydantic import BaseModel, Field, HttpUrl
 
+DiscoveryBackend = Literal["api", "rss"]
+
 
 class ChannelCreate(BaseModel):
     tipster_id: int
     channel_name: str = Field(min_length=2, max_length=255)
     channel_url: str = Field(min_length=5, max_length=512)
     channel_external_id: str | None = Field(default=None, max_length=255)
-    monitoring_frequency_minutes: int = Field(default=60, ge=15, le=1440)
+    monitoring_frequency_minutes: int = Field(default=60, ge=5, le=1440)
+    discovery_backend: DiscoveryBackend = "api"
 
 
 class ChannelUpdate(BaseModel):
     channel_name: str | None = Field(default=None, min_length=2, max_length=255)
     channel_url: str | None = Field(default=None, min_length=5, max_length=512)
     channel_external_id: str | None = None
-    monitoring_frequency_minutes: int | None = Field(default=None, ge=15, le=1440)
+    monitoring_frequency_minutes: int | None = Field(default=None, ge=5, le=1440)
     monitoring_status: str | None = None
+    discovery_backend: DiscoveryBackend | None = None
     is_active: bool | None = None
 
 
@@ -25,6 +30,8 @@ class ChannelResponse(BaseModel):
     channel_name: str
     channel_url: str
     channel_external_id: str | None
+    uploads_playlist_id: str | None
+    discovery_backend: str
     is_active: bool
     monitoring_frequency_minutes: int
     monitoring_status: str
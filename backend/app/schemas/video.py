@@ -13,6 +13,8 @@ class VideoResponse(BaseModel):
     published_at: datetime | None
     fetched_at: datetime | None
     duration_seconds: int | None
+    live_broadcast_content: str | None
+    has_captions: bool | None
     status: str
     created_at: datetime
     updated_at: datetime
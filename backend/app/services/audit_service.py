@@ -1,4 +1,5 @@
 """Serviço de auditoria — append-only. Nunca atualiza ou remove registros."""
+from sqlalchemy import insert
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.models.audit import AuditEvent
 
@@ -24,3 +25,27 @@ class AuditService:
         )
         self.db.add(event)
         await self.db.flush()
+
+    async def log_many(
+        self,
+        entity_type: str,
+        event_type: str,
+        events: list[tuple[int | None, dict | None]],
+        actor_user_id: int | None = None,
+    ) -> None:
+        """Registra vários eventos (entity_id, payload) num único INSERT multi-linha."""
+        if not events:
+            return
+        await self.db.execute(
+            insert(AuditEvent),
+            [
+                {
+                    "entity_type": entity_type,
+                    "entity_id": entity_id,
+                    "event_type": event_type,
+                    "actor_user_id": actor_user_id,
+                    "event_payload_json": payload,
+                }
+                for entity_id, payload in events
+            ],
+        )
@@ -1,72 +1,221 @@
 """Serviço de monitoramento de canais.
 
-Executado pelo worker Celery periodicamente. Para cada canal ativo:
-1. Busca vídeos novos via YouTube API
-2. Ingere vídeos novos (deduplicação automática)
-3. Enfileira processamento de cada novo vídeo
+Executado pelo worker Celery a cada tick do beat, só para os canais
+vencidos (ver `ChannelScheduler`). Para cada canal:
+1. Busca vídeos novos (YouTube API ou feed RSS)
+2. Ingere e enriquece os vídeos novos (deduplicação automática)
+3. Enfileira o processamento pelo outbox, na mesma transação
 4. Atualiza timestamps do canal
 5. Registra auditoria e erros
 """
+import asyncio
+import logging
+import math
+from contextlib import aclosing
+from dataclasses import dataclass, field
 from datetime import datetime, timezone
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from app.core.config import settings
+from app.core.redis import incr_metric
+from app.models.video import Video
 from app.repositories.channel_repository import ChannelRepository
 from app.services.youtube_service import YouTubeService
+from app.services.youtube_feed_service import YouTubeFeedService
 from app.services.video_ingest_service import VideoIngestService
 from app.services.audit_service import AuditService
+from app.services.outbox_service import OutboxRelay
+from app.services.channel_scheduler_service import ChannelScheduler
 from app.models.audit import ProcessingJob
 
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ChannelCheckResult:
+    new_videos: list[Video] = field(default_factory=list)
+    # None: a playlist não chegou a ser consultada
+    not_modified: bool | None = None
+    from_feed: bool = False
+    enriched: int = 0
+
 
 class ChannelMonitorService:
-    def __init__(self, db: AsyncSession):
+    def __init__(self, db: AsyncSession, session_factory: async_sessionmaker[AsyncSession] | None = None):
+        if session_factory is None:
+            from app.core.database import AsyncSessionLocal
+            session_factory = AsyncSessionLocal
         self.db = db
+        self.session_factory = session_factory
         self.channel_repo = ChannelRepository(db)
         self.youtube = YouTubeService()
+        self.feed = YouTubeFeedService()
         self.audit = AuditService(db)
 
-    async def run(self) -> dict:
-        """Roda o ciclo completo de monitoramento para todos os canais ativos."""
-        channels = await self.channel_repo.get_active_for_monitoring()
+    async def run(self, channel_id: int | None = None) -> dict:
+        """Verifica os canais ativos vencidos.
+
+        Os canais são verificados em paralelo (`MONITOR_CONCURRENCY`), cada um
+        em sessão própria (`_check_isolated`). Quando a projeção de uso da
+        quota da API passa do orçamento, só a parte dos canais de API que
+        cabe no resto do dia é verificada, os mais atrasados primeiro (ver
+        `YouTubeQuotaLedger.allowance`); canais de feed RSS seguem sempre. Ao
+        fim, o outbox é publicado — o que sobrar sai no próximo tick do relay.
+
+        Com `channel_id`, verifica só esse canal, esteja ele vencido ou não
+        (disparo manual).
+        """
         now = datetime.now(timezone.utc)
+        if channel_id is not None:
+            channel = await self.channel_repo.get_by_id(channel_id)
+            channels = [channel] if channel else []
+            next_due = None
+            allowance = deferred = None
+        else:
+            scheduler = ChannelScheduler(await self.channel_repo.get_active_for_monitoring())
+            due = scheduler.pop_due(now)
+            next_due = scheduler.next_due_at()
 
-        stats = {"checked": 0, "new_videos": 0, "errors": 0}
+            # Perto do limite de quota, só os canais mais atrasados que usam a API
+            # são verificados; os de feed RSS não gastam quota e seguem sempre.
+            allowance = await self.youtube.quota.allowance()
+            channels, deferred = [], 0
+            api_budget = allowance
+            for channel in due:
+                if channel.discovery_backend == "rss":
+                    channels.append(channel)
+                elif api_budget is None or api_budget > 0:
+                    channels.append(channel)
+                    if api_budget is not None:
+                        api_budget -= 1
+                else:
+                    deferred += 1
 
-        for channel in channels:
-            try:
-                new_videos = await self._check_channel(channel, now)
-                stats["checked"] += 1
-                stats["new_videos"] += new_videos
-            except Exception as exc:
+        stats = {
+            "due": len(channels),
+            "deferred_by_quota": deferred or 0,
+            "quota_allowance": allowance,
+            "checked": 0,
+            "new_videos": 0,
+            "errors": 0,
+            "enriched": 0,
+            "not_modified": 0,
+            "full_responses": 0,
+            "feed_checks": 0,
+            "next_due_at": next_due.isoformat() if next_due else None,
+        }
+
+        semaphore = asyncio.Semaphore(settings.MONITOR_CONCURRENCY)
+        results = await asyncio.gather(
+            *(self._check_isolated(channel.id, now, semaphore) for channel in channels)
+        )
+        for result in results:
+            if result is None:
                 stats["errors"] += 1
-                await self.channel_repo.mark_error(channel, now)
-                await self.audit.log(
-                    "channel", channel.id, "failed",
-                    payload={"error": str(exc)},
-                )
+                continue
+            stats["checked"] += 1
+            stats["new_videos"] += len(result.new_videos)
+            stats["enriched"] += result.enriched
+            if result.from_feed:
+                stats["feed_checks"] += 1
+            elif result.not_modified is True:
+                stats["not_modified"] += 1
+            elif result.not_modified is False:
+                stats["full_responses"] += 1
 
-        await self.db.commit()
+        if stats["new_videos"]:
+            await self._relay_outbox()
+        await self._record_metrics(stats)
         return stats
 
-    async def _check_channel(self, channel, now: datetime) -> int:
-        """Verifica novos vídeos de um único canal. Retorna quantidade de novos vídeos."""
-        channel_external_id = channel.channel_external_id
+    async def _relay_outbox(self) -> None:
+        """Publica já as tasks gravadas; em caso de falha, o beat do relay publica depois."""
+        try:
+            await OutboxRelay(self.session_factory).run()
+        except Exception as exc:
+            logger.warning("Falha ao publicar o outbox após o monitoramento: %s", exc)
 
-        # Se não tem external_id ainda, tenta resolver via URL
-        if not channel_external_id:
-            channel_external_id = await self.youtube.get_channel_external_id(channel.channel_url)
-            if channel_external_id:
-                await self.channel_repo.update(channel, {"channel_external_id": channel_external_id})
-            else:
-                await self.channel_repo.update_last_checked(channel, now)
-                return 0
+    @staticmethod
+    async def _record_metrics(stats: dict) -> None:
+        """Acumula respostas 304 e completas em `youtube.playlist_items.*`."""
+        try:
+            if stats["not_modified"]:
+                await incr_metric("youtube.playlist_items.not_modified", stats["not_modified"])
+            if stats["full_responses"]:
+                await incr_metric("youtube.playlist_items.full", stats["full_responses"])
+        except Exception as exc:
+            logger.warning("Falha ao registrar métricas do monitoramento: %s", exc)
+
+    async def _check_isolated(
+        self, channel_id: int, now: datetime, semaphore: asyncio.Semaphore
+    ) -> ChannelCheckResult | None:
+        """Verifica um canal em sessão própria. Retorna None em caso de erro.
+
+        Nenhuma exceção sai daqui, nem as da gravação do erro (comuns depois
+        que o `wait_for` cancela uma query em andamento): um canal com
+        problema não interrompe o ciclo dos outros.
+        """
+        async with semaphore:
+            try:
+                async with self.session_factory() as db:
+                    unit = ChannelMonitorService(db, self.session_factory)
+                    try:
+                        channel = await unit.channel_repo.get_by_id(channel_id)
+                        if channel is None:
+                            return None
+                        result = await asyncio.wait_for(
+                            unit._check_channel(channel, now),
+                            timeout=settings.MONITOR_CHANNEL_TIMEOUT_SECONDS,
+                        )
+                        await db.commit()
+                        return result
+                    except Exception as exc:
+                        error = "timeout" if isinstance(exc, asyncio.TimeoutError) else str(exc)
+                        logger.warning("Falha ao verificar canal %s: %s", channel_id, error)
+                    await unit._record_check_failure(channel_id, now, error)
+            except Exception:
+                logger.exception("Falha ao registrar o erro do canal %s", channel_id)
+            return None
+
+    async def _record_check_failure(self, channel_id: int, now: datetime, error: str) -> None:
+        await self.db.rollback()
+        channel = await self.channel_repo.get_by_id(channel_id)
+        if channel is not None:
+            await self.channel_repo.mark_error(channel, now)
+        await self.audit.log("channel", channel_id, "failed", payload={"error": error})
+        await self.db.commit()
+
+    async def _check_channel(self, channel, now: datetime) -> ChannelCheckResult:
+        """Verifica novos vídeos de um único canal. Retorna os vídeos novos ingeridos.
+
+        A listagem da uploads playlist é condicional (ETag salvo no canal):
+        com 304, a ingestão é pulada por inteiro.
+        """
+        if channel.discovery_backend == "rss":
+            return await self._check_channel_feed(channel, now)
+
+        uploads_playlist_id = await self._resolve_uploads_playlist(channel)
+        if not uploads_playlist_id:
+            await self.channel_repo.update_last_checked(channel, now)
+            return ChannelCheckResult()
 
         since = channel.last_video_published_at
-        videos_info = await self.youtube.fetch_new_videos(channel_external_id, since=since)
+        page = await self.youtube.fetch_playlist_videos(
+            uploads_playlist_id, since=since, etag=channel.uploads_playlist_etag
+        )
+        if page.not_modified:
+            # 304: a playlist é a mesma da última verificação, nada a ingerir
+            await self.channel_repo.update_last_checked(channel, now)
+            return ChannelCheckResult(not_modified=True)
 
+        videos_info = page.videos
         ingest_service = VideoIngestService(self.db)
         new_videos = await ingest_service.ingest_batch(channel.id, videos_info)
+        # Antes do commit que libera as tasks do outbox: o pipeline já recebe
+        # os vídeos com duração, estado ao vivo e legendas
+        enriched = await ingest_service.enrich(new_videos, youtube=self.youtube)
 
         # Atualiza timestamps do canal
-        updates = {"last_checked_at": now}
+        updates = {"last_checked_at": now, "uploads_playlist_etag": page.etag}
         if new_videos:
             most_recent = max(v.published_at for v in videos_info if v)
             updates["last_video_published_at"] = most_recent
@@ -76,12 +225,105 @@ class ChannelMonitorService:
             "channel", channel.id, "processed",
             payload={"new_videos": len(new_videos)},
         )
+        return ChannelCheckResult(new_videos=new_videos, not_modified=False, enriched=enriched)
+
+    async def _check_channel_feed(self, channel, now: datetime) -> ChannelCheckResult:
+        """Verifica o canal pelo feed Atom público (sem custo de quota)."""
+        channel_external_id = await self._resolve_external_id(channel)
+        if not channel_external_id:
+            await self.channel_repo.update_last_checked(channel, now)
+            return ChannelCheckResult()
+
+        videos_info = await self.feed.fetch_feed_videos(
+            channel_external_id, since=channel.last_video_published_at
+        )
+        ingest_service = VideoIngestService(self.db)
+        new_videos = await ingest_service.ingest_batch(channel.id, videos_info)
+        enriched = await ingest_service.enrich(new_videos, youtube=self.youtube)
+
+        updates = {"last_checked_at": now}
+        if new_videos:
+            updates["last_video_published_at"] = max(v.published_at for v in videos_info)
+        await self.channel_repo.update(channel, updates)
+        await self.audit.log(
+            "channel", channel.id, "processed",
+            payload={"new_videos": len(new_videos), "backend": "rss"},
+        )
+        return ChannelCheckResult(new_videos=new_videos, from_feed=True, enriched=enriched)
+
+    async def backfill(self, channel_id: int, max_videos: int | None = None) -> dict:
+        """Importa o histórico de um canal recém-cadastrado, página a página.
+
+        Cada página é ingerida, commitada e publicada assim que chega, sem
+        esperar a listagem inteira. Importa no máximo `max_videos` vídeos
+        (padrão `YOUTUBE_BACKFILL_MAX_VIDEOS`), dos mais recentes aos mais
+        antigos; duplicatas são ignoradas pela ingestão.
+        """
+        max_videos = max_videos or settings.YOUTUBE_BACKFILL_MAX_VIDEOS
+        stats = {"pages": 0, "listed": 0, "new_videos": 0}
 
-        # Enfileira processamento de cada vídeo novo
-        for video in new_videos:
-            await ingest_service.enqueue_processing(video)
+        channel = await self.channel_repo.get_by_id(channel_id)
+        if channel is None:
+            return stats
+        uploads_playlist_id = await self._resolve_uploads_playlist(channel)
+        await self.db.commit()
+        if not uploads_playlist_id:
+            return stats
+
+        ingest_service = VideoIngestService(self.db)
+        most_recent = channel.last_video_published_at
+        pages = self.youtube.iter_playlist_pages(uploads_playlist_id, max_pages=math.ceil(max_videos / 50))
+        async with aclosing(pages):
+            async for page in pages:
+                videos_info = page.videos[: max_videos - stats["listed"]]
+                stats["pages"] += 1
+                stats["listed"] += len(videos_info)
+
+                # Uma página inteira de histórico: vai para o pipeline em estágios
+                new_videos = await ingest_service.ingest_batch(channel.id, videos_info, as_batch=True)
+                await ingest_service.enrich(new_videos, youtube=self.youtube)
+                newest = max((v.published_at for v in videos_info), default=None)
+                if newest and (most_recent is None or newest > most_recent):
+                    most_recent = newest
+                    await self.channel_repo.update(channel, {"last_video_published_at": most_recent})
+                await self.db.commit()
+                if new_videos:
+                    await self._relay_outbox()
+                stats["new_videos"] += len(new_videos)
+
+                if stats["listed"] >= max_videos:
+                    break
+                if await self.youtube.quota.allowance() == 0:
+                    stats["stopped_by_quota"] = True
+                    break
+
+        await self.audit.log("channel", channel.id, "backfilled", payload=stats)
+        await self.db.commit()
+        return stats
+
+    async def _resolve_external_id(self, channel) -> str | None:
+        """Resolve (e salva no canal) o channel_external_id a partir da URL."""
+        if channel.channel_external_id:
+            return channel.channel_external_id
+        channel_external_id = await self.youtube.get_channel_external_id(channel.channel_url)
+        if channel_external_id:
+            await self.channel_repo.update(channel, {"channel_external_id": channel_external_id})
+        return channel_external_id
+
+    async def _resolve_uploads_playlist(self, channel) -> str | None:
+        """Resolve (e salva no canal) o external_id e a uploads playlist."""
+        channel_external_id = await self._resolve_external_id(channel)
+        if not channel_external_id:
+            return None
 
-        return len(new_videos)
+        # A uploads playlist é resolvida uma vez e salva no canal
+        uploads_playlist_id = channel.uploads_playlist_id
+        if not uploads_playlist_id:
+            uploads_playlist_id = await self.youtube.get_uploads_playlist(channel_external_id)
+            if not uploads_playlist_id:
+                return None
+            await self.channel_repo.update(channel, {"uploads_playlist_id": uploads_playlist_id})
+        return uploads_playlist_id
 
     async def _create_job(self, channel_id: int) -> ProcessingJob:
         job = ProcessingJob(
@@ -0,0 +1,46 @@
+"""Agendamento de canais pelo `monitoring_frequency_minutes`.
+
+O próximo horário de verificação de um canal é
+`last_checked_at + monitoring_frequency_minutes`; canais nunca verificados
+estão vencidos desde sempre. Os canais ficam numa fila de prioridade
+(heap) ordenada por esse horário, e cada tick do beat retira apenas os
+vencidos — os mais atrasados primeiro.
+"""
+from __future__ import annotations
+
+import heapq
+from datetime import datetime, timedelta, timezone
+
+from app.models.channel import YoutubeChannel
+
+_NEVER_CHECKED = datetime.min.replace(tzinfo=timezone.utc)
+
+
+def next_due_at(channel: YoutubeChannel) -> datetime:
+    if channel.last_checked_at is None:
+        return _NEVER_CHECKED
+    return channel.last_checked_at + timedelta(minutes=channel.monitoring_frequency_minutes)
+
+
+class ChannelScheduler:
+    def __init__(self, channels: list[YoutubeChannel]):
+        self._heap: list[tuple[datetime, int, YoutubeChannel]] = [
+            (next_due_at(c), c.id, c) for c in channels
+        ]
+        heapq.heapify(self._heap)
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def pop_due(self, now: datetime, limit: int | None = None) -> list[YoutubeChannel]:
+        """Retira os canais vencidos em `now`, do mais atrasado ao menos atrasado."""
+        due: list[YoutubeChannel] = []
+        while self._heap and self._heap[0][0] <= now:
+            if limit is not None and len(due) >= limit:
+                break
+            due.append(heapq.heappop(self._heap)[2])
+        return due
+
+    def next_due_at(self) -> datetime | None:
+        """Horário do próximo canal a vencer entre os que restaram."""
+        return self._heap[0][0] if self._heap else None
@@ -34,6 +34,7 @@ class ChannelService:
             channel_url=data.channel_url,
             channel_external_id=data.channel_external_id,
             monitoring_frequency_minutes=data.monitoring_frequency_minutes,
+            discovery_backend=data.discovery_backend,
         )
         await self.audit.log("channel", channel.id, "created", actor_id, {"channel_name": data.channel_name})
         return ChannelResponse.model_validate(channel)
@@ -44,6 +45,10 @@ class ChannelService:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Canal não encontrado")
 
         updates = data.model_dump(exclude_none=True)
+        if updates.get("channel_external_id", channel.channel_external_id) != channel.channel_external_id:
+            # Outro canal: a uploads playlist salva deixa de valer
+            updates["uploads_playlist_id"] = None
+            updates["uploads_playlist_etag"] = None
         channel = await self.repo.update(channel, updates)
         await self.audit.log("channel", channel_id, "updated", actor_id, updates)
         return ChannelResponse.model_validate(channel)
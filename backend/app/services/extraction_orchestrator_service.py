@@ -39,18 +39,36 @@ class ExtractionOrchestratorService:
         tipster_id: int,
     ) -> None:
         """Executa extração completa e atualiza o VideoAnalysis."""
+        extraction = await self.extract(analysis, normalized_text, video_title)
+        if extraction is None:
+            await self.mark_failed(analysis)
+            return
+        await self.apply(analysis, extraction, tipster_id)
+
+    async def extract(
+        self,
+        analysis: VideoAnalysis,
+        normalized_text: str,
+        video_title: str,
+    ) -> dict[str, Any] | None:
+        """Chama o LLM. Não persiste ideias — ver `apply`."""
         # Mark as processing
         analysis.analysis_status = "processing"
         await self.db.flush()
+        return await self.llm.extract(normalized_text, video_title)
 
-        extraction = await self.llm.extract(normalized_text, video_title)
-
-        if extraction is None:
-            analysis.analysis_status = "failed"
-            analysis.analyzed_at = datetime.now(timezone.utc)
-            await self.db.flush()
-            return
+    async def mark_failed(self, analysis: VideoAnalysis) -> None:
+        analysis.analysis_status = "failed"
+        analysis.analyzed_at = datetime.now(timezone.utc)
+        await self.db.flush()
 
+    async def apply(
+        self,
+        analysis: VideoAnalysis,
+        extraction: dict[str, Any],
+        tipster_id: int,
+    ) -> None:
+        """Persiste as ideias de uma extração e atualiza o VideoAnalysis."""
         video_info = extraction.get("video_analysis", {})
         raw_status = video_info.get("analysis_status", "analyzed_without_matches")
 
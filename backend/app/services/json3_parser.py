@@ -0,0 +1,130 @@
+"""Parser incremental das legendas `.json3` do yt-dlp.
+
+O arquivo de uma live longa tem dezenas de milhares de eventos. Em vez de
+`json.load` no arquivo inteiro, o leitor percorre o objeto de topo com
+`JSONDecoder.raw_decode` sobre um buffer de tamanho fixo, reabastecido por
+blocos: as chaves de topo pequenas (`pens`, `wsWinStyles`...) são
+decodificadas e descartadas, e os itens de `events` são entregues um a
+um. Só um evento por vez existe como dict; o texto vai direto para o
+`TranscriptEntriesBuilder`. A memória de pico fica limitada ao tamanho do
+bloco mais a transcrição montada, independentemente do tamanho do arquivo.
+
+As regras de montagem das entradas são as do parser anterior: texto dos
+`segs` concatenado e com `strip()`, eventos vazios descartados, tempos em
+milissegundos convertidos para segundos.
+"""
+from __future__ import annotations
+
+import json
+import re
+from typing import IO, Iterator
+
+from app.services.transcript_service import TranscriptEntries, TranscriptEntriesBuilder
+
+_WS = re.compile(r"[ \t\n\r]*")
+_NUMBER_TAIL = re.compile(r"[0-9.eE+\-]*")
+CHUNK_SIZE = 64 * 1024
+
+
+class _StreamReader:
+    """Decodifica valores JSON de um arquivo texto, bloco a bloco."""
+
+    def __init__(self, f: IO[str], chunk_size: int = CHUNK_SIZE):
+        self.f = f
+        self.chunk_size = chunk_size
+        self.decoder = json.JSONDecoder()
+        self.buf = ""
+        self.pos = 0
+        self.eof = False
+
+    def _fill(self) -> bool:
+        chunk = self.f.read(self.chunk_size)
+        if not chunk:
+            self.eof = True
+            return False
+        self.buf = self.buf[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def peek(self) -> str:
+        """Próximo caractere que não é espaço ("" no fim do arquivo)."""
+        while True:
+            self.pos = _WS.match(self.buf, self.pos).end()
+            if self.pos < len(self.buf) or not self._fill():
+                return self.buf[self.pos:self.pos + 1]
+
+    def expect(self, char: str) -> None:
+        if self.peek() != char:
+            raise ValueError(f"json3 inválido: esperado {char!r} na posição {self.pos}")
+        self.pos += 1
+
+    def value(self):
+        self.peek()
+        while True:
+            try:
+                obj, end = self.decoder.raw_decode(self.buf, self.pos)
+            except json.JSONDecodeError:
+                # Valor cortado no fim do buffer: lê mais e tenta de novo
+                if self.eof or not self._fill():
+                    raise
+                continue
+            # Um número seguido só de caracteres de número até o fim do buffer
+            # pode continuar no próximo bloco ("2." decodifica como 2)
+            if (
+                isinstance(obj, (int, float)) and not isinstance(obj, bool)
+                and _NUMBER_TAIL.match(self.buf, end).end() == len(self.buf)
+                and not self.eof and self._fill()
+            ):
+                continue
+            self.pos = end
+            return obj
+
+
+def iter_json3_events(f: IO[str], chunk_size: int = CHUNK_SIZE) -> Iterator[dict]:
+    """Itera os itens de `events` do objeto json3, sem carregar o arquivo todo."""
+    reader = _StreamReader(f, chunk_size)
+    reader.expect("{")
+    if reader.peek() == "}":
+        return
+    while True:
+        key = reader.value()
+        reader.expect(":")
+        if key == "events":
+            reader.expect("[")
+            if reader.peek() == "]":
+                reader.pos += 1
+            else:
+                while True:
+                    yield reader.value()
+                    sep = reader.peek()
+                    reader.pos += 1
+                    if sep == "]":
+                        break
+                    if sep != ",":
+                        raise ValueError(f"json3 inválido: separador {sep!r} em events")
+        else:
+            reader.value()
+        sep = reader.peek()
+        reader.pos += 1
+        if sep == "}":
+            return
+        if sep != ",":
+            raise ValueError(f"json3 inválido: separador {sep!r} no objeto de topo")
+
+
+def parse_json3(path: str, chunk_size: int = CHUNK_SIZE) -> TranscriptEntries:
+    """Lê um `.json3` em streaming direto para um `TranscriptEntries`."""
+    builder = TranscriptEntriesBuilder()
+    with open(path, encoding="utf-8") as f:
+        for event in iter_json3_events(f, chunk_size):
+            segs = event.get("segs")
+            if not segs:
+                continue
+            if len(segs) == 1:
+                text = segs[0].get("utf8", "").strip()
+            else:
+                text = "".join(s.get("utf8", "") for s in segs).strip()
+            if not text:
+                continue
+            builder.append(text, event.get("tStartMs", 0) / 1000, event.get("dDurationMs", 0) / 1000)
+    return builder.build()
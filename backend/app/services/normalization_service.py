@@ -2,11 +2,38 @@
 
 Remove ruído (saudações, CTAs, propaganda) e normaliza o texto
 para facilitar a segmentação e extração de ideias.
+
+Os padrões de ruído são aplicados em sequência e a ordem importa: cada
+`sub` troca o trecho por espaço, o que pode criar casamentos para os
+padrões seguintes (`é [música] é` vira `é   é`). Para não percorrer o
+texto inteiro uma vez por padrão, `normalize` faz uma única varredura com
+`_NOISE_TRIGGER`, a alternação dos próprios padrões, e aplica a
+sequência original só em janelas em volta de cada ocorrência. Cada janela
+é estendida sobre espaços, `:` e palavras que algum padrão pode consumir
+(números, "é", "e", "minutos"...), até uma borda que nenhum padrão
+atravessa — o resultado é idêntico ao da aplicação sequencial. Colchetes
+aninhados e cabeçalhos de capítulo com colchetes caem no caminho
+sequencial. As CTAs são testadas com uma única alternação por sentença.
+
+As extensões de janela (`_CHAPTER_ZONE`, `_EXTEND_*`) e o filtro inicial
+do gatilho são escritos à mão e precisam acompanhar `_NOISE_PATTERNS`. Na importação,
+`_check_noise_superset` confere que a lista é a mesma para a qual foram
+escritos (`_NOISE_PATTERNS_DIGEST`), que todo padrão tem amostra em
+`_NOISE_PROBES` e que, em cada amostra, a remoção em janelas dá o mesmo
+resultado que a sequencial. Se algo divergir, registra um aviso e a
+remoção de ruído passa a usar só o caminho sequencial; a mesma conferência
+roda em CI com `python -m benchmarks.bench_normalization --check`.
 """
 from __future__ import annotations
 
+import hashlib
+import heapq
+import json
+import logging
 import re
 
+logger = logging.getLogger(__name__)
+
 # Padrões de ruído que não contêm conteúdo analítico
 _NOISE_PATTERNS: list[re.Pattern] = [
     re.compile(r"\[música\]", re.IGNORECASE),
@@ -28,6 +55,26 @@ _NOISE_PATTERNS: list[re.Pattern] = [
     re.compile(r"\b\d+\s+(?:minutos?|segundos?|horas?)", re.IGNORECASE),
 ]
 
+# Digest dos _NOISE_PATTERNS para os quais _CHAPTER_ZONE, _EXTEND_* e o
+# lookahead de _NOISE_TRIGGER foram escritos. Ao mexer na lista: revise esses
+# padrões, inclua amostras em _NOISE_PROBES e atualize o digest.
+_NOISE_PATTERNS_DIGEST = "5c1ccc19fb45a15b"
+
+# Amostras de cada padrão de ruído (cada padrão precisa casar com alguma)
+_NOISE_PROBES: tuple[str, ...] = (
+    "abre [Música] o jogo",
+    "palmas [Aplausos] agora",
+    "ri [risadas] muito [risada]",
+    "então uh o time ahh e hmmm",
+    "é é o jogo éé  é bom",
+    "intro\nCapítulo 2: escalação do time\nsegue",
+    "capitulo 3 : final\né\né depois",
+    "[limpando a garganta] vamos",
+    "aos 8:228 minutos e 22 segundos o gol 1:02:03",
+    "foram 22 segundos e 8 minutos e 2 horas",
+    "minuto e 5 segundos",
+)
+
 # Frases de CTA / autopropaganda que não devem virar ideias
 _CTA_PATTERNS: list[re.Pattern] = [
     re.compile(r"se inscreva.{0,40}canal", re.IGNORECASE),
@@ -40,8 +87,91 @@ _CTA_PATTERNS: list[re.Pattern] = [
     re.compile(r"cadastr.{0,60}bônus", re.IGNORECASE),
 ]
 
+# Caracteres comuns mal-codificados (aplicados em ordem)
+_ENCODING_FIXES: dict[str, str] = {
+    "â": "'",
+    "Ã£": "ã",
+    "Ã©": "é",
+    "Ã§Ã£o": "ção",
+}
+
+_SENTENCE_SPLIT = re.compile(r"(?<=[.!?])\s+")
+_MULTI_SPACE = re.compile(r"\s{2,}")
+
+
+_CTA_ANY = re.compile(
+    "(?=[acdlstw])(?:" + "|".join(f"(?:{p.pattern})" for p in _CTA_PATTERNS) + ")",
+    re.IGNORECASE,
+)
+
+# Capítulos (que vão até o fim da linha e podem ficar escondidos dentro de
+# outra ocorrência) são localizados à parte, um a um; a zona cobre o que a
+# linha pode virar depois das remoções anteriores.
+_FILLER = r"(?:\s|\[[^\]]*\]|(?<!\w)(?:u+h+|a+h+|h+m+|é+)(?!\w))*"
+_CHAPTER_START = re.compile(r"Cap[íi]tulo", re.IGNORECASE)
+# O resto da linha pode continuar na seguinte se "é\né" (ou "é\nuh é") sumir antes
+_CHAPTER_ZONE = re.compile(
+    r"Cap[íi]tulo" + _FILLER + r"(?:\d+" + _FILLER + r":(?:é+" + _FILLER + r"é+|[^\n])*)?",
+    re.IGNORECASE,
+)
+# Gatilho: colchetes entram como zonas inteiras (remoções internas podem
+# encurtá-los até caberem em `\[[^\]]{1,40}\]`), o resto é a alternação dos
+# próprios _NOISE_PATTERNS. O lookahead só descarta cedo as posições que não
+# começam nenhum padrão (capítulos já foram localizados à parte).
+_NOISE_TRIGGER = re.compile(
+    r"(?=[\[uahém\d])(?:\[[^\]]*\]|" + "|".join(f"(?:{p.pattern})" for p in _NOISE_PATTERNS) + ")",
+    re.IGNORECASE,
+)
+
+# Colchetes aninhados: uma remoção muda o pareamento, vai pelo caminho sequencial
+_NESTED_BRACKETS = re.compile(r"\[[^\]]*\[")
+
+# Trechos que algum padrão pode consumir: espaços, ":" e palavras inteiras
+# com dígito, hesitações, "é", "e" e minutos/segundos/horas. A versão
+# invertida estende a janela para a esquerda sobre o texto invertido.
+_EXTEND_RIGHT = re.compile(
+    r"(?:\s+|:|(?<!\w)(?:\w*\d\w*|u+h+|a+h+|h+m+|é+|e|(?:minuto|segundo|hora)\w*)(?!\w))*",
+    re.IGNORECASE,
+)
+_EXTEND_LEFT = re.compile(
+    r"(?:\s+|:|(?<!\w)(?:\w*\d\w*|h+u+|h+a+|m+h+|é+|e|\w*(?:otunim|odnuges|aroh))(?!\w))*",
+    re.IGNORECASE,
+)
+_WORD_TAIL = re.compile(r"\w*")
+
+
+def _digest(patterns: list[re.Pattern]) -> str:
+    payload = json.dumps([(p.pattern, p.flags) for p in patterns], ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+
+def _pattern_set_version() -> str:
+    """Hash do conjunto de regras que define a saída da normalização.
+
+    Entram os padrões de ruído e de CTA (texto e flags, em ordem), as
+    correções de encoding e as regras de sentença e de espaços. Os padrões
+    usados só pela varredura única ficam de fora: não mudam a saída, que é
+    a mesma da aplicação sequencial.
+    """
+    rules = {
+        "noise": [(p.pattern, p.flags) for p in _NOISE_PATTERNS],
+        "cta": [(p.pattern, p.flags) for p in _CTA_PATTERNS],
+        "encoding": list(_ENCODING_FIXES.items()),
+        "sentence": _SENTENCE_SPLIT.pattern,
+        "whitespace": _MULTI_SPACE.pattern,
+    }
+    payload = json.dumps(rules, ensure_ascii=False, sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+
+# Gravada junto de `normalized_transcript_text`: textos com outra versão
+# foram normalizados com regras antigas
+NORMALIZATION_VERSION = _pattern_set_version()
+
 
 class NormalizationService:
+    VERSION = NORMALIZATION_VERSION
+
     def normalize(self, raw_text: str) -> str:
         """Retorna versão normalizada do texto de transcrição."""
         text = self._fix_encoding(raw_text)
@@ -52,30 +182,98 @@ class NormalizationService:
 
     def _fix_encoding(self, text: str) -> str:
         # Corrige caracteres comuns mal-codificados
-        replacements = {
-            "â": "'",
-            "Ã£": "ã",
-            "Ã©": "é",
-            "Ã§Ã£o": "ção",
-        }
-        for bad, good in replacements.items():
+        for bad, good in _ENCODING_FIXES.items():
             text = text.replace(bad, good)
         return text
 
     def _remove_noise(self, text: str) -> str:
+        if not _WINDOWED_NOISE:
+            return self._remove_noise_sequential(text)
+        return self._remove_noise_windowed(text)
+
+    def _remove_noise_windowed(self, text: str) -> str:
+        if _NESTED_BRACKETS.search(text):
+            return self._remove_noise_sequential(text)
+        chapters = []
+        for match in _CHAPTER_START.finditer(text):
+            zone = _CHAPTER_ZONE.match(text, match.start())
+            if "[" in zone.group() or "]" in zone.group():
+                return self._remove_noise_sequential(text)
+            chapters.append(zone.span())
+
+        triggers = (m.span() for m in _NOISE_TRIGGER.finditer(text))
+        reversed_text = text[::-1]
+        n = len(text)
+        parts: list[str] = []
+        copied = 0           # text[:copied] já está em `parts`
+        win_start = win_end = -1
+        for start, end in heapq.merge(triggers, chapters):
+            # Completa a palavra cortada pelo gatilho e estende sobre o que
+            # os padrões podem consumir
+            start = n - _WORD_TAIL.match(reversed_text, n - start).end()
+            end = _WORD_TAIL.match(text, end).end()
+            start = n - _EXTEND_LEFT.match(reversed_text, n - start).end()
+            end = _EXTEND_RIGHT.match(text, end).end()
+            if start <= win_end:
+                win_start = min(win_start, start)
+                win_end = max(win_end, end)
+                continue
+            if win_end >= 0:
+                parts.append(text[copied:win_start])
+                parts.append(self._remove_noise_sequential(text[win_start:win_end]))
+                copied = win_end
+            win_start, win_end = start, end
+        if win_end < 0:
+            return text
+        parts.append(text[copied:win_start])
+        parts.append(self._remove_noise_sequential(text[win_start:win_end]))
+        parts.append(text[win_end:])
+        return "".join(parts)
+
+    def _remove_noise_sequential(self, text: str) -> str:
         for pattern in _NOISE_PATTERNS:
             text = pattern.sub(" ", text)
         return text
 
     def _remove_cta_sentences(self, text: str) -> str:
         """Remove sentenças que são majoritariamente CTA/propaganda."""
-        sentences = re.split(r"(?<=[.!?])\s+", text)
-        cleaned = []
-        for sentence in sentences:
-            if not any(p.search(sentence) for p in _CTA_PATTERNS):
-                cleaned.append(sentence)
-        return " ".join(cleaned)
+        return " ".join(s for s in _SENTENCE_SPLIT.split(text) if not _CTA_ANY.search(s))
 
     def _clean_whitespace(self, text: str) -> str:
-        text = re.sub(r"\s{2,}", " ", text)
+        text = _MULTI_SPACE.sub(" ", text)
         return text.strip()
+
+
+def _noise_superset_problem() -> str | None:
+    """Descreve a primeira divergência entre a remoção em janelas e a sequencial."""
+    if _digest(_NOISE_PATTERNS) != _NOISE_PATTERNS_DIGEST:
+        return (
+            "_NOISE_PATTERNS mudou: revise _CHAPTER_ZONE, _EXTEND_* e o lookahead de "
+            "_NOISE_TRIGGER, inclua amostras em _NOISE_PROBES e atualize _NOISE_PATTERNS_DIGEST"
+        )
+    service = NormalizationService()
+    for pattern in _NOISE_PATTERNS:
+        matches = [m.group() for probe in _NOISE_PROBES for m in pattern.finditer(probe)]
+        if not matches:
+            return f"padrão de ruído sem amostra em _NOISE_PROBES: {pattern.pattern!r}"
+        # Cada casamento isolado, para que nenhum outro gatilho abra a janela por ele
+        for text in (f"texto {match} fim" for match in matches):
+            if service._remove_noise_windowed(text) != service._remove_noise_sequential(text):
+                return f"_NOISE_TRIGGER/_EXTEND_* não cobrem {pattern.pattern!r} em {text!r}"
+    for text in _NOISE_PROBES:
+        if service._remove_noise_windowed(text) != service._remove_noise_sequential(text):
+            return f"remoção em janelas diverge da sequencial em {text!r}"
+    return None
+
+
+def _check_noise_superset() -> bool:
+    """Confere a remoção em janelas; se divergir, avisa e cai na sequencial."""
+    problem = _noise_superset_problem()
+    if problem:
+        logger.warning("Remoção de ruído em janelas desativada: %s", problem)
+        return False
+    return True
+
+
+# Falso quando a conferência falhou: _remove_noise usa só o caminho sequencial
+_WINDOWED_NOISE = _check_noise_superset()
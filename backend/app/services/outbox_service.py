@@ -0,0 +1,139 @@
+"""Outbox transacional para enfileirar tasks Celery.
+
+Quem precisa disparar uma task grava uma linha em `task_outbox` na mesma
+transação dos dados que a task vai ler (`OutboxService.add_many`). Se a
+transação sofre rollback, a task some junto; se faz commit, a task será
+publicada — nunca antes de os dados estarem visíveis para o worker.
+
+O `OutboxRelay` publica as linhas pendentes em lotes, reaproveitando uma
+única conexão com o broker por lote, e as marca como publicadas. Linhas
+travadas por outro relay são puladas (`FOR UPDATE SKIP LOCKED`), então
+vários relays podem rodar ao mesmo tempo. Uma falha entre publicar e
+marcar pode republicar uma task: os consumidores são idempotentes (lock
+por vídeo no Redis e, no banco, `VideoWorkflowService.begin`, que ignora
+vídeo já analisado ou com workflow em andamento).
+"""
+from __future__ import annotations
+
+import logging
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import delete, select, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.config import settings
+from app.models.outbox import TaskOutbox
+
+logger = logging.getLogger(__name__)
+
+
+class OutboxService:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def add(
+        self,
+        task_name: str,
+        args: list | None = None,
+        kwargs: dict | None = None,
+        dedup_key: str | None = None,
+    ) -> None:
+        await self.add_many(task_name, [(args, kwargs, dedup_key)])
+
+    async def add_many(
+        self, task_name: str, messages: list[tuple[list | None, dict | None, str | None]]
+    ) -> None:
+        """Grava várias tasks (args, kwargs, dedup_key) num único INSERT multi-linha.
+
+        Uma task com a mesma `dedup_key` de outra ainda pendente é descartada.
+        """
+        if not messages:
+            return
+        stmt = insert(TaskOutbox).values([
+            {"task_name": task_name, "args_json": args, "kwargs_json": kwargs, "dedup_key": dedup_key}
+            for args, kwargs, dedup_key in messages
+        ]).on_conflict_do_nothing(
+            index_elements=[TaskOutbox.dedup_key],
+            index_where=TaskOutbox.published_at.is_(None),
+        )
+        await self.db.execute(stmt)
+
+
+class OutboxRelay:
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession] | None = None,
+        batch_size: int | None = None,
+    ):
+        if session_factory is None:
+            from app.core.database import AsyncSessionLocal
+            session_factory = AsyncSessionLocal
+        self.session_factory = session_factory
+        self.batch_size = batch_size or settings.OUTBOX_RELAY_BATCH_SIZE
+
+    async def run(self, max_batches: int | None = None) -> dict:
+        """Publica as tasks pendentes, lote a lote, até esvaziar o outbox."""
+        stats = {"published": 0, "failed": 0, "batches": 0}
+        while max_batches is None or stats["batches"] < max_batches:
+            published, failed, fetched = await self._publish_batch()
+            stats["batches"] += 1
+            stats["published"] += published
+            stats["failed"] += failed
+            if failed or fetched < self.batch_size:
+                break
+        return stats
+
+    async def _publish_batch(self) -> tuple[int, int, int]:
+        from app.workers.celery_app import celery_app
+
+        async with self.session_factory() as db:
+            rows = (await db.scalars(
+                select(TaskOutbox)
+                .where(TaskOutbox.published_at.is_(None))
+                .order_by(TaskOutbox.id)
+                .limit(self.batch_size)
+                .with_for_update(skip_locked=True)
+            )).all()
+            if not rows:
+                return 0, 0, 0
+
+            published: list[int] = []
+            failed = 0
+            with celery_app.producer_or_acquire() as producer:
+                for row in rows:
+                    try:
+                        celery_app.send_task(
+                            row.task_name,
+                            args=row.args_json or [],
+                            kwargs=row.kwargs_json or {},
+                            task_id=f"outbox-{row.id}",
+                            producer=producer,
+                        )
+                    except Exception as exc:
+                        # Broker fora do ar: o resto do lote fica para o próximo ciclo
+                        logger.warning("Falha ao publicar outbox %s (%s): %s", row.id, row.task_name, exc)
+                        row.attempts += 1
+                        row.last_error = str(exc)
+                        failed = 1
+                        break
+                    published.append(row.id)
+
+            if published:
+                await db.execute(
+                    update(TaskOutbox)
+                    .where(TaskOutbox.id.in_(published))
+                    .values(published_at=datetime.now(timezone.utc))
+                )
+            await db.commit()
+            return len(published), failed, len(rows)
+
+    async def purge_published(self) -> int:
+        """Remove linhas publicadas há mais de `OUTBOX_RETENTION_HOURS`."""
+        cutoff = datetime.now(timezone.utc) - timedelta(hours=settings.OUTBOX_RETENTION_HOURS)
+        async with self.session_factory() as db:
+            result = await db.execute(
+                delete(TaskOutbox).where(TaskOutbox.published_at < cutoff)
+            )
+            await db.commit()
+            return result.rowcount or 0
@@ -13,9 +13,10 @@ Cada segmento é salvo em `transcript_segments`.
 from __future__ import annotations
 
 import re
+from collections.abc import Sequence
 from dataclasses import dataclass
 
-from app.services.transcript_service import TranscriptEntry
+from app.services.transcript_service import TranscriptEntries, TranscriptEntry
 
 
 @dataclass
@@ -67,17 +68,17 @@ _MIN_ANALYSIS_CHARS = 80
 
 
 class SegmentationService:
-    def segment_by_entries(self, entries: list[TranscriptEntry], normalized_text: str) -> list[Segment]:
+    def segment_by_entries(self, entries: Sequence[TranscriptEntry], normalized_text: str) -> list[Segment]:
         """Segmenta usando os timestamps das entradas da transcrição."""
         if not entries:
             return self._segment_text_only(normalized_text)
 
-        # Agrupa entradas em janelas de ~60 segundos ou por virada de tipo
-        windows = self._build_windows(entries)
+        # Agrupa entradas em janelas de ~60 segundos; o texto de cada janela
+        # é uma fatia do buffer da transcrição
+        entries = TranscriptEntries.from_entries(entries)
         segments: list[Segment] = []
-        for window in windows:
-            raw = " ".join(e.text for e in window)
-            normalized = normalized_text  # reutiliza o texto já normalizado globalmente
+        for first, stop in self._window_bounds(entries):
+            raw = entries.text_between(first, stop)
             seg_type = self._classify(raw)
             if len(raw.strip()) < 20:
                 continue
@@ -86,8 +87,8 @@ class SegmentationService:
                     raw_text=raw,
                     normalized_text=raw,  # segmento já é sub-texto do normalizado
                     segment_type=seg_type,
-                    start_seconds=window[0].start,
-                    end_seconds=window[-1].end,
+                    start_seconds=entries.starts[first],
+                    end_seconds=entries.end(stop - 1),
                 )
             )
         return segments or self._segment_text_only(normalized_text)
@@ -114,22 +115,22 @@ class SegmentationService:
             )
         return segments
 
-    def _build_windows(self, entries: list[TranscriptEntry], window_seconds: float = 60.0) -> list[list[TranscriptEntry]]:
-        """Agrupa entradas em janelas de tempo de ~window_seconds."""
-        if not entries:
+    @staticmethod
+    def _window_bounds(entries: TranscriptEntries, window_seconds: float = 60.0) -> list[tuple[int, int]]:
+        """Intervalos [início, fim) de índices de cada janela, só com a coluna de inícios."""
+        starts = entries.starts
+        if not starts:
             return []
-        windows: list[list[TranscriptEntry]] = []
-        current: list[TranscriptEntry] = [entries[0]]
-        window_start = entries[0].start
-        for entry in entries[1:]:
-            if entry.start - window_start <= window_seconds:
-                current.append(entry)
-            else:
-                windows.append(current)
-                current = [entry]
-                window_start = entry.start
-        windows.append(current)
-        return windows
+        bounds: list[tuple[int, int]] = []
+        first = 0
+        window_start = starts[0]
+        for i in range(1, len(starts)):
+            if starts[i] - window_start > window_seconds:
+                bounds.append((first, i))
+                first = i
+                window_start = starts[i]
+        bounds.append((first, len(starts)))
+        return bounds
 
     def _classify(self, text: str) -> str:
         scores: dict[str, int] = {seg_type: 0 for seg_type in _COMPILED}
@@ -0,0 +1,275 @@
+"""Execução em estágios do pipeline de vídeo.
+
+Mantém vários vídeos em andamento no mesmo processo, com filas
+limitadas entre as etapas do `VideoWorkflowService`:
+
+    fetch (begin + fetch) → cpu (prepare) → llm (extract + persist + evaluate)
+
+Usado pelo backfill de canais (`process_video_batch`), que ingere muitos
+vídeos de uma vez. As etapas são as mesmas do workflow encadeado: o
+`begin` ignora vídeos já analisados ou com job em andamento, e uma
+transcrição já persistida é reaproveitada.
+
+Cada estágio tem seu próprio limite de concorrência, e as filas
+(`asyncio.Queue` com `maxsize`) aplicam back-pressure: se o LLM está
+lento, o fetch para de baixar transcrições em vez de acumular memória.
+
+Antes de começar, as transcrições do lote são puxadas do proxy local em
+poucas requisições (`TranscriptService.prefetch_from_proxy`) para o cache
+em disco; o estágio de fetch as lê de lá.
+
+Vídeos que já estão sendo processados por outro worker (lock no Redis,
+ver `app.core.locks`) são ignorados. Cada vídeo usa sua própria sessão
+de banco, comitada no fim de cada etapa.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from typing import Awaitable, Callable
+
+from sqlalchemy import or_, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.config import settings
+from app.core.locks import RedisLock, video_lock
+from app.core.redis import incr_metric
+from app.models.transcript import VideoTranscript
+from app.models.video import Video
+from app.services.transcript_service import TranscriptService
+from app.services.video_workflow_service import VideoWorkflowService
+
+logger = logging.getLogger(__name__)
+
+STAGES = ("fetch", "cpu", "llm")
+
+# Sinaliza aos workers de um estágio que não há mais itens
+_STOP = object()
+
+
+@dataclass
+class _Item:
+    service: VideoWorkflowService
+    video_id: int
+    job_id: int
+    lock: RedisLock
+
+
+class StagedVideoPipeline:
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession] | None = None,
+        fetch_concurrency: int | None = None,
+        cpu_concurrency: int | None = None,
+        llm_concurrency: int | None = None,
+        queue_size: int | None = None,
+        report_interval: float = 30.0,
+    ):
+        if session_factory is None:
+            from app.core.database import AsyncSessionLocal
+            session_factory = AsyncSessionLocal
+        self.session_factory = session_factory
+        self.concurrency = {
+            "fetch": fetch_concurrency or settings.PIPELINE_FETCH_CONCURRENCY,
+            "cpu": cpu_concurrency or settings.PIPELINE_CPU_CONCURRENCY,
+            "llm": llm_concurrency or settings.PIPELINE_LLM_CONCURRENCY,
+        }
+        self.queue_size = queue_size or settings.PIPELINE_QUEUE_SIZE
+        self.report_interval = report_interval
+
+        self._queues: dict[str, asyncio.Queue] = {}
+        self._in_flight = {stage: 0 for stage in STAGES}
+        self._max_depth = {stage: 0 for stage in STAGES}
+        self._processed = {stage: 0 for stage in STAGES}
+        self._failed = {stage: 0 for stage in STAGES}
+
+    async def run(self, video_ids: list[int]) -> dict:
+        """Processa todos os vídeos e retorna estatísticas por estágio."""
+        # A fila de entrada recebe só ids; as filas internas são limitadas
+        self._queues = {
+            "fetch": asyncio.Queue(),
+            "cpu": asyncio.Queue(maxsize=self.queue_size),
+            "llm": asyncio.Queue(maxsize=self.queue_size),
+        }
+        for video_id in video_ids:
+            self._queues["fetch"].put_nowait(video_id)
+        self._max_depth["fetch"] = len(video_ids)
+        for _ in range(self.concurrency["fetch"]):
+            self._queues["fetch"].put_nowait(_STOP)
+
+        started = time.monotonic()
+        await self._prefetch_transcripts(video_ids)
+        reporter = asyncio.create_task(self._report_loop())
+        try:
+            await asyncio.gather(
+                self._run_stage("fetch", self._fetch, next_stage="cpu"),
+                self._run_stage("cpu", self._compute, next_stage="llm"),
+                self._run_stage("llm", self._extract, next_stage=None),
+            )
+        finally:
+            reporter.cancel()
+
+        stats = self.snapshot()
+        stats["videos"] = len(video_ids)
+        stats["elapsed_seconds"] = round(time.monotonic() - started, 2)
+        logger.info("Pipeline em estágios concluído: %s", stats)
+        return stats
+
+    async def _prefetch_transcripts(self, video_ids: list[int]) -> None:
+        """Puxa as transcrições do lote do proxy em poucas requisições.
+
+        Vão para o cache local, onde o estágio de fetch as encontra. Falhas
+        só são logadas: o fetch de cada vídeo segue pelas fontes normais.
+        """
+        if not video_ids:
+            return
+        try:
+            async with self.session_factory() as db:
+                youtube_ids = list((await db.scalars(
+                    select(Video.youtube_video_id)
+                    .outerjoin(VideoTranscript, VideoTranscript.video_id == Video.id)
+                    .where(Video.id.in_(video_ids))
+                    .where(or_(
+                        VideoTranscript.transcript_source.is_(None),
+                        VideoTranscript.transcript_source != "manual",
+                    ))
+                )).all())
+            stored = await TranscriptService().prefetch_from_proxy(youtube_ids)
+            logger.info("Prefetch do proxy: %d de %d transcrições", stored, len(youtube_ids))
+        except Exception as exc:
+            logger.warning("Prefetch de transcrições falhou: %s", exc)
+
+    def queue_depths(self) -> dict[str, int]:
+        """Quantidade de itens aguardando em cada estágio."""
+        return {stage: queue.qsize() for stage, queue in self._queues.items()}
+
+    def snapshot(self) -> dict:
+        depths = self.queue_depths()
+        return {
+            stage: {
+                "queued": depths.get(stage, 0),
+                "max_queued": self._max_depth[stage],
+                "in_flight": self._in_flight[stage],
+                "processed": self._processed[stage],
+                "failed": self._failed[stage],
+            }
+            for stage in STAGES
+        }
+
+    # ── Execução dos estágios ─────────────────────────────────────────────
+
+    async def _run_stage(
+        self,
+        stage: str,
+        handler: Callable[[object], Awaitable[_Item | None]],
+        next_stage: str | None,
+    ) -> None:
+        inbox = self._queues[stage]
+
+        async def worker() -> None:
+            while True:
+                item = await inbox.get()
+                if item is _STOP:
+                    return
+                self._in_flight[stage] += 1
+                try:
+                    result = await handler(item)
+                except Exception:
+                    # Erros de infraestrutura (ex.: Redis) não derrubam o lote
+                    logger.exception("Erro inesperado no estágio %s", stage)
+                    self._failed[stage] += 1
+                    result = None
+                finally:
+                    self._in_flight[stage] -= 1
+                self._processed[stage] += 1
+                if result is not None and next_stage:
+                    outbox = self._queues[next_stage]
+                    await outbox.put(result)
+                    self._max_depth[next_stage] = max(self._max_depth[next_stage], outbox.qsize())
+
+        await asyncio.gather(*(worker() for _ in range(self.concurrency[stage])))
+        if next_stage:
+            for _ in range(self.concurrency[next_stage]):
+                await self._queues[next_stage].put(_STOP)
+
+    async def _fetch(self, video_id: int) -> _Item | None:
+        lock = video_lock(video_id)
+        if not await lock.acquire():
+            await incr_metric("process_video.duplicates_prevented")
+            logger.info("Vídeo %s já está em processamento — ignorado", video_id)
+            return None
+
+        db = self.session_factory()
+        service = VideoWorkflowService(db)
+        job_id = None
+        try:
+            # Mesma guarda do process_video: vídeo analisado ou com job em andamento é ignorado
+            job_id = await service.begin(video_id)
+            if job_id is None:
+                await self._close(db, lock)
+                return None
+            await service.fetch(job_id)
+            if not await service.is_running(job_id):
+                # Sem transcrição: o workflow já foi finalizado
+                await self._close(db, lock)
+                return None
+        except Exception as exc:
+            return await self._abort("fetch", service, video_id, job_id, lock, exc)
+        return _Item(service=service, video_id=video_id, job_id=job_id, lock=lock)
+
+    async def _compute(self, item: _Item) -> _Item | None:
+        try:
+            await item.lock.refresh()
+            await item.service.prepare(item.job_id)
+        except Exception as exc:
+            return await self._abort("cpu", item.service, item.video_id, item.job_id, item.lock, exc)
+        return item
+
+    async def _extract(self, item: _Item) -> None:
+        try:
+            async with item.lock.heartbeat():
+                await item.service.extract(item.job_id)
+                await item.service.persist(item.job_id)
+                await item.service.evaluate(item.job_id)
+        except Exception as exc:
+            return await self._abort("llm", item.service, item.video_id, item.job_id, item.lock, exc)
+        await self._close(item.service.db, item.lock)
+        return None
+
+    async def _abort(
+        self,
+        stage: str,
+        service: VideoWorkflowService,
+        video_id: int,
+        job_id: int | None,
+        lock: RedisLock,
+        exc: Exception,
+    ) -> None:
+        """Registra a falha de um vídeo sem interromper os demais."""
+        self._failed[stage] += 1
+        logger.exception("Falha no estágio %s do vídeo %s", stage, video_id)
+        try:
+            await service.db.rollback()
+            if job_id is not None:
+                await service.fail_job(job_id, exc)
+        except Exception:
+            logger.exception("Falha ao registrar erro do vídeo %s", video_id)
+        finally:
+            await self._close(service.db, lock)
+        return None
+
+    @staticmethod
+    async def _close(db: AsyncSession, lock: RedisLock) -> None:
+        await db.close()
+        try:
+            await lock.release()
+        except Exception:
+            # Sem Redis o lock expira sozinho pelo TTL
+            logger.warning("Falha ao liberar %s", lock.key)
+
+    async def _report_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.report_interval)
+            logger.info("Pipeline em estágios — filas: %s", self.snapshot())
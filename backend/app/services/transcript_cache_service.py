@@ -0,0 +1,218 @@
+"""Cache local (em disco) de transcrições.
+
+Cada vídeo tem um diretório derivado do hash do `youtube_video_id`
+(`<raiz>/ab/abcdef.../`), com um arquivo por idioma (`<idioma>.trc`). O
+arquivo guarda as entradas num formato binário compacto, comprimido com
+zlib:
+
+    cabeçalho  "TRC1" + struct (n entradas, has_timestamps, tamanhos)
+    source, language_code    utf-8
+    starts, durations        array de float64
+    tamanhos dos textos      array de uint32
+    textos                   utf-8 concatenados
+
+"Sem transcrição" também é guardado (arquivo `none`), com TTL curto
+(`TRANSCRIPT_CACHE_NEGATIVE_TTL_SECONDS`). Um acerto renova o mtime do
+arquivo; quando o cache passa de `TRANSCRIPT_CACHE_MAX_BYTES`, os arquivos
+menos usados recentemente são removidos até 90% do limite.
+"""
+from __future__ import annotations
+
+import hashlib
+import logging
+import os
+import struct
+import tempfile
+import threading
+import time
+import zlib
+from array import array
+
+from app.core.config import settings
+from app.services.transcript_service import TranscriptEntries, TranscriptResult
+
+logger = logging.getLogger(__name__)
+
+_MAGIC = b"TRC1"
+_HEADER = struct.Struct("<4sI?HH")   # magic, n, has_timestamps, len(source), len(lang)
+_SUFFIX = ".trc"
+_NEGATIVE = "none"
+
+# Resultado de `get` para "sabidamente sem transcrição"
+MISSING = object()
+
+
+def encode_result(result: TranscriptResult) -> bytes:
+    entries = result.entries
+    texts = [e.text.encode("utf-8") for e in entries]
+    source = result.source.encode("utf-8")
+    lang = result.language_code.encode("utf-8")
+    parts = [
+        _HEADER.pack(_MAGIC, len(texts), result.has_timestamps, len(source), len(lang)),
+        source,
+        lang,
+        entries.starts.tobytes(),
+        entries.durations.tobytes(),
+        array("I", (len(t) for t in texts)).tobytes(),
+        b"".join(texts),
+    ]
+    return zlib.compress(b"".join(parts), 6)
+
+
+def decode_result(data: bytes) -> TranscriptResult:
+    raw = memoryview(zlib.decompress(data))
+    magic, n, has_timestamps, source_len, lang_len = _HEADER.unpack_from(raw)
+    if magic != _MAGIC:
+        raise ValueError("formato de cache desconhecido")
+    offset = _HEADER.size
+    source = bytes(raw[offset:offset + source_len]).decode("utf-8")
+    offset += source_len
+    lang = bytes(raw[offset:offset + lang_len]).decode("utf-8")
+    offset += lang_len
+
+    def take(typecode: str) -> array:
+        nonlocal offset
+        values = array(typecode)
+        size = values.itemsize * n
+        values.frombytes(raw[offset:offset + size])
+        offset += size
+        return values
+
+    starts, durations, lengths = take("d"), take("d"), take("I")
+    texts = []
+    for length in lengths:
+        texts.append(bytes(raw[offset:offset + length]).decode("utf-8"))
+        offset += length
+    return TranscriptResult(
+        entries=TranscriptEntries.from_columns(texts, starts, durations),
+        source=source,
+        language_code=lang,
+        has_timestamps=has_timestamps,
+    )
+
+
+class TranscriptCache:
+    def __init__(
+        self,
+        root: str | None = None,
+        max_bytes: int | None = None,
+        negative_ttl: float | None = None,
+    ):
+        self.root = root or settings.TRANSCRIPT_CACHE_DIR
+        self.max_bytes = max_bytes or settings.TRANSCRIPT_CACHE_MAX_BYTES
+        self.negative_ttl = negative_ttl if negative_ttl is not None else settings.TRANSCRIPT_CACHE_NEGATIVE_TTL_SECONDS
+        self._size: int | None = None   # estimativa do tamanho total; calculada sob demanda
+        self._size_lock = threading.Lock()
+
+    def _video_dir(self, youtube_video_id: str) -> str:
+        digest = hashlib.sha256(youtube_video_id.encode("utf-8")).hexdigest()
+        return os.path.join(self.root, digest[:2], digest)
+
+    def get(self, youtube_video_id: str, preferred_langs: list[str] | None = None):
+        """TranscriptResult em cache, `MISSING` (sem transcrição, dentro do TTL) ou None."""
+        video_dir = self._video_dir(youtube_video_id)
+        try:
+            names = os.listdir(video_dir)
+        except FileNotFoundError:
+            return None
+
+        langs = [n[: -len(_SUFFIX)] for n in names if n.endswith(_SUFFIX)]
+        if langs:
+            order = preferred_langs or []
+            lang = min(langs, key=lambda l: (order.index(l) if l in order else len(order), l))
+            path = os.path.join(video_dir, lang + _SUFFIX)
+            try:
+                with open(path, "rb") as f:
+                    result = decode_result(f.read())
+                os.utime(path)   # LRU: acerto renova o mtime
+                return result
+            except (OSError, ValueError, zlib.error, struct.error) as exc:
+                logger.warning("Cache de transcrição corrompido (%s): %s", path, exc)
+                self._remove(path)
+                return None
+
+        if _NEGATIVE in names:
+            path = os.path.join(video_dir, _NEGATIVE)
+            try:
+                if time.time() - os.path.getmtime(path) < self.negative_ttl:
+                    return MISSING
+            except OSError:
+                return None
+            self._remove(path)
+        return None
+
+    def put(self, youtube_video_id: str, result: TranscriptResult) -> None:
+        video_dir = self._video_dir(youtube_video_id)
+        self._write(video_dir, result.language_code + _SUFFIX, encode_result(result))
+        self._remove(os.path.join(video_dir, _NEGATIVE))
+
+    def put_missing(self, youtube_video_id: str) -> None:
+        self._write(self._video_dir(youtube_video_id), _NEGATIVE, b"")
+
+    def _write(self, video_dir: str, name: str, data: bytes) -> None:
+        os.makedirs(video_dir, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=video_dir, suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp, os.path.join(video_dir, name))   # escrita atômica
+        self._track(len(data))
+
+    def _remove(self, path: str) -> None:
+        try:
+            size = os.path.getsize(path)
+            os.remove(path)
+            self._track(-size)
+        except FileNotFoundError:
+            pass
+
+    def _track(self, delta: int) -> None:
+        with self._size_lock:
+            if self._size is None:
+                self._size = sum(size for _, size, _ in self._scan())
+            else:
+                self._size += delta
+            over = self._size > self.max_bytes
+        if over:
+            self.evict()
+
+    def _scan(self):
+        for dirpath, _, filenames in os.walk(self.root):
+            for name in filenames:
+                path = os.path.join(dirpath, name)
+                try:
+                    st = os.stat(path)
+                except FileNotFoundError:
+                    continue
+                yield path, st.st_size, st.st_mtime
+
+    def evict(self) -> int:
+        """Remove os arquivos menos usados até o cache ficar em 90% do limite."""
+        files = sorted(self._scan(), key=lambda f: f[2])
+        total = sum(size for _, size, _ in files)
+        target = int(self.max_bytes * 0.9)
+        removed = 0
+        for path, size, _ in files:
+            if total <= target:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                continue
+            total -= size
+            removed += 1
+        with self._size_lock:
+            self._size = total
+        if removed:
+            logger.info("Cache de transcrição: %d arquivos removidos (%d bytes restantes)", removed, total)
+        return removed
+
+
+_cache: TranscriptCache | None = None
+
+
+def get_transcript_cache() -> TranscriptCache:
+    """Instância do processo (mantém a estimativa de tamanho entre chamadas)."""
+    global _cache
+    if _cache is None:
+        _cache = TranscriptCache()
+    return _cache
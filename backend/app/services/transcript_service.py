@@ -1,22 +1,65 @@
 """Serviço de transcrição de vídeos do YouTube.
 
-Estratégia em cascata:
-1. yt-dlp (legendas automáticas — mais resistente a bloqueios de IP)
-2. youtube-transcript-api (fallback)
+Consulta o cache local em disco e depois as fontes: proxy local (IP
+residencial), yt-dlp (legendas automáticas) e youtube-transcript-api.
 """
 from __future__ import annotations
 
+import asyncio
 import json
 import logging
-import subprocess
+import sys
 import tempfile
 import os
+import time
+from array import array
+from collections import deque
+from collections.abc import Iterable, Iterator, Sequence
 from dataclasses import dataclass
 
+from app.core.circuit_breaker import CircuitBreaker
+from app.core.config import settings
+from app.core.http import get_http_client
+
 logger = logging.getLogger(__name__)
 
+_ytdlp_slots: asyncio.Semaphore | None = None
+_ytdlp_slots_loop: asyncio.AbstractEventLoop | None = None
 
-@dataclass
+
+def _ytdlp_semaphore() -> asyncio.Semaphore:
+    """Limite de processos yt-dlp simultâneos, por event loop."""
+    global _ytdlp_slots, _ytdlp_slots_loop
+    loop = asyncio.get_running_loop()
+    if _ytdlp_slots is None or _ytdlp_slots_loop is not loop:
+        _ytdlp_slots = asyncio.Semaphore(settings.YTDLP_MAX_CONCURRENCY)
+        _ytdlp_slots_loop = loop
+    return _ytdlp_slots
+
+
+async def _run_subprocess(cmd: list[str], timeout: float) -> tuple[int, str]:
+    """Executa `cmd` sem bloquear o loop; mata o processo em timeout/cancelamento.
+
+    Retorna o código de saída e o stderr.
+    """
+    async with _ytdlp_semaphore():
+        proc = await asyncio.create_subprocess_exec(
+            *cmd,
+            stdout=asyncio.subprocess.DEVNULL,
+            stderr=asyncio.subprocess.PIPE,
+        )
+        try:
+            _, stderr = await asyncio.wait_for(proc.communicate(), timeout=timeout)
+            return proc.returncode, stderr.decode("utf-8", errors="replace")
+        except BaseException:
+            # TimeoutError ou CancelledError: não deixa o yt-dlp órfão
+            if proc.returncode is None:
+                proc.kill()
+                await proc.wait()
+            raise
+
+
+@dataclass(slots=True)
 class TranscriptEntry:
     text: str
     start: float
@@ -27,67 +70,495 @@ class TranscriptEntry:
         return self.start + self.duration
 
 
+class TranscriptEntries(Sequence[TranscriptEntry]):
+    """Entradas de uma transcrição em colunas.
+
+    Uma live de 4 horas tem dezenas de milhares de entradas; em vez de um
+    objeto por entrada, os inícios e durações ficam em `array("d")` e os
+    textos num único buffer, unidos por espaço, com o offset de cada um.
+    `text` (o buffer) já é o texto completo, e o texto de um intervalo de
+    entradas é uma fatia do buffer (`text_between`).
+
+    Continua sendo uma sequência de `TranscriptEntry`: indexar ou iterar
+    cria as entradas sob demanda, e fatiar devolve outro `TranscriptEntries`.
+    """
+
+    __slots__ = ("starts", "durations", "offsets", "text")
+
+    def __init__(self, starts: array, durations: array, offsets: array, text: str):
+        # offsets[i] é o início do texto i em `text`; offsets[n] = len(text) + 1
+        self.starts = starts
+        self.durations = durations
+        self.offsets = offsets
+        self.text = text
+
+    @classmethod
+    def from_columns(
+        cls, texts: Iterable[str], starts: Iterable[float], durations: Iterable[float]
+    ) -> TranscriptEntries:
+        builder = TranscriptEntriesBuilder()
+        for text, start, duration in zip(texts, starts, durations):
+            builder.append(text, start, duration)
+        return builder.build()
+
+    @classmethod
+    def from_entries(cls, entries: Iterable[TranscriptEntry]) -> TranscriptEntries:
+        if isinstance(entries, TranscriptEntries):
+            return entries
+        builder = TranscriptEntriesBuilder()
+        for e in entries:
+            builder.append(e.text, e.start, e.duration)
+        return builder.build()
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            start, stop, step = index.indices(len(self))
+            if step != 1:
+                return TranscriptEntries.from_entries(self[i] for i in range(start, stop, step))
+            stop = max(stop, start)
+            base = self.offsets[start]
+            return TranscriptEntries(
+                self.starts[start:stop],
+                self.durations[start:stop],
+                array("Q", (o - base for o in self.offsets[start:stop + 1])),
+                self.text_between(start, stop),
+            )
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("índice de entrada fora do intervalo")
+        return TranscriptEntry(
+            text=self.text[self.offsets[index]:self.offsets[index + 1] - 1],
+            start=self.starts[index],
+            duration=self.durations[index],
+        )
+
+    def __iter__(self) -> Iterator[TranscriptEntry]:
+        text, offsets = self.text, self.offsets
+        for i, (start, duration) in enumerate(zip(self.starts, self.durations)):
+            yield TranscriptEntry(text[offsets[i]:offsets[i + 1] - 1], start, duration)
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, TranscriptEntries):
+            return (
+                self.starts == other.starts
+                and self.durations == other.durations
+                and self.offsets == other.offsets
+                and self.text == other.text
+            )
+        if isinstance(other, list):
+            return list(self) == other
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"TranscriptEntries({len(self)} entradas, {len(self.text)} caracteres)"
+
+    def end(self, index: int) -> float:
+        return self.starts[index] + self.durations[index]
+
+    def text_between(self, first: int, stop: int) -> str:
+        """Textos das entradas [first, stop) unidos por espaço, sem cópias intermediárias."""
+        if stop <= first:
+            return ""
+        return self.text[self.offsets[first]:self.offsets[stop] - 1]
+
+    def nbytes(self) -> int:
+        """Memória aproximada ocupada pelas colunas e pelo buffer de texto."""
+        return (
+            sys.getsizeof(self.starts) + sys.getsizeof(self.durations)
+            + sys.getsizeof(self.offsets) + sys.getsizeof(self.text)
+        )
+
+
+class TranscriptEntriesBuilder:
+    """Monta um `TranscriptEntries` entrada a entrada (parsers e decodificadores)."""
+
+    __slots__ = ("_texts", "_starts", "_durations", "_offsets")
+
+    def __init__(self):
+        self._texts: list[str] = []
+        self._starts = array("d")
+        self._durations = array("d")
+        self._offsets = array("Q", [0])
+
+    def __len__(self) -> int:
+        return len(self._starts)
+
+    def append(self, text: str, start: float, duration: float) -> None:
+        self._texts.append(text)
+        self._starts.append(start)
+        self._durations.append(duration)
+        self._offsets.append(self._offsets[-1] + len(text) + 1)
+
+    def build(self) -> TranscriptEntries:
+        entries = TranscriptEntries(self._starts, self._durations, self._offsets, " ".join(self._texts))
+        self.__init__()
+        return entries
+
+
 @dataclass
 class TranscriptResult:
-    entries: list[TranscriptEntry]
+    entries: TranscriptEntries
     source: str          # yt_dlp | youtube_api | whisper | manual
     language_code: str
     has_timestamps: bool = True
 
+    def __post_init__(self):
+        # Aceita qualquer sequência de TranscriptEntry (ex.: listas antigas)
+        self.entries = TranscriptEntries.from_entries(self.entries)
+
     @property
     def full_text(self) -> str:
-        return " ".join(e.text for e in self.entries)
+        return self.entries.text
+
+    def entries_to_json(self) -> list[dict]:
+        """Serializa as entradas no mesmo formato usado pelo proxy."""
+        return [{"text": e.text, "start": e.start, "duration": e.duration} for e in self.entries]
+
+
+def entries_from_json(data: list[dict]) -> TranscriptEntries:
+    builder = TranscriptEntriesBuilder()
+    for e in data:
+        builder.append(e["text"], e["start"], e["duration"])
+    return builder.build()
 
 
 COOKIES_PATH = "/app/youtube_cookies.txt"
 
+# Mensagens do yt-dlp que indicam bloqueio (e não vídeo sem legenda)
+_YTDLP_BLOCKED_MARKERS = ("HTTP Error 429", "Sign in to confirm", "confirm you're not a bot")
+
+
+class SourceUnavailable(Exception):
+    """A fonte falhou (fora do ar, bloqueada, timeout) — conta para o breaker.
+
+    Uma fonte que responde normalmente mas não tem transcrição para o
+    vídeo retorna None, o que não é falha da fonte.
+    """
+
+# Ordem usada enquanto não há estatísticas
+SOURCES = ("proxy", "yt_dlp", "youtube_api")
+
+
+class SourceStats:
+    """Janela deslizante de resultados e latências de uma fonte (por processo).
+
+    Sucesso é a fonte responder: "sem transcrição" é uma resposta
+    definitiva sobre o vídeo, não uma falha da fonte, e conta como sucesso.
+    """
+
+    def __init__(self, window: int):
+        self.outcomes: deque[bool] = deque(maxlen=window)
+        self.latencies: deque[float] = deque(maxlen=window)
+
+    def record(self, ok: bool, latency: float) -> None:
+        self.outcomes.append(ok)
+        self.latencies.append(latency)
+
+    @property
+    def success_rate(self) -> float:
+        # Suavizado (Laplace): fonte sem histórico começa em 0.5
+        return (sum(self.outcomes) + 1) / (len(self.outcomes) + 2)
+
+    def percentile(self, q: float) -> float | None:
+        if len(self.latencies) < settings.TRANSCRIPT_HEDGE_MIN_SAMPLES:
+            return None
+        ordered = sorted(self.latencies)
+        return ordered[min(int(q * len(ordered)), len(ordered) - 1)]
+
+    def expected_cost(self) -> float:
+        """Latência mediana / taxa de sucesso; infinito sem amostras suficientes.
+
+        Tentar as fontes em ordem crescente dessa razão minimiza o tempo
+        esperado até a primeira resposta válida.
+        """
+        median = self.percentile(0.5)
+        if median is None:
+            return float("inf")
+        return median / max(self.success_rate, 0.01)
+
+    def to_dict(self) -> dict:
+        return {
+            "samples": len(self.outcomes),
+            "success_rate": round(self.success_rate, 3),
+            "p50_seconds": self.percentile(0.5),
+            "p90_seconds": self.percentile(0.9),
+        }
+
+
+_source_stats: dict[str, SourceStats] = {}
+
+
+def source_stats(name: str) -> SourceStats:
+    if name not in _source_stats:
+        _source_stats[name] = SourceStats(settings.TRANSCRIPT_STATS_WINDOW)
+    return _source_stats[name]
+
+
+def source_breaker(name: str) -> CircuitBreaker:
+    """Breaker da fonte, com estado compartilhado entre workers via Redis."""
+    return CircuitBreaker(f"transcript:{name}")
+
 
 class TranscriptService:
     PREFERRED_LANGS = ["pt", "pt-BR", "pt-PT", "en"]
 
+    def __init__(self, cache=None):
+        if cache is None and settings.TRANSCRIPT_CACHE_ENABLED:
+            from app.services.transcript_cache_service import get_transcript_cache
+            cache = get_transcript_cache()
+        self.cache = cache
+
     def _cookies_available(self) -> bool:
         return os.path.isfile(COOKIES_PATH)
 
+    def _source_fetcher(self, name: str):
+        return {
+            "proxy": self._from_proxy,
+            "yt_dlp": self._from_ytdlp,
+            "youtube_api": self._from_youtube,
+        }[name]
+
+    def source_order(self) -> list[str]:
+        """Fontes da mais barata para a mais cara (custo esperado, depois ordem padrão).
+
+        O custo esperado vem do histórico do processo (`SourceStats`):
+        latência mediana / taxa de sucesso.
+        """
+        return sorted(SOURCES, key=lambda name: (source_stats(name).expected_cost(), SOURCES.index(name)))
+
     async def fetch(self, youtube_video_id: str) -> TranscriptResult | None:
-        result = await self._from_proxy(youtube_video_id)
-        if result:
-            return result
-        result = await self._from_ytdlp(youtube_video_id)
-        if result:
+        """Busca a transcrição, consultando o cache local antes de qualquer fonte.
+
+        "Sem transcrição" só é cacheado (com TTL curto) quando todas as
+        fontes responderam sem falha.
+        """
+        if self.cache is None:
+            result, _ = await self._fetch_from_sources(youtube_video_id)
             return result
-        result = await self._from_youtube(youtube_video_id)
+
+        from app.services.transcript_cache_service import MISSING
+        try:
+            cached = await asyncio.to_thread(self.cache.get, youtube_video_id, self.PREFERRED_LANGS)
+        except OSError as exc:
+            logger.warning("Cache de transcrição indisponível: %s", exc)
+            cached = None
+        if cached is MISSING:
+            return None
+        if cached is not None:
+            return cached
+
+        result, definitive = await self._fetch_from_sources(youtube_video_id)
+        try:
+            if result is not None:
+                await asyncio.to_thread(self.cache.put, youtube_video_id, result)
+            elif definitive:
+                await asyncio.to_thread(self.cache.put_missing, youtube_video_id)
+        except OSError as exc:
+            logger.warning("Falha ao gravar cache de transcrição: %s", exc)
         return result
 
+    async def _fetch_from_sources(self, youtube_video_id: str) -> tuple[TranscriptResult | None, bool]:
+        """Tenta as fontes em `source_order`, com hedge e circuit breaker.
+
+        Quando a fonte atual passa do seu p90 de latência, a próxima é
+        disparada em paralelo; o primeiro resultado válido vence e as demais
+        tentativas são canceladas. Fontes com o breaker aberto (falhas
+        seguidas, compartilhadas via Redis) são puladas.
+
+        Retorna (resultado, definitivo): definitivo quando todas as fontes
+        responderam sem falha — só então "sem transcrição" pode ir para o cache.
+        """
+        queue = self.source_order()
+        definitive = True
+        pending: dict[asyncio.Task, tuple[str, float]] = {}
+        hedged: set[asyncio.Task] = set()
+
+        async def launch() -> asyncio.Task | None:
+            # Fontes com breaker aberto são puladas sem custo
+            while queue:
+                name = queue.pop(0)
+                if await source_breaker(name).allow():
+                    task = asyncio.create_task(self._source_fetcher(name)(youtube_video_id))
+                    pending[task] = (name, time.monotonic())
+                    return task
+                logger.debug("Fonte de transcrição %s pulada: breaker aberto", name)
+                nonlocal definitive
+                definitive = False
+            return None
+
+        last = await launch()
+        try:
+            while pending:
+                timeout = self._hedge_timeout(last, pending, hedged) if queue else None
+                done, _ = await asyncio.wait(pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+                if not done:
+                    # A fonte atual passou do p90: dispara a próxima em paralelo
+                    hedged.add(last)
+                    logger.debug("Hedge de transcrição: %s lento, disparando %s", pending[last][0], queue[0])
+                    last = await launch()
+                    continue
+
+                for task in done:
+                    name, started = pending.pop(task)
+                    exc = task.exception()
+                    result = None if exc else task.result()
+                    source_stats(name).record(exc is None, time.monotonic() - started)
+                    if exc is not None:
+                        logger.warning("Fonte de transcrição %s falhou para %s: %s", name, youtube_video_id, exc)
+                        await source_breaker(name).record_failure()
+                        definitive = False
+                    else:
+                        await source_breaker(name).record_success()
+                    if result is not None:
+                        return result, True
+                    if queue:
+                        last = await launch()
+            return None, definitive
+        finally:
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+
+    @staticmethod
+    def _hedge_timeout(
+        last: asyncio.Task, pending: dict[asyncio.Task, tuple[str, float]], hedged: set[asyncio.Task]
+    ) -> float | None:
+        """Quanto esperar pela última fonte disparada antes do hedge (None = sem hedge)."""
+        if not settings.TRANSCRIPT_HEDGING_ENABLED or last not in pending or last in hedged:
+            return None
+        name, started = pending[last]
+        p90 = source_stats(name).percentile(0.9)
+        if p90 is None:
+            return None
+        return max(started + p90 - time.monotonic(), 0.0)
+
     async def _from_proxy(self, video_id: str) -> TranscriptResult | None:
         """Chama proxy local rodando no host Windows (IP residencial)."""
         import httpx
         try:
-            url = f"http://host.docker.internal:8001/transcript/{video_id}"
-            async with httpx.AsyncClient(timeout=15) as client:
-                resp = await client.get(url)
-                if resp.status_code != 200:
-                    return None
-                data = resp.json()
-                if "error" in data:
-                    return None
-                entries = [
-                    TranscriptEntry(text=e["text"], start=e["start"], duration=e["duration"])
-                    for e in data.get("entries", [])
-                ]
-                if not entries:
-                    return None
-                return TranscriptResult(
-                    entries=entries,
-                    source="proxy",
-                    language_code=data.get("language_code", "pt"),
-                    has_timestamps=True,
-                )
+            resp = await get_http_client().get(
+                f"{settings.TRANSCRIPT_PROXY_URL}/transcript/{video_id}",
+                timeout=settings.TRANSCRIPT_PROXY_TIMEOUT_SECONDS,
+            )
+            if resp.status_code >= 500:
+                raise SourceUnavailable(f"proxy respondeu {resp.status_code}")
+            if resp.status_code != 200:
+                return None
+            return self._parse_proxy_result(resp.json())
+        except httpx.TransportError as exc:
+            raise SourceUnavailable(f"proxy indisponível: {exc!r}") from exc
+        except SourceUnavailable:
+            raise
         except Exception as exc:
-            logger.debug("Proxy de transcrição indisponível: %s", exc)
+            logger.debug("Resposta inválida do proxy de transcrição: %s", exc)
+            return None
+
+    @staticmethod
+    def _parse_proxy_result(data: dict) -> TranscriptResult | None:
+        if "error" in data:
             return None
+        entries = entries_from_json(data.get("entries", []))
+        if not entries:
+            return None
+        return TranscriptResult(
+            entries=entries,
+            source="proxy",
+            language_code=data.get("language_code", "pt"),
+            has_timestamps=True,
+        )
+
+    async def prefetch_from_proxy(self, youtube_video_ids: list[str]) -> int:
+        """Baixa do proxy, em lote, as transcrições que ainda não estão no cache.
+
+        Usa `/transcripts?ids=...` (NDJSON em streaming, gzip): um backlog
+        inteiro vem em poucas requisições em vez de uma por vídeo. Cada
+        transcrição recebida vai direto para o cache local, de onde o
+        `fetch` seguinte a lê. Só sucessos são gravados — "sem transcrição"
+        do proxy ainda passa pelas outras fontes no `fetch`. Retorna quantas
+        transcrições foram gravadas.
+        """
+        if self.cache is None or not youtube_video_ids:
+            return 0
+
+        # `MISSING` (sem transcrição, dentro do TTL) também conta como cacheado
+        def uncached(ids: list[str]) -> list[str]:
+            return [i for i in ids if self.cache.get(i, self.PREFERRED_LANGS) is None]
+
+        try:
+            pending = await asyncio.to_thread(uncached, list(dict.fromkeys(youtube_video_ids)))
+        except OSError as exc:
+            logger.warning("Cache de transcrição indisponível, prefetch ignorado: %s", exc)
+            return 0
+
+        stored = 0
+        breaker = source_breaker("proxy")
+        batch_size = settings.TRANSCRIPT_PROXY_BATCH_SIZE
+        for i in range(0, len(pending), batch_size):
+            if not await breaker.allow():
+                logger.info("Prefetch do proxy interrompido: breaker aberto")
+                break
+            try:
+                stored += await self._prefetch_batch(pending[i:i + batch_size])
+            except SourceUnavailable as exc:
+                logger.warning("Prefetch do proxy falhou: %s", exc)
+                await breaker.record_failure()
+                break
+            await breaker.record_success()
+        return stored
+
+    async def _prefetch_batch(self, ids: list[str]) -> int:
+        import httpx
+        stored = 0
+        timeout = httpx.Timeout(
+            settings.TRANSCRIPT_PROXY_TIMEOUT_SECONDS,
+            read=settings.TRANSCRIPT_PROXY_BATCH_READ_TIMEOUT_SECONDS,
+        )
+        try:
+            async with get_http_client().stream(
+                "GET",
+                f"{settings.TRANSCRIPT_PROXY_URL}/transcripts",
+                params={"ids": ",".join(ids)},
+                headers={"Accept-Encoding": "gzip"},
+                timeout=timeout,
+            ) as resp:
+                if resp.status_code >= 500:
+                    raise SourceUnavailable(f"proxy respondeu {resp.status_code}")
+                if resp.status_code != 200:
+                    logger.warning("Proxy recusou o lote (%s)", resp.status_code)
+                    return 0
+                async for line in resp.aiter_lines():
+                    if not line:
+                        continue
+                    try:
+                        data = json.loads(line)
+                        result = self._parse_proxy_result(data)
+                    except (ValueError, KeyError, TypeError) as exc:
+                        logger.debug("Linha inválida do proxy de transcrição: %s", exc)
+                        continue
+                    if result is None:
+                        continue
+                    try:
+                        await asyncio.to_thread(self.cache.put, data["video_id"], result)
+                    except OSError as exc:
+                        logger.warning("Falha ao gravar cache de transcrição: %s", exc)
+                        continue
+                    stored += 1
+        except httpx.TransportError as exc:
+            raise SourceUnavailable(f"proxy indisponível: {exc!r}") from exc
+        return stored
 
     async def _from_ytdlp(self, video_id: str) -> TranscriptResult | None:
-        """Baixa legendas automáticas com yt-dlp."""
+        """Baixa legendas automáticas com yt-dlp.
+
+        O yt-dlp roda como subprocesso asyncio, limitado a
+        `YTDLP_MAX_CONCURRENCY` simultâneos e morto ao estourar o timeout ou
+        quando a coroutine é cancelada.
+        """
         try:
             url = f"https://www.youtube.com/watch?v={video_id}"
             with tempfile.TemporaryDirectory() as tmpdir:
@@ -106,13 +577,16 @@ class TranscriptService:
                     if self._cookies_available():
                         cmd += ["--cookies", COOKIES_PATH]
                     cmd.append(url)
-                    subprocess.run(cmd, capture_output=True, timeout=60)
+                    returncode, stderr = await _run_subprocess(cmd, timeout=settings.YTDLP_TIMEOUT_SECONDS)
+                    if returncode and any(m in stderr for m in _YTDLP_BLOCKED_MARKERS):
+                        raise SourceUnavailable(f"yt-dlp bloqueado: {stderr.strip()[-200:]}")
 
                     # Procura o arquivo gerado
                     for fname in os.listdir(tmpdir):
                         if fname.endswith(".json3"):
                             fpath = os.path.join(tmpdir, fname)
-                            entries = self._parse_json3(fpath)
+                            # Arquivo de live longa: centenas de ms de parse, fora do loop
+                            entries = await asyncio.to_thread(self._parse_json3, fpath)
                             if entries:
                                 return TranscriptResult(
                                     entries=entries,
@@ -122,40 +596,32 @@ class TranscriptService:
                                 )
         except FileNotFoundError:
             logger.warning("yt-dlp não encontrado no PATH")
-        except subprocess.TimeoutExpired:
-            logger.warning("yt-dlp timeout para video_id=%s", video_id)
+        except asyncio.TimeoutError as exc:
+            raise SourceUnavailable(f"yt-dlp timeout para video_id={video_id}") from exc
+        except SourceUnavailable:
+            raise
         except Exception as exc:
             logger.warning("yt-dlp falhou para video_id=%s: %s", video_id, exc)
         return None
 
-    def _parse_json3(self, path: str) -> list[TranscriptEntry]:
-        """Parseia arquivo .json3 de legenda do yt-dlp."""
+    def _parse_json3(self, path: str) -> TranscriptEntries:
+        """Parseia arquivo .json3 de legenda do yt-dlp (em streaming)."""
+        from app.services.json3_parser import parse_json3
         try:
-            with open(path, encoding="utf-8") as f:
-                data = json.load(f)
-            entries = []
-            for event in data.get("events", []):
-                segs = event.get("segs")
-                if not segs:
-                    continue
-                text = "".join(s.get("utf8", "") for s in segs).strip()
-                if not text or text == "\n":
-                    continue
-                start_ms = event.get("tStartMs", 0)
-                dur_ms = event.get("dDurationMs", 0)
-                entries.append(TranscriptEntry(
-                    text=text,
-                    start=start_ms / 1000,
-                    duration=dur_ms / 1000,
-                ))
-            return entries
+            return parse_json3(path)
         except Exception as exc:
             logger.warning("Falha ao parsear json3: %s", exc)
-            return []
+            return TranscriptEntriesBuilder().build()
 
     async def _from_youtube(self, video_id: str) -> TranscriptResult | None:
+        # A biblioteca faz I/O síncrono: roda numa thread para não travar o loop
+        return await asyncio.to_thread(self._from_youtube_sync, video_id)
+
+    def _from_youtube_sync(self, video_id: str) -> TranscriptResult | None:
         try:
-            from youtube_transcript_api import YouTubeTranscriptApi, NoTranscriptFound, TranscriptsDisabled
+            from youtube_transcript_api import (
+                YouTubeTranscriptApi, NoTranscriptFound, TranscriptsDisabled, VideoUnavailable,
+            )
 
             kwargs = {}
             if self._cookies_available():
@@ -163,7 +629,7 @@ class TranscriptService:
 
             try:
                 transcript_list = YouTubeTranscriptApi.list_transcripts(video_id, **kwargs)
-            except (NoTranscriptFound, TranscriptsDisabled):
+            except (NoTranscriptFound, TranscriptsDisabled, VideoUnavailable):
                 return None
 
             transcript = None
@@ -191,12 +657,8 @@ class TranscriptService:
                     return None
 
             data = transcript.fetch()
-            entries = [
-                TranscriptEntry(text=e["text"], start=e["start"], duration=e["duration"])
-                for e in data
-            ]
             return TranscriptResult(
-                entries=entries,
+                entries=entries_from_json(data),
                 source="youtube_api",
                 language_code=transcript.language_code,
                 has_timestamps=True,
@@ -206,5 +668,5 @@ class TranscriptService:
             logger.warning("youtube-transcript-api não instalado")
             return None
         except Exception as exc:
-            logger.warning("Falha ao buscar transcript via YouTube API: %s", exc)
-            return None
+            # Bloqueio de IP, 429, erro de rede: falha da fonte
+            raise SourceUnavailable(f"youtube-transcript-api: {exc}") from exc
@@ -1,15 +1,24 @@
 """Serviço de ingestão de vídeos.
 
 Recebe metadados vindos do YouTube, persiste na tabela `videos`,
-atualiza o canal e enfileira o processamento.
+atualiza o canal e enfileira o processamento. O enfileiramento passa pelo
+outbox (`task_outbox`), gravado na mesma transação dos vídeos: o worker
+só recebe a task depois do commit, e um rollback a descarta. Vídeos novos são
+enriquecidos em lote (videos.list) com duração, estado ao vivo e
+disponibilidade de legendas antes de entrarem no pipeline.
 """
+import logging
 from datetime import datetime, timezone
 from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.config import settings
 from app.models.video import Video
 from app.repositories.video_repository import VideoRepository
 from app.repositories.channel_repository import ChannelRepository
 from app.services.audit_service import AuditService
-from app.services.youtube_service import YoutubeVideoInfo
+from app.services.outbox_service import OutboxService
+from app.services.youtube_service import YouTubeService, YoutubeVideoInfo
+
+logger = logging.getLogger(__name__)
 
 
 class VideoIngestService:
@@ -18,42 +27,91 @@ class VideoIngestService:
         self.video_repo = VideoRepository(db)
         self.channel_repo = ChannelRepository(db)
         self.audit = AuditService(db)
+        self.outbox = OutboxService(db)
 
     async def ingest(self, channel_id: int, info: YoutubeVideoInfo) -> Video | None:
         """Persiste um vídeo novo. Retorna None se já existir (deduplicação)."""
-        existing = await self.video_repo.get_by_youtube_id(info.youtube_video_id)
-        if existing:
-            return None
-
-        now = datetime.now(timezone.utc)
-        video = await self.video_repo.create(
-            channel_id=channel_id,
-            youtube_video_id=info.youtube_video_id,
-            youtube_url=info.youtube_url,
-            title=info.title,
-            description=info.description,
-            thumbnail_url=info.thumbnail_url,
-            published_at=info.published_at,
-            fetched_at=now,
-            duration_seconds=info.duration_seconds,
-            status="queued",
-        )
-        await self.audit.log("video", video.id, "created", payload={"youtube_video_id": info.youtube_video_id})
-        return video
+        videos = await self.ingest_batch(channel_id, [info])
+        return videos[0] if videos else None
 
     async def ingest_batch(
-        self, channel_id: int, videos: list[YoutubeVideoInfo]
+        self, channel_id: int, videos: list[YoutubeVideoInfo], as_batch: bool = False
     ) -> list[Video]:
-        """Ingere uma lista de vídeos, ignorando duplicatas."""
-        ingested: list[Video] = []
+        """Ingere uma lista de vídeos, ignorando duplicatas, e enfileira os novos (outbox).
+
+        Um único INSERT ... ON CONFLICT (youtube_video_id) DO NOTHING RETURNING
+        para o lote e um INSERT multi-linha para a auditoria. A deduplicação
+        fica a cargo do banco, então duas verificações concorrentes do mesmo
+        canal nunca ingerem (nem enfileiram) o mesmo vídeo duas vezes.
+
+        Com `as_batch`, os vídeos novos vão juntos para um `process_video_batch`
+        (pipeline em estágios) em vez de um `process_video` por vídeo. Sem ele,
+        um `prefetch_transcripts` do lote é gravado antes dos `process_video`
+        (id menor, o relay o publica primeiro): as transcrições vêm do proxy
+        em poucas requisições e o fetch de cada vídeo as encontra no cache.
+        """
+        now = datetime.now(timezone.utc)
+        rows = {}
         for info in videos:
-            video = await self.ingest(channel_id, info)
-            if video:
-                ingested.append(video)
+            rows.setdefault(info.youtube_video_id, {
+                "channel_id": channel_id,
+                "youtube_video_id": info.youtube_video_id,
+                "youtube_url": info.youtube_url,
+                "title": info.title,
+                "description": info.description,
+                "thumbnail_url": info.thumbnail_url,
+                "published_at": info.published_at,
+                "fetched_at": now,
+                "duration_seconds": info.duration_seconds,
+                "status": "queued",
+            })
+        ingested = await self.video_repo.create_many_ignore_existing(list(rows.values()))
+        await self.audit.log_many(
+            "video", "created",
+            [(video.id, {"youtube_video_id": video.youtube_video_id}) for video in ingested],
+        )
+        if as_batch:
+            if ingested:
+                await self.outbox.add("process_video_batch", [[video.id for video in ingested]])
+        else:
+            if ingested and settings.TRANSCRIPT_PREFETCH_ON_INGEST and settings.TRANSCRIPT_CACHE_ENABLED:
+                await self.outbox.add(
+                    "prefetch_transcripts", [[video.youtube_video_id for video in ingested]]
+                )
+            await self.outbox.add_many(
+                "process_video",
+                [([video.id], None, f"process_video:{video.id}") for video in ingested],
+            )
         return ingested
 
+    async def enrich(self, videos: list[Video], youtube: YouTubeService | None = None) -> int:
+        """Preenche duração, estado ao vivo e legendas dos vídeos (lotes de 50).
+
+        Falhas da API não impedem a ingestão: os campos ficam nulos e o
+        vídeo segue para o pipeline. Retorna quantos vídeos foram enriquecidos.
+        """
+        if not videos:
+            return 0
+        youtube = youtube or YouTubeService()
+        try:
+            details = await youtube.get_video_details([v.youtube_video_id for v in videos])
+        except Exception as exc:
+            logger.warning("Falha ao enriquecer %d vídeos via videos.list: %s", len(videos), exc)
+            return 0
+
+        enriched = 0
+        for video in videos:
+            detail = details.get(video.youtube_video_id)
+            if detail is None:
+                continue
+            video.duration_seconds = detail.duration_seconds
+            video.live_broadcast_content = detail.live_broadcast_content
+            video.has_captions = detail.has_captions
+            enriched += 1
+        await self.db.flush()
+        return enriched
+
     async def enqueue_processing(self, video: Video) -> None:
-        """Enfileira o vídeo para processamento via Celery (Fase 3)."""
-        from app.workers.tasks import process_video_task
-        process_video_task.delay(video.id)
+        """Enfileira o vídeo para processamento via outbox (publicado após o commit)."""
+        await self.outbox.add("process_video", [video.id], dedup_key=f"process_video:{video.id}")
         await self.video_repo.update_status(video, "queued")
@@ -9,11 +9,17 @@ Orquestra os passos:
 6. Criar VideoAnalysis
 7. Extrair ideias via LLM (ExtractionOrchestratorService)
 8. Atualizar status do vídeo para `analyzed` ou `failed`
+
+Os passos são agrupados em estágios (`fetch_stage`, `compute_stage`,
+`persist_stage`, `extract_stage`) que compartilham um `PipelineContext`.
+`process` executa os estágios em sequência; o `StagedVideoPipeline`
+executa os mesmos estágios com filas entre eles para vários vídeos.
 """
 from __future__ import annotations
 
 import logging
 import uuid
+from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -23,7 +29,7 @@ from app.repositories.transcript_repository import TranscriptRepository
 from app.repositories.analysis_repository import AnalysisRepository
 from app.repositories.channel_repository import ChannelRepository
 from app.services.transcript_service import TranscriptService, TranscriptResult
-from app.services.normalization_service import NormalizationService
+from app.services.normalization_service import NormalizationService, NORMALIZATION_VERSION
 from app.services.segmentation_service import SegmentationService, Segment
 from app.services.audit_service import AuditService
 from app.services.extraction_orchestrator_service import ExtractionOrchestratorService
@@ -32,6 +38,23 @@ from app.models.audit import ProcessingJob
 logger = logging.getLogger(__name__)
 
 
+@dataclass
+class PipelineContext:
+    """Estado de um vídeo entre os estágios do pipeline."""
+    video: Video
+    job: ProcessingJob
+    now: datetime
+    # Texto bruto de um transcript manual já salvo (reprocessamento)
+    manual_raw: str | None = None
+    # Texto normalizado desse transcript, quando já está na versão atual das regras
+    manual_normalized: str | None = None
+    transcript: TranscriptResult | None = None
+    normalized: str = ""
+    segments: list[Segment] = field(default_factory=list)
+    # True quando o pipeline já foi finalizado (ex.: sem transcrição)
+    finished: bool = False
+
+
 class VideoPipelineService:
     def __init__(self, db: AsyncSession):
         self.db = db
@@ -46,72 +69,115 @@ class VideoPipelineService:
 
     async def process(self, video_id: int) -> None:
         """Executa o pipeline completo para um vídeo."""
+        ctx = await self.start(video_id)
+        if ctx is None:
+            return
+
+        try:
+            await self._run_pipeline(ctx)
+        except Exception as exc:
+            logger.exception("Falha no pipeline do vídeo %s", video_id)
+            await self.fail(ctx, exc)
+
+        await self.db.commit()
+
+    async def start(self, video_id: int) -> PipelineContext | None:
+        """Marca o vídeo como `processing` e abre o ProcessingJob."""
         video = await self.video_repo.get_by_id(video_id)
         if not video:
             logger.error("Vídeo %s não encontrado", video_id)
-            return
+            return None
 
         job = await self._create_job(video_id)
         await self.video_repo.update_status(video, "processing")
         await self.audit.log("video", video_id, "processed", payload={"step": "started"})
+        return PipelineContext(video=video, job=job, now=datetime.now(timezone.utc))
 
-        try:
-            await self._run_pipeline(video, job)
-        except Exception as exc:
-            logger.exception("Falha no pipeline do vídeo %s", video_id)
-            await self._handle_failure(video, job, exc)
+    async def fail(self, ctx: PipelineContext, exc: Exception) -> None:
+        await self._handle_failure(ctx.video, ctx.job, exc)
 
-        await self.db.commit()
+    # ── Estágios ──────────────────────────────────────────────────────────
 
-    # ── Passos internos ───────────────────────────────────────────────────
-
-    async def _run_pipeline(self, video: Video, job: ProcessingJob) -> None:
-        now = datetime.now(timezone.utc)
+    async def _run_pipeline(self, ctx: PipelineContext) -> None:
+        await self.fetch_stage(ctx)
+        if ctx.finished:
+            return
+        self.compute_stage(ctx)
+        await self.persist_stage(ctx)
+        await self.extract_stage(ctx)
 
-        # Passo 1 — Transcrição
+    async def fetch_stage(self, ctx: PipelineContext) -> None:
+        """Passo 1 — Transcrição (I/O de rede)."""
         # Para vídeos manuais, reutiliza o transcript já existente no DB
-        existing_transcript = await self.transcript_repo.get_by_video_id(video.id)
+        existing_transcript = await self.transcript_repo.get_by_video_id(ctx.video.id)
         if existing_transcript and existing_transcript.transcript_source == "manual":
-            # Sempre re-normaliza do raw para aplicar padroes mais recentes
-            raw = existing_transcript.raw_transcript_text or existing_transcript.normalized_transcript_text or ""
-            normalized = self.norm_svc.normalize(raw)
-        else:
-            transcript_result = await self.transcript_svc.fetch(video.youtube_video_id)
-            if not transcript_result:
-                await self._finalize_no_transcript(video, job, now)
-                return
-
-            # Passo 2 — Normalização
-            normalized = self.norm_svc.normalize(transcript_result.full_text)
-
-            # Passo 3 — Persistir transcript
-            transcript_result_obj = await self.transcript_repo.create(
-                video_id=video.id,
-                transcript_source=transcript_result.source,
-                language_code=transcript_result.language_code,
-                raw_transcript_text=transcript_result.full_text,
-                normalized_transcript_text=normalized,
-                has_timestamps=transcript_result.has_timestamps,
+            ctx.manual_raw = (
+                existing_transcript.raw_transcript_text
+                or existing_transcript.normalized_transcript_text
+                or ""
             )
+            if existing_transcript.normalization_version == NORMALIZATION_VERSION:
+                ctx.manual_normalized = existing_transcript.normalized_transcript_text
+            return
+
+        ctx.transcript = await self.transcript_svc.fetch(ctx.video.youtube_video_id)
+        if not ctx.transcript:
+            await self._finalize_no_transcript(ctx.video, ctx.job, ctx.now)
+            ctx.finished = True
 
-            # Passo 4 — Segmentação
-            if transcript_result.has_timestamps and transcript_result.entries:
-                segments = self.seg_svc.segment_by_entries(transcript_result.entries, normalized)
+    def compute_stage(self, ctx: PipelineContext) -> None:
+        """Passos 2 e 4 — Normalização e segmentação (CPU, sem acesso ao DB)."""
+        if ctx.manual_raw is not None:
+            if ctx.manual_normalized is not None:
+                ctx.normalized = ctx.manual_normalized
             else:
-                segments = self.seg_svc.segment_text(normalized)
-
-            # Passo 5 — Persistir segmentos
-            segments_data = [
-                {
-                    "raw_text": s.raw_text,
-                    "normalized_text": s.normalized_text,
-                    "segment_type": s.segment_type,
-                    "start_seconds": s.start_seconds,
-                    "end_seconds": s.end_seconds,
-                }
-                for s in segments
-            ]
-            await self.transcript_repo.create_segments_bulk(video.id, transcript_result_obj.id, segments_data)
+                # Normalizado com regras antigas (ou nunca): re-normaliza do raw
+                ctx.normalized = self.norm_svc.normalize(ctx.manual_raw)
+            return
+
+        transcript_result = ctx.transcript
+        ctx.normalized = self.norm_svc.normalize(transcript_result.full_text)
+        if transcript_result.has_timestamps and transcript_result.entries:
+            ctx.segments = self.seg_svc.segment_by_entries(transcript_result.entries, ctx.normalized)
+        else:
+            ctx.segments = self.seg_svc.segment_text(ctx.normalized)
+
+    async def persist_stage(self, ctx: PipelineContext) -> None:
+        """Passos 3 e 5 — Persistir transcript e segmentos."""
+        if ctx.manual_raw is not None:
+            if ctx.manual_normalized is None:
+                # Guarda o texto re-normalizado: as próximas execuções o reaproveitam
+                transcript_obj = await self.transcript_repo.get_by_video_id(ctx.video.id)
+                transcript_obj.normalized_transcript_text = ctx.normalized
+                transcript_obj.normalization_version = NORMALIZATION_VERSION
+            return
+
+        transcript_result = ctx.transcript
+        transcript_obj = await self.transcript_repo.create(
+            video_id=ctx.video.id,
+            transcript_source=transcript_result.source,
+            language_code=transcript_result.language_code,
+            raw_transcript_text=transcript_result.full_text,
+            normalized_transcript_text=ctx.normalized,
+            normalization_version=NORMALIZATION_VERSION,
+            has_timestamps=transcript_result.has_timestamps,
+            entries_json=transcript_result.entries_to_json(),
+        )
+        segments_data = [
+            {
+                "raw_text": s.raw_text,
+                "normalized_text": s.normalized_text,
+                "segment_type": s.segment_type,
+                "start_seconds": s.start_seconds,
+                "end_seconds": s.end_seconds,
+            }
+            for s in ctx.segments
+        ]
+        await self.transcript_repo.create_segments_bulk(ctx.video.id, transcript_obj.id, segments_data)
+
+    async def extract_stage(self, ctx: PipelineContext) -> None:
+        """Passos 6 a 9 — Análise, extração via LLM e finalização."""
+        video, now = ctx.video, ctx.now
 
         # Passo 6 — Criar VideoAnalysis
         slug = f"analise-{video.youtube_video_id}-{uuid.uuid4().hex[:8]}"
@@ -129,7 +195,7 @@ class VideoPipelineService:
         extractor = ExtractionOrchestratorService(self.db)
         await extractor.run(
             analysis=analysis,
-            normalized_text=normalized,
+            normalized_text=ctx.normalized,
             video_title=video.title,
             tipster_id=tipster_id,
         )
@@ -140,7 +206,7 @@ class VideoPipelineService:
 
         # Passo 9 — Finalizar
         await self.video_repo.update_status(video, "analyzed")
-        await self._finish_job(job, "completed")
+        await self._finish_job(ctx.job, "completed")
         await self.audit.log(
             "video", video.id, "processed",
             payload={
@@ -149,8 +215,11 @@ class VideoPipelineService:
                 "analysis_status": analysis.analysis_status,
             },
         )
+        ctx.finished = True
         logger.info("Video %s processado: analysis_id=%s", video.id, analysis.id)
 
+    # ── Passos internos ───────────────────────────────────────────────────
+
     async def _finalize_no_transcript(self, video: Video, job: ProcessingJob, now: datetime) -> None:
         """Cria análise marcada como falha de transcrição."""
         slug = f"analise-{video.youtube_video_id}-{uuid.uuid4().hex[:8]}"
@@ -0,0 +1,293 @@
+"""Workflow do pipeline de vídeo em etapas encadeadas (Celery chain).
+
+Cada etapa é uma task separada, roda em uma transação própria e persiste
+seu resultado antes de seguir:
+
+1. fetch     — baixa a transcrição e salva o texto bruto + entradas
+2. prepare   — normaliza, segmenta e salva os segmentos
+3. extract   — chama o LLM e salva a saída bruta em `raw_output_json`
+4. persist   — persiste ideias e finaliza a análise e o vídeo
+5. evaluate  — avalia ideias de jogos que já têm resultado
+
+O estado do workflow fica no `ProcessingJob.payload_json`
+(`completed_stages`, `analysis_id`). Um retry reexecuta só a etapa que
+falhou; etapas já concluídas viram no-op. Quando o job não está mais
+`running` (ex.: vídeo sem transcrição), as etapas seguintes são ignoradas.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import select
+
+from app.core.config import settings
+from app.models.audit import ProcessingJob
+from app.models.idea import GameIdea
+from app.models.transcript import VideoTranscript
+from app.repositories.result_repository import ResultRepository
+from app.services.evaluation_service import EvaluationService
+from app.services.extraction_orchestrator_service import ExtractionOrchestratorService
+from app.services.normalization_service import NORMALIZATION_VERSION
+from app.services.transcript_service import TranscriptResult, entries_from_json
+from app.services.video_pipeline_service import PipelineContext, VideoPipelineService
+
+logger = logging.getLogger(__name__)
+
+
+class ExtractionUnavailable(Exception):
+    """O LLM não retornou extração; a etapa deve ser tentada de novo."""
+
+
+class VideoWorkflowService(VideoPipelineService):
+    async def begin(self, video_id: int) -> int | None:
+        """Abre o ProcessingJob do workflow. Retorna o id do job.
+
+        Idempotente: retorna None se o vídeo não existe, já foi analisado
+        ou já tem um workflow em andamento. A verificação roda com a linha do
+        vídeo travada, então não depende do lock do Redis — uma task
+        republicada pelo outbox depois do fim do workflow (ou com o lock
+        expirado) não reexecuta a cadeia nem cria outra análise.
+        """
+        video = await self.video_repo.get_by_id_for_update(video_id)
+        if video is None or video.status == "analyzed" or await self._has_running_job(video_id):
+            await self.db.rollback()
+            return None
+        ctx = await self.start(video_id)
+        if ctx is None:
+            return None
+        ctx.job.payload_json = {"completed_stages": []}
+        await self.db.commit()
+        return ctx.job.id
+
+    async def fetch(self, job_id: int) -> None:
+        ctx = await self._load(job_id, "fetch")
+        if ctx is None:
+            return
+
+        transcript = await self.transcript_repo.get_by_video_id(ctx.video.id)
+        if transcript is None:
+            await self.fetch_stage(ctx)
+            if ctx.finished:
+                await self.db.commit()
+                return
+            result = ctx.transcript
+            await self.transcript_repo.create(
+                video_id=ctx.video.id,
+                transcript_source=result.source,
+                language_code=result.language_code,
+                raw_transcript_text=result.full_text,
+                has_timestamps=result.has_timestamps,
+                entries_json=result.entries_to_json(),
+            )
+        # Transcript já persistido (manual ou de execução anterior) é reaproveitado
+        await self._complete(ctx, "fetch")
+
+    async def prepare(self, job_id: int) -> None:
+        # Normalização e segmentação são CPU puro: rodam fora do loop, que no
+        # pipeline em estágios é compartilhado por vários vídeos
+        ctx = await self._load(job_id, "prepare")
+        if ctx is None:
+            return
+
+        transcript = await self.transcript_repo.get_by_video_id(ctx.video.id)
+        if transcript.transcript_source == "manual":
+            ctx.manual_raw = transcript.raw_transcript_text or transcript.normalized_transcript_text or ""
+            if transcript.normalization_version == NORMALIZATION_VERSION:
+                ctx.manual_normalized = transcript.normalized_transcript_text
+            await asyncio.to_thread(self.compute_stage, ctx)
+        else:
+            segments = await self.transcript_repo.get_segments_by_video(ctx.video.id)
+            if transcript.normalized_transcript_text is None or not segments:
+                if transcript.entries_json:
+                    ctx.transcript = self._transcript_result(transcript)
+                    await asyncio.to_thread(self.compute_stage, ctx)
+                else:
+                    # Transcript antigo, salvo sem as entradas: segmenta só pelo texto
+                    ctx.normalized = await asyncio.to_thread(
+                        self.norm_svc.normalize, transcript.raw_transcript_text or ""
+                    )
+                    ctx.segments = self.seg_svc.segment_text(ctx.normalized)
+                await self.transcript_repo.create_segments_bulk(
+                    ctx.video.id,
+                    transcript.id,
+                    [
+                        {
+                            "raw_text": s.raw_text,
+                            "normalized_text": s.normalized_text,
+                            "segment_type": s.segment_type,
+                            "start_seconds": s.start_seconds,
+                            "end_seconds": s.end_seconds,
+                        }
+                        for s in ctx.segments
+                    ],
+                )
+            elif transcript.normalization_version != NORMALIZATION_VERSION:
+                # Segmentos já existem; só o texto foi normalizado com regras antigas
+                ctx.normalized = await asyncio.to_thread(
+                    self.norm_svc.normalize, transcript.raw_transcript_text or ""
+                )
+            else:
+                ctx.normalized = transcript.normalized_transcript_text
+
+        transcript.normalized_transcript_text = ctx.normalized
+        transcript.normalization_version = NORMALIZATION_VERSION
+        await self._complete(ctx, "prepare")
+
+    async def extract(self, job_id: int) -> None:
+        ctx = await self._load(job_id, "extract")
+        if ctx is None:
+            return
+
+        video = ctx.video
+        payload = ctx.job.payload_json or {}
+        analysis = None
+        if payload.get("analysis_id"):
+            analysis = await self.analysis_repo.get_by_id(payload["analysis_id"])
+        if analysis is None:
+            slug = f"analise-{video.youtube_video_id}-{uuid.uuid4().hex[:8]}"
+            analysis = await self.analysis_repo.create(
+                video_id=video.id,
+                analysis_url_slug=slug,
+                analyzed_at=ctx.now,
+                analysis_status="pending",
+                schema_version="v1",
+            )
+            ctx.job.payload_json = {**payload, "analysis_id": analysis.id}
+            # A análise pendente sobrevive a uma falha do LLM e é reaproveitada no retry
+            await self.db.commit()
+
+        transcript = await self.transcript_repo.get_by_video_id(video.id)
+        extractor = ExtractionOrchestratorService(self.db)
+        extraction = await extractor.extract(
+            analysis,
+            transcript.normalized_transcript_text or "",
+            video.title,
+        )
+        if extraction is None:
+            raise ExtractionUnavailable(f"LLM sem resposta para o vídeo {video.id}")
+
+        analysis.raw_output_json = extraction
+        analysis.analysis_status = "extracted"
+        await self._complete(ctx, "extract")
+
+    async def persist(self, job_id: int) -> None:
+        ctx = await self._load(job_id, "persist")
+        if ctx is None:
+            return
+
+        video = ctx.video
+        analysis = await self.analysis_repo.get_by_id(ctx.job.payload_json["analysis_id"])
+        channel = await self.channel_repo.get_by_id(video.channel_id)
+        tipster_id = channel.tipster_id if channel else 0
+
+        extractor = ExtractionOrchestratorService(self.db)
+        await extractor.apply(analysis, analysis.raw_output_json, tipster_id)
+
+        if channel:
+            await self.channel_repo.update(channel, {"last_video_analyzed_at": ctx.now})
+        await self.video_repo.update_status(video, "analyzed")
+        await self.audit.log(
+            "video", video.id, "processed",
+            payload={
+                "step": "completed",
+                "analysis_id": analysis.id,
+                "analysis_status": analysis.analysis_status,
+            },
+        )
+        await self._complete(ctx, "persist")
+
+    async def evaluate(self, job_id: int) -> int:
+        """Avalia ideias cujos jogos já têm resultado. Retorna avaliações criadas."""
+        ctx = await self._load(job_id, "evaluate")
+        if ctx is None:
+            return 0
+
+        analysis_id = ctx.job.payload_json["analysis_id"]
+        result = await self.db.execute(
+            select(GameIdea.game_id).where(GameIdea.video_analysis_id == analysis_id).distinct()
+        )
+        game_ids = [row[0] for row in result.all()]
+
+        result_repo = ResultRepository(self.db)
+        evaluation = EvaluationService(self.db)
+        count = 0
+        for game_id in game_ids:
+            game_result = await result_repo.get_by_game(game_id)
+            if game_result:
+                count += await evaluation.evaluate_game(game_id, game_result)
+
+        await self._finish_job(ctx.job, "completed")
+        await self._complete(ctx, "evaluate")
+        logger.info("Workflow do vídeo %s concluído: %d ideias avaliadas", ctx.video.id, count)
+        return count
+
+    async def fail_job(self, job_id: int, exc: Exception) -> None:
+        """Finaliza o workflow como falho após esgotar os retries de uma etapa."""
+        job = await self._get_job(job_id)
+        if job is None or job.status != "running":
+            return
+        video = await self.video_repo.get_by_id(job.entity_id)
+        analysis_id = (job.payload_json or {}).get("analysis_id")
+        if analysis_id:
+            analysis = await self.analysis_repo.get_by_id(analysis_id)
+            if analysis and analysis.analysis_status in ("pending", "processing"):
+                await ExtractionOrchestratorService(self.db).mark_failed(analysis)
+        await self._handle_failure(video, job, exc)
+        await self.db.commit()
+
+    async def is_running(self, job_id: int) -> bool:
+        job = await self._get_job(job_id)
+        return job is not None and job.status == "running"
+
+    # ── Internos ──────────────────────────────────────────────────────────
+
+    async def _get_job(self, job_id: int) -> ProcessingJob | None:
+        result = await self.db.execute(select(ProcessingJob).where(ProcessingJob.id == job_id))
+        return result.scalar_one_or_none()
+
+    async def _has_running_job(self, video_id: int) -> bool:
+        cutoff = datetime.now(timezone.utc) - timedelta(seconds=settings.VIDEO_JOB_STALE_SECONDS)
+        result = await self.db.execute(
+            select(ProcessingJob.id)
+            .where(
+                ProcessingJob.job_type == "process_video",
+                ProcessingJob.entity_type == "video",
+                ProcessingJob.entity_id == video_id,
+                ProcessingJob.status == "running",
+                ProcessingJob.started_at > cutoff,
+            )
+            .limit(1)
+        )
+        return result.first() is not None
+
+    async def _load(self, job_id: int, stage: str) -> PipelineContext | None:
+        """Reconstrói o contexto da etapa; None se ela não deve rodar."""
+        job = await self._get_job(job_id)
+        if job is None or job.status != "running":
+            return None
+        if stage in (job.payload_json or {}).get("completed_stages", []):
+            logger.info("Etapa %s do job %s já concluída — ignorando", stage, job_id)
+            return None
+        video = await self.video_repo.get_by_id(job.entity_id)
+        if video is None:
+            return None
+        return PipelineContext(video=video, job=job, now=datetime.now(timezone.utc))
+
+    async def _complete(self, ctx: PipelineContext, stage: str) -> None:
+        payload = dict(ctx.job.payload_json or {})
+        payload["completed_stages"] = [*payload.get("completed_stages", []), stage]
+        # Reatribui o dict para o SQLAlchemy detectar a mudança no JSON
+        ctx.job.payload_json = payload
+        await self.db.commit()
+
+    @staticmethod
+    def _transcript_result(transcript: VideoTranscript) -> TranscriptResult:
+        return TranscriptResult(
+            entries=entries_from_json(transcript.entries_json),
+            source=transcript.transcript_source or "",
+            language_code=transcript.language_code or "",
+            has_timestamps=transcript.has_timestamps,
+        )
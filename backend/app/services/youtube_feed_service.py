@@ -0,0 +1,88 @@
+"""Descoberta de vídeos pelo feed Atom público do canal.
+
+`https://www.youtube.com/feeds/videos.xml?channel_id=UC...` lista os 15
+uploads mais recentes do canal e não consome quota da Data API. O feed é
+lido em streaming (`XMLPullParser` alimentado pelos chunks da resposta) e
+a leitura para no primeiro vídeo publicado em ou antes de `since` — as
+entradas vêm da mais recente para a mais antiga.
+
+O feed não traz duração nem estado ao vivo: os ids novos são enriquecidos
+depois em lote pela API (`VideoIngestService.enrich`).
+
+Para testes locais, `YOUTUBE_FEED_URL` pode apontar para um servidor de
+arquivos estáticos servindo um feed salvo, ex.:
+    python -m http.server 8090 --directory benchmarks/fixtures
+    YOUTUBE_FEED_URL=http://127.0.0.1:8090/videos.xml
+"""
+from __future__ import annotations
+
+from datetime import datetime, timezone
+from xml.etree.ElementTree import XMLPullParser
+
+from app.core.config import settings
+from app.core.http import get_http_client
+from app.services.youtube_service import YoutubeVideoInfo
+
+_ATOM = "{http://www.w3.org/2005/Atom}"
+_YT = "{http://www.youtube.com/xml/schemas/2015}"
+_MEDIA = "{http://search.yahoo.com/mrss/}"
+
+
+class YouTubeFeedService:
+    def __init__(self):
+        self.url = settings.YOUTUBE_FEED_URL
+
+    async def fetch_feed_videos(
+        self, channel_external_id: str, since: datetime | None = None
+    ) -> list[YoutubeVideoInfo]:
+        """Vídeos do feed publicados depois de `since`, do mais recente ao mais antigo."""
+        parser = XMLPullParser(events=("end",))
+        videos: list[YoutubeVideoInfo] = []
+        async with get_http_client().stream(
+            "GET", self.url, params={"channel_id": channel_external_id}
+        ) as resp:
+            resp.raise_for_status()
+            async for chunk in resp.aiter_bytes():
+                parser.feed(chunk)
+                for _, element in parser.read_events():
+                    if element.tag != f"{_ATOM}entry":
+                        continue
+                    info = self._parse_entry(element)
+                    element.clear()
+                    if info is None:
+                        continue
+                    if since and info.published_at <= since:
+                        # O resto do feed já foi visto: não lê mais nada da resposta
+                        return videos
+                    videos.append(info)
+        parser.close()
+        return videos
+
+    @staticmethod
+    def _parse_entry(entry) -> YoutubeVideoInfo | None:
+        video_id = entry.findtext(f"{_YT}videoId")
+        if not video_id:
+            return None
+
+        published_raw = entry.findtext(f"{_ATOM}published") or ""
+        try:
+            published_at = datetime.fromisoformat(published_raw.replace("Z", "+00:00"))
+        except ValueError:
+            published_at = datetime.now(timezone.utc)
+
+        group = entry.find(f"{_MEDIA}group")
+        thumbnail = None
+        description = ""
+        if group is not None:
+            thumb = group.find(f"{_MEDIA}thumbnail")
+            thumbnail = thumb.get("url") if thumb is not None else None
+            description = group.findtext(f"{_MEDIA}description") or ""
+
+        return YoutubeVideoInfo(
+            youtube_video_id=video_id,
+            youtube_url=f"https://www.youtube.com/watch?v={video_id}",
+            title=entry.findtext(f"{_ATOM}title") or "",
+            description=description,
+            thumbnail_url=thumbnail,
+            published_at=published_at,
+        )
@@ -0,0 +1,158 @@
+"""Contabilidade da quota diária da YouTube Data API.
+
+Cada chamada feita pelo `YouTubeService` é lançada em um ledger no Redis
+(hash `youtube:quota:<dia>`, um campo por endpoint e o total em `_total`)
+com o custo em unidades do endpoint. O dia é o da quota do Google, que
+reinicia à meia-noite do horário do Pacífico.
+
+A partir do gasto até agora, o ledger projeta o consumo do dia inteiro
+(ritmo médio desde a virada). Logo após a virada, poucas chamadas em
+poucos segundos projetariam um dia muito acima do orçamento, então o ritmo
+é medido sobre no mínimo `YOUTUBE_QUOTA_MIN_PROJECTION_SECONDS`. O monitoramento usa `allowance` para
+limitar quantos canais verifica por tick quando a projeção passa do
+orçamento, e para de verificar ao entrar na reserva.
+"""
+from __future__ import annotations
+
+import logging
+import math
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+from app.core.config import settings
+from app.core.redis import get_redis
+
+logger = logging.getLogger(__name__)
+
+# Custo em unidades por chamada (https://developers.google.com/youtube/v3/determine_quota_cost)
+QUOTA_COSTS: dict[str, int] = {
+    "channels": 1,
+    "playlistItems": 1,
+    "videos": 1,
+    "search": 100,
+}
+_TOTAL_FIELD = "_total"
+_KEY_TTL_SECONDS = 3 * 24 * 3600
+
+
+def _quota_tz():
+    try:
+        return ZoneInfo(settings.YOUTUBE_QUOTA_TIMEZONE)
+    except ZoneInfoNotFoundError:
+        return timezone.utc
+
+
+@dataclass
+class QuotaStatus:
+    day: str
+    spent: int
+    by_endpoint: dict[str, int]
+    budget: int
+    reserve: int
+    projected: int
+    resets_at: datetime
+    elapsed_seconds: float
+    remaining_seconds: float
+
+    @property
+    def remaining(self) -> int:
+        return max(self.budget - self.spent, 0)
+
+    @property
+    def exhausted(self) -> bool:
+        """Só sobrou a reserva (disparos manuais e backfill pequenos)."""
+        return self.remaining <= self.reserve
+
+    @property
+    def throttling(self) -> bool:
+        return self.exhausted or self.projected > self.budget
+
+    def to_dict(self) -> dict:
+        return {
+            "day": self.day,
+            "spent": self.spent,
+            "by_endpoint": self.by_endpoint,
+            "budget": self.budget,
+            "reserve": self.reserve,
+            "remaining": self.remaining,
+            "projected": self.projected,
+            "resets_at": self.resets_at.isoformat(),
+            "throttling": self.throttling,
+            "exhausted": self.exhausted,
+        }
+
+
+class YouTubeQuotaLedger:
+    def __init__(self, budget: int | None = None, reserve: int | None = None):
+        self.budget = budget if budget is not None else settings.YOUTUBE_DAILY_QUOTA
+        self.reserve = reserve if reserve is not None else settings.YOUTUBE_QUOTA_RESERVE
+
+    @staticmethod
+    def _day_bounds(now: datetime) -> tuple[str, datetime, datetime]:
+        local = now.astimezone(_quota_tz())
+        start = local.replace(hour=0, minute=0, second=0, microsecond=0)
+        return start.date().isoformat(), start, start + timedelta(days=1)
+
+    @staticmethod
+    def _key(day: str) -> str:
+        return f"youtube:quota:{day}"
+
+    async def record(self, endpoint: str, calls: int = 1) -> None:
+        """Lança o custo de `calls` chamadas ao endpoint. Falhas do Redis só são logadas."""
+        cost = QUOTA_COSTS.get(endpoint, 1) * calls
+        day, _, _ = self._day_bounds(datetime.now(timezone.utc))
+        key = self._key(day)
+        try:
+            async with get_redis().pipeline(transaction=False) as pipe:
+                pipe.hincrby(key, endpoint, cost)
+                pipe.hincrby(key, _TOTAL_FIELD, cost)
+                pipe.expire(key, _KEY_TTL_SECONDS)
+                await pipe.execute()
+        except Exception as exc:
+            logger.warning("Falha ao registrar quota do YouTube (%s): %s", endpoint, exc)
+
+    async def status(self, now: datetime | None = None) -> QuotaStatus:
+        now = now or datetime.now(timezone.utc)
+        day, start, end = self._day_bounds(now)
+        raw = await get_redis().hgetall(self._key(day))
+        by_endpoint = {k: int(v) for k, v in raw.items() if k != _TOTAL_FIELD}
+        spent = int(raw.get(_TOTAL_FIELD, 0))
+
+        elapsed = max((now - start).total_seconds(), 1.0)
+        remaining_seconds = max((end - now).total_seconds(), 0.0)
+        window = max(elapsed, settings.YOUTUBE_QUOTA_MIN_PROJECTION_SECONDS)
+        projected = math.ceil(spent + spent / window * remaining_seconds)
+        return QuotaStatus(
+            day=day,
+            spent=spent,
+            by_endpoint=by_endpoint,
+            budget=self.budget,
+            reserve=self.reserve,
+            projected=projected,
+            resets_at=end.astimezone(timezone.utc),
+            elapsed_seconds=elapsed,
+            remaining_seconds=remaining_seconds,
+        )
+
+    async def allowance(self, units_per_check: int | None = None) -> int | None:
+        """Quantos canais podem ser verificados neste tick.
+
+        None = sem limite (projeção dentro do orçamento). Acima do orçamento,
+        o que sobra (menos a reserva) é dividido pelos ticks restantes do dia;
+        na reserva, nenhum canal é verificado até a quota reiniciar.
+        """
+        units_per_check = units_per_check or settings.YOUTUBE_QUOTA_UNITS_PER_CHECK
+        try:
+            status = await self.status()
+        except Exception as exc:
+            logger.warning("Ledger de quota indisponível, monitoramento sem limite: %s", exc)
+            return None
+
+        if status.exhausted:
+            return 0
+        if not status.throttling:
+            return None
+        ticks_left = max(status.remaining_seconds / settings.MONITOR_TICK_SECONDS, 1.0)
+        per_tick = (status.remaining - status.reserve) / ticks_left
+        return max(1, int(per_tick / units_per_check))
@@ -3,11 +3,21 @@
 Busca vídeos novos em um canal usando o endpoint playlistItems.list
 através da uploads playlist de cada canal.
 """
+import asyncio
+import logging
 import re
+from collections.abc import AsyncIterator
 from datetime import datetime, timezone
 from dataclasses import dataclass
 import httpx
 from app.core.config import settings
+from app.core.http import get_http_client
+from app.services.youtube_quota_service import YouTubeQuotaLedger
+
+logger = logging.getLogger(__name__)
+
+_VIDEOS_BATCH_SIZE = 50   # limite de ids por chamada de videos.list
+_ISO_DURATION = re.compile(r"P(?:(\d+)D)?(?:T(?:(\d+)H)?(?:(\d+)M)?(?:(\d+)S)?)?$")
 
 
 @dataclass
@@ -21,15 +31,44 @@ class YoutubeVideoInfo:
     duration_seconds: int | None = None
 
 
-class YouTubeService:
-    BASE = "https://www.googleapis.com/youtube/v3"
+@dataclass
+class VideoDetails:
+    youtube_video_id: str
+    duration_seconds: int | None
+    live_broadcast_content: str | None   # none | live | upcoming
+    has_captions: bool | None
+
+
+@dataclass
+class PlaylistPage:
+    videos: list[YoutubeVideoInfo]
+    etag: str | None = None
+    not_modified: bool = False   # 304: nada mudou desde `etag`
+    next_page_token: str | None = None
+    reached_since: bool = False  # a página chegou a um vídeo já visto
+
 
+class YouTubeService:
     def __init__(self):
         self.api_key = settings.YOUTUBE_API_KEY
+        self.base = settings.YOUTUBE_API_BASE_URL.rstrip("/")
+        self.quota = YouTubeQuotaLedger()
 
     def _is_configured(self) -> bool:
         return bool(self.api_key)
 
+    async def _api_get(
+        self, client: httpx.AsyncClient, endpoint: str, params: dict, **kwargs
+    ) -> httpx.Response:
+        """GET em um endpoint da API, lançando o custo no ledger de quota.
+
+        `client` é o cliente HTTP compartilhado do processo (`app.core.http`),
+        que mantém as conexões com a API abertas entre canais.
+        """
+        resp = await client.get(f"{self.base}/{endpoint}", params={**params, "key": self.api_key}, **kwargs)
+        await self.quota.record(endpoint)
+        return resp
+
     async def get_channel_external_id(self, channel_url: str) -> str | None:
         """Resolve o channel_external_id (UCxxxxxxx) a partir de uma URL do YouTube."""
         if not self._is_configured():
@@ -41,16 +80,16 @@ class YouTubeService:
         if channel_id_direct:
             return channel_id_direct
 
-        async with httpx.AsyncClient(timeout=10) as client:
-            if handle:
-                resp = await client.get(
-                    f"{self.BASE}/channels",
-                    params={"part": "id", "forHandle": handle, "key": self.api_key},
-                )
-                data = resp.json()
-                items = data.get("items", [])
-                if items:
-                    return items[0]["id"]
+        if handle:
+            resp = await self._api_get(
+                get_http_client(), "channels",
+                params={"part": "id", "forHandle": handle},
+                timeout=10,
+            )
+            data = resp.json()
+            items = data.get("items", [])
+            if items:
+                return items[0]["id"]
         return None
 
     async def fetch_new_videos(
@@ -59,51 +98,189 @@ class YouTubeService:
         since: datetime | None = None,
         max_results: int = 50,
     ) -> list[YoutubeVideoInfo]:
-        """Retorna vídeos novos do canal desde `since`. Sem API key retorna lista vazia."""
+        """Retorna vídeos novos do canal desde `since`. Sem API key retorna lista vazia.
+
+        Resolve a uploads playlist a cada chamada; quem já tem o id salvo
+        deve usar `fetch_playlist_videos` direto.
+        """
         if not self._is_configured():
             return []
 
-        async with httpx.AsyncClient(timeout=15) as client:
-            uploads_playlist = await self._get_uploads_playlist(client, channel_external_id)
-            if not uploads_playlist:
-                return []
+        uploads_playlist = await self.get_uploads_playlist(channel_external_id)
+        if not uploads_playlist:
+            return []
+        page = await self.fetch_playlist_videos(uploads_playlist, since=since, max_results=max_results)
+        return page.videos
 
-            videos = await self._list_playlist_items(client, uploads_playlist, max_results)
+    async def fetch_playlist_videos(
+        self,
+        playlist_id: str,
+        since: datetime | None = None,
+        max_results: int = 50,
+        etag: str | None = None,
+    ) -> PlaylistPage:
+        """Lista vídeos de uma uploads playlist já conhecida (só playlistItems.list).
 
-        if since:
-            videos = [v for v in videos if v.published_at > since]
+        Com `since`, percorre as páginas (pageToken) até encontrar o primeiro
+        vídeo publicado em ou antes de `since` — nenhum vídeo novo se perde,
+        mesmo que o canal tenha publicado mais de uma página desde a última
+        verificação. Sem `since`, lê só a primeira página (`max_results`).
 
-        return videos
+        Com `etag`, a primeira requisição é condicional: se a playlist não
+        mudou, a API responde 304 e o resultado vem com `not_modified=True`.
+        """
+        if not self._is_configured():
+            return PlaylistPage(videos=[], etag=etag)
 
-    async def _get_uploads_playlist(self, client: httpx.AsyncClient, channel_id: str) -> str | None:
-        resp = await client.get(
-            f"{self.BASE}/channels",
+        max_pages = settings.YOUTUBE_POLL_MAX_PAGES if since else 1
+        result: PlaylistPage | None = None
+        async for page in self.iter_playlist_pages(
+            playlist_id, since=since, etag=etag, page_size=max_results, max_pages=max_pages
+        ):
+            if result is None:
+                result = page
+            else:
+                result.videos.extend(page.videos)
+                result.next_page_token = page.next_page_token
+                result.reached_since = page.reached_since
+        return result or PlaylistPage(videos=[], etag=etag)
+
+    async def iter_playlist_pages(
+        self,
+        playlist_id: str,
+        since: datetime | None = None,
+        etag: str | None = None,
+        page_size: int = 50,
+        max_pages: int | None = None,
+    ) -> AsyncIterator[PlaylistPage]:
+        """Gera as páginas da playlist, da mais recente para a mais antiga.
+
+        Para no primeiro vídeo com `published_at <= since` (a uploads playlist
+        vem em ordem de publicação), sem pedir a página seguinte. Usado pelo
+        backfill para ingerir cada página assim que ela chega.
+        """
+        if not self._is_configured():
+            return
+
+        client = get_http_client()
+        page_token: str | None = None
+        pages = 0
+        while True:
+            page = await self._list_playlist_items(
+                client, playlist_id, page_size,
+                etag=etag if page_token is None else None,
+                page_token=page_token,
+                since=since,
+            )
+            pages += 1
+            yield page
+            if page.not_modified or page.reached_since or not page.next_page_token:
+                return
+            if max_pages is not None and pages >= max_pages:
+                # Sem `since` o limite é o esperado (primeira página, teto do backfill)
+                if since is not None:
+                    logger.warning(
+                        "Playlist %s: limite de %d páginas atingido antes de alcançar %s",
+                        playlist_id, max_pages, since,
+                    )
+                return
+            page_token = page.next_page_token
+
+    async def get_uploads_playlist(self, channel_id: str) -> str | None:
+        """Resolve a uploads playlist do canal via channels.list."""
+        if not self._is_configured():
+            return None
+        return await self._get_uploads_playlist(get_http_client(), channel_id)
+
+    async def get_video_details(self, video_ids: list[str]) -> dict[str, VideoDetails]:
+        """Duração, estado de transmissão ao vivo e legendas via videos.list.
+
+        Os ids são agrupados de 50 em 50 (1 unidade de quota por chamada) e
+        os lotes são buscados em paralelo. Vídeos removidos ou privados não
+        aparecem no resultado.
+        """
+        if not self._is_configured() or not video_ids:
+            return {}
+
+        client = get_http_client()
+        batches = [
+            video_ids[i:i + _VIDEOS_BATCH_SIZE] for i in range(0, len(video_ids), _VIDEOS_BATCH_SIZE)
+        ]
+        results = await asyncio.gather(*(self._list_videos(client, batch) for batch in batches))
+        return {d.youtube_video_id: d for batch in results for d in batch}
+
+    async def _list_videos(self, client: httpx.AsyncClient, video_ids: list[str]) -> list[VideoDetails]:
+        resp = await self._api_get(
+            client, "videos",
             params={
-                "part": "contentDetails",
-                "id": channel_id,
-                "key": self.api_key,
+                "part": "snippet,contentDetails",
+                "id": ",".join(video_ids),
+                # Só os campos usados: a resposta cai de KBs para poucos bytes por vídeo
+                "fields": "items(id,snippet/liveBroadcastContent,contentDetails(duration,caption))",
             },
         )
         data = resp.json()
+        details = []
+        for item in data.get("items", []):
+            content = item.get("contentDetails", {})
+            caption = content.get("caption")
+            details.append(
+                VideoDetails(
+                    youtube_video_id=item["id"],
+                    duration_seconds=self._parse_duration(content.get("duration")),
+                    live_broadcast_content=item.get("snippet", {}).get("liveBroadcastContent"),
+                    has_captions=None if caption is None else caption == "true",
+                )
+            )
+        return details
+
+    @staticmethod
+    def _parse_duration(value: str | None) -> int | None:
+        """Converte a duração ISO 8601 da API (ex.: PT1H2M3S) em segundos."""
+        match = _ISO_DURATION.match(value or "")
+        if not match:
+            return None
+        days, hours, minutes, seconds = (int(g or 0) for g in match.groups())
+        return ((days * 24 + hours) * 60 + minutes) * 60 + seconds
+
+    async def _get_uploads_playlist(self, client: httpx.AsyncClient, channel_id: str) -> str | None:
+        resp = await self._api_get(
+            client, "channels",
+            params={"part": "contentDetails", "id": channel_id},
+        )
+        data = resp.json()
         items = data.get("items", [])
         if not items:
             return None
         return items[0]["contentDetails"]["relatedPlaylists"]["uploads"]
 
     async def _list_playlist_items(
-        self, client: httpx.AsyncClient, playlist_id: str, max_results: int
-    ) -> list[YoutubeVideoInfo]:
-        resp = await client.get(
-            f"{self.BASE}/playlistItems",
-            params={
-                "part": "snippet,contentDetails",
-                "playlistId": playlist_id,
-                "maxResults": min(max_results, 50),
-                "key": self.api_key,
-            },
+        self,
+        client: httpx.AsyncClient,
+        playlist_id: str,
+        max_results: int,
+        etag: str | None = None,
+        page_token: str | None = None,
+        since: datetime | None = None,
+    ) -> PlaylistPage:
+        params = {
+            "part": "snippet,contentDetails",
+            "playlistId": playlist_id,
+            "maxResults": min(max_results, 50),
+        }
+        if page_token:
+            params["pageToken"] = page_token
+        resp = await self._api_get(
+            client, "playlistItems",
+            params=params,
+            headers={"If-None-Match": etag} if etag else None,
         )
+        if resp.status_code == 304:
+            return PlaylistPage(videos=[], etag=etag, not_modified=True)
+
         data = resp.json()
         videos = []
+        reached_since = False
         for item in data.get("items", []):
             snippet = item.get("snippet", {})
             video_id = snippet.get("resourceId", {}).get("videoId")
@@ -115,6 +292,10 @@ class YouTubeService:
                 published_at = datetime.fromisoformat(published_raw.replace("Z", "+00:00"))
             except ValueError:
                 published_at = datetime.now(timezone.utc)
+            if since and published_at <= since:
+                # Daqui em diante só há vídeos já vistos: o resto da página é ignorado
+                reached_since = True
+                break
 
             thumbs = snippet.get("thumbnails", {})
             thumbnail = (
@@ -133,7 +314,13 @@ class YouTubeService:
                     published_at=published_at,
                 )
             )
-        return videos
+        etag = (resp.headers.get("etag") or data.get("etag")) if resp.is_success else None
+        return PlaylistPage(
+            videos=videos,
+            etag=etag,
+            next_page_token=data.get("nextPageToken"),
+            reached_since=reached_since,
+        )
 
     @staticmethod
     def _extract_handle(url: str) -> str | None:
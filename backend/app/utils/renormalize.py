@@ -0,0 +1,69 @@
+"""Backfill: re-normaliza os transcripts gravados com outra versão das regras.
+
+Uso: python -m app.utils.renormalize [--batch-size 200] [--workers N]
+
+Percorre `video_transcripts` por id, em lotes, selecionando só as linhas
+cujo `normalization_version` difere de `NORMALIZATION_VERSION` (inclusive
+NULL). A normalização é CPU pura e roda num pool de processos; cada lote
+é gravado num único UPDATE em massa e commitado, então o comando pode ser
+interrompido e rodado de novo sem refazer o que já foi gravado. Os
+segmentos não são recriados — só o texto usado na extração.
+"""
+import argparse
+import asyncio
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from app.core.database import AsyncSessionLocal
+from app.repositories.transcript_repository import TranscriptRepository
+from app.services.normalization_service import NORMALIZATION_VERSION, NormalizationService
+
+_service: NormalizationService | None = None
+
+
+def _normalize(raw_text: str) -> str:
+    global _service
+    if _service is None:
+        _service = NormalizationService()
+    return _service.normalize(raw_text)
+
+
+async def run_backfill(batch_size: int, workers: int) -> int:
+    loop = asyncio.get_running_loop()
+    total = 0
+    last_id = 0
+    started = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        while True:
+            async with AsyncSessionLocal() as db:
+                repo = TranscriptRepository(db)
+                rows = await repo.list_stale_normalized(NORMALIZATION_VERSION, last_id, batch_size)
+                if not rows:
+                    break
+                ids = [transcript_id for transcript_id, _ in rows]
+                chunksize = max(1, len(rows) // (workers * 4))
+                normalized = await loop.run_in_executor(
+                    None,
+                    lambda: list(pool.map(_normalize, [raw for _, raw in rows], chunksize=chunksize)),
+                )
+                await repo.bulk_update_normalized(NORMALIZATION_VERSION, dict(zip(ids, normalized)))
+                await db.commit()
+            total += len(rows)
+            last_id = ids[-1]
+            print(f"[renormalize] {total} transcripts atualizados (até id {last_id})")
+    print(f"[renormalize] Concluído: {total} transcripts em {time.perf_counter() - started:.1f}s "
+          f"(versão {NORMALIZATION_VERSION}).")
+    return total
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--batch-size", type=int, default=200, help="transcripts por lote/commit")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="processos de normalização")
+    args = parser.parse_args()
+    asyncio.run(run_backfill(args.batch_size, args.workers))
+
+
+if __name__ == "__main__":
+    main()
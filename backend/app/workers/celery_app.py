@@ -1,7 +1,39 @@
 from celery import Celery
-from celery.schedules import crontab
+from kombu import Queue
 from app.core.config import settings
 
+# Uma fila por classe de recurso, para que cada uma escale com seu próprio pool
+QUEUE_DEFAULT = "default"
+QUEUE_MONITOR = "monitor"          # chamadas à YouTube Data API (leves, periódicas)
+QUEUE_TRANSCRIPT = "transcript"    # download de legendas (I/O de rede)
+QUEUE_LLM = "llm"                  # extração via LLM (lenta, cara)
+QUEUE_EVALUATION = "evaluation"    # avaliação de ideias após resultado
+
+# Pools de worker: filas consumidas, concorrência e prefetch de cada um.
+# Usado por `python -m app.workers.start_worker <pool>`.
+WORKER_POOLS: dict[str, dict] = {
+    "monitor": {
+        "queues": [QUEUE_MONITOR],
+        "concurrency": settings.CELERY_MONITOR_CONCURRENCY,
+        "prefetch_multiplier": settings.CELERY_MONITOR_PREFETCH,
+    },
+    "transcript": {
+        "queues": [QUEUE_TRANSCRIPT],
+        "concurrency": settings.CELERY_TRANSCRIPT_CONCURRENCY,
+        "prefetch_multiplier": settings.CELERY_TRANSCRIPT_PREFETCH,
+    },
+    "llm": {
+        "queues": [QUEUE_LLM],
+        "concurrency": settings.CELERY_LLM_CONCURRENCY,
+        "prefetch_multiplier": settings.CELERY_LLM_PREFETCH,
+    },
+    "evaluation": {
+        "queues": [QUEUE_EVALUATION, QUEUE_DEFAULT],
+        "concurrency": settings.CELERY_EVALUATION_CONCURRENCY,
+        "prefetch_multiplier": settings.CELERY_EVALUATION_PREFETCH,
+    },
+}
+
 celery_app = Celery(
     "tipster",
     broker=settings.CELERY_BROKER_URL,
@@ -15,12 +47,47 @@ celery_app.conf.update(
     accept_content=["json"],
     timezone="UTC",
     enable_utc=True,
+    task_default_queue=QUEUE_DEFAULT,
+    task_default_routing_key=QUEUE_DEFAULT,
+    task_queues=[
+        Queue(QUEUE_DEFAULT, routing_key=QUEUE_DEFAULT),
+        Queue(QUEUE_MONITOR, routing_key=QUEUE_MONITOR),
+        Queue(QUEUE_TRANSCRIPT, routing_key=QUEUE_TRANSCRIPT),
+        Queue(QUEUE_LLM, routing_key=QUEUE_LLM),
+        Queue(QUEUE_EVALUATION, routing_key=QUEUE_EVALUATION),
+    ],
+    task_routes={
+        "monitor_channels": {"queue": QUEUE_MONITOR},
+        "backfill_channel": {"queue": QUEUE_MONITOR},
+        "relay_outbox": {"queue": QUEUE_DEFAULT},
+        "purge_task_outbox": {"queue": QUEUE_DEFAULT},
+        # Workflow do vídeo: cada etapa na fila do seu gargalo
+        "prefetch_transcripts": {"queue": QUEUE_TRANSCRIPT},
+        "process_video": {"queue": QUEUE_TRANSCRIPT},
+        "fetch_transcript": {"queue": QUEUE_TRANSCRIPT},
+        "prepare_transcript": {"queue": QUEUE_TRANSCRIPT},
+        "extract_ideas": {"queue": QUEUE_LLM},
+        "persist_ideas": {"queue": QUEUE_DEFAULT},
+        "evaluate_video_ideas": {"queue": QUEUE_EVALUATION},
+        # O pipeline em estágios termina no LLM, que é o gargalo
+        "process_video_batch": {"queue": QUEUE_LLM},
+        "evaluate_ideas": {"queue": QUEUE_EVALUATION},
+    },
     beat_schedule={
-        # Roda a cada hora por padrão; cada canal tem seu próprio
-        # monitoring_frequency_minutes que é verificado dentro do serviço.
-        "monitor-channels-hourly": {
+        # Tick curto: a cada execução só os canais vencidos segundo seu
+        # monitoring_frequency_minutes são verificados (ChannelScheduler).
+        "monitor-channels-tick": {
             "task": "monitor_channels",
-            "schedule": crontab(minute=0),
+            "schedule": settings.MONITOR_TICK_SECONDS,
+        },
+        # Publica o outbox de tasks que não saiu junto com quem o gravou
+        "relay-outbox": {
+            "task": "relay_outbox",
+            "schedule": settings.OUTBOX_RELAY_INTERVAL_SECONDS,
+        },
+        "purge-task-outbox": {
+            "task": "purge_task_outbox",
+            "schedule": 3600,
         },
     },
 )
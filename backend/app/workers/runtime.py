@@ -0,0 +1,85 @@
+"""Ciclo de vida assíncrono de cada processo do worker Celery.
+
+Cada processo mantém um único event loop e um único engine do SQLAlchemy
+durante toda a sua vida. Assim o pool do asyncpg (criado no loop do
+processo) é reaproveitado entre tasks, em vez de abrir conexões novas a
+cada execução.
+
+- `worker_process_init`: cria o loop e recria o engine no processo filho
+- `run`: executa a coroutine de uma task no loop do processo
+- `worker_process_shutdown` / `worker_shutdown`: fecha o pool do banco,
+  os clientes HTTP e Redis compartilhados e o loop
+
+Com o pool `solo` (sem fork) o sinal de init não é emitido; o loop é
+criado sob demanda na primeira task.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import Any, Coroutine
+
+from celery.signals import worker_process_init, worker_process_shutdown, worker_shutdown
+
+logger = logging.getLogger(__name__)
+
+_loop: asyncio.AbstractEventLoop | None = None
+
+
+def start() -> asyncio.AbstractEventLoop:
+    """Cria o loop do processo e um engine novo ligado a ele."""
+    global _loop
+    if _loop is not None and not _loop.is_closed():
+        return _loop
+
+    from app.core import database
+
+    _loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(_loop)
+    database.reset_engine()
+    logger.info("Runtime do worker iniciado (loop e engine por processo)")
+    return _loop
+
+
+def run(coro: Coroutine[Any, Any, Any]) -> Any:
+    """Executa uma coroutine no loop persistente do processo."""
+    loop = _loop if _loop is not None and not _loop.is_closed() else start()
+    return loop.run_until_complete(coro)
+
+
+def shutdown() -> None:
+    """Fecha as conexões do pool e encerra o loop do processo."""
+    global _loop
+    if _loop is None or _loop.is_closed():
+        return
+
+    from app.core import database
+    from app.core.http import close_http_client
+    from app.core.redis import close_redis
+
+    try:
+        _loop.run_until_complete(database.engine.dispose())
+        _loop.run_until_complete(close_http_client())
+        _loop.run_until_complete(close_redis())
+        _loop.run_until_complete(_loop.shutdown_asyncgens())
+    except Exception:
+        logger.exception("Falha ao encerrar o runtime do worker")
+    finally:
+        _loop.close()
+        _loop = None
+        logger.info("Runtime do worker encerrado")
+
+
+@worker_process_init.connect
+def _on_worker_process_init(**_kwargs) -> None:
+    start()
+
+
+@worker_process_shutdown.connect
+def _on_worker_process_shutdown(**_kwargs) -> None:
+    shutdown()
+
+
+@worker_shutdown.connect
+def _on_worker_shutdown(**_kwargs) -> None:
+    shutdown()
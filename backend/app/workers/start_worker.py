@@ -0,0 +1,34 @@
+"""Inicia um worker Celery dedicado a um pool de filas.
+
+Uso:
+    python -m app.workers.start_worker monitor
+    python -m app.workers.start_worker llm --loglevel=debug
+
+Argumentos extras são repassados ao `celery worker`.
+"""
+import sys
+
+from app.workers.celery_app import WORKER_POOLS, celery_app
+
+
+def main(argv: list[str] | None = None) -> None:
+    argv = list(sys.argv[1:] if argv is None else argv)
+    if not argv or argv[0] not in WORKER_POOLS:
+        names = " | ".join(WORKER_POOLS)
+        sys.exit(f"uso: python -m app.workers.start_worker <{names}> [opções do celery]")
+
+    name, extra = argv[0], argv[1:]
+    pool = WORKER_POOLS[name]
+    celery_app.worker_main([
+        "worker",
+        "--queues", ",".join(pool["queues"]),
+        "--hostname", f"{name}@%h",
+        "--concurrency", str(pool["concurrency"]),
+        "--prefetch-multiplier", str(pool["prefetch_multiplier"]),
+        "--loglevel", "info",
+        *extra,
+    ])
+
+
+if __name__ == "__main__":
+    main()
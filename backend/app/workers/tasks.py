@@ -1,29 +1,46 @@
-import asyncio
 import logging
 
+from app.workers import runtime
 from app.workers.celery_app import celery_app
 
 logger = logging.getLogger(__name__)
 
 
 def _run(coro):
-    """Executa uma coroutine dentro de um task Celery síncrono."""
-    loop = asyncio.new_event_loop()
-    try:
-        return loop.run_until_complete(coro)
-    finally:
-        loop.close()
+    """Executa uma coroutine dentro de um task Celery síncrono.
+
+    Usa o loop persistente do processo (ver `app.workers.runtime`), o que
+    permite reaproveitar o pool de conexões entre tasks.
+    """
+    return runtime.run(coro)
 
 
 @celery_app.task(name="monitor_channels", bind=True, max_retries=3)
-def monitor_channels_task(self):
-    """Job periódico: verifica vídeos novos em todos os canais ativos."""
+def monitor_channels_task(self, channel_id: int | None = None):
+    """Job periódico: verifica vídeos novos nos canais ativos que estão vencidos.
+
+    Roda a cada tick do beat. Um lock no Redis impede que dois ticks
+    verifiquem os mesmos canais ao mesmo tempo. Com `channel_id`, verifica
+    só esse canal (disparo manual).
+    """
+    from app.core.config import settings
     from app.core.database import AsyncSessionLocal
+    from app.core.locks import RedisLock
     from app.services.channel_monitor_service import ChannelMonitorService
 
     async def _inner():
-        async with AsyncSessionLocal() as db:
-            return await ChannelMonitorService(db).run()
+        lock = RedisLock(
+            f"lock:monitor_channels:{channel_id or 'all'}",
+            ttl=settings.MONITOR_LOCK_TTL_SECONDS,
+        )
+        if not await lock.acquire():
+            return {"skipped": "monitor_already_running"}
+        try:
+            async with lock.heartbeat():
+                async with AsyncSessionLocal() as db:
+                    return await ChannelMonitorService(db).run(channel_id=channel_id)
+        finally:
+            await lock.release()
 
     try:
         stats = _run(_inner())
@@ -34,23 +51,221 @@ def monitor_channels_task(self):
         raise self.retry(exc=exc, countdown=60)
 
 
+@celery_app.task(name="backfill_channel", bind=True, max_retries=2)
+def backfill_channel_task(self, channel_id: int, max_videos: int | None = None):
+    """Importa o histórico de um canal (backfill), ingerindo página a página."""
+    from app.core.config import settings
+    from app.core.database import AsyncSessionLocal
+    from app.core.locks import RedisLock
+    from app.services.channel_monitor_service import ChannelMonitorService
+
+    async def _inner():
+        lock = RedisLock(f"lock:backfill_channel:{channel_id}", ttl=settings.MONITOR_LOCK_TTL_SECONDS)
+        if not await lock.acquire():
+            return {"skipped": "backfill_already_running"}
+        try:
+            async with lock.heartbeat():
+                async with AsyncSessionLocal() as db:
+                    return await ChannelMonitorService(db).backfill(channel_id, max_videos=max_videos)
+        finally:
+            await lock.release()
+
+    try:
+        stats = _run(_inner())
+        logger.info("backfill_channel concluído: channel_id=%s %s", channel_id, stats)
+        return stats
+    except Exception as exc:
+        logger.exception("backfill_channel falhou: channel_id=%s", channel_id)
+        raise self.retry(exc=exc, countdown=120)
+
+
+@celery_app.task(name="relay_outbox")
+def relay_outbox_task():
+    """Publica as tasks pendentes do outbox (beat + avisos após commits)."""
+    from app.services.outbox_service import OutboxRelay
+
+    stats = _run(OutboxRelay().run())
+    if stats["published"] or stats["failed"]:
+        logger.info("relay_outbox: %s", stats)
+    return stats
+
+
+@celery_app.task(name="purge_task_outbox")
+def purge_task_outbox_task():
+    """Remove do outbox as tasks já publicadas há mais que a retenção."""
+    from app.services.outbox_service import OutboxRelay
+
+    return _run(OutboxRelay().purge_published())
+
+
+@celery_app.task(name="prefetch_transcripts")
+def prefetch_transcripts_task(youtube_video_ids: list[str]):
+    """Puxa do proxy, em lote, as transcrições de vídeos recém-ingeridos para o cache local.
+
+    O `fetch_transcript` de cada vídeo passa a encontrá-las no cache em vez
+    de fazer uma requisição ao proxy por vídeo. Falhas só são logadas.
+    """
+    from app.services.transcript_service import TranscriptService
+
+    try:
+        stored = _run(TranscriptService().prefetch_from_proxy(youtube_video_ids))
+    except Exception as exc:
+        logger.warning("prefetch_transcripts falhou: %s", exc)
+        return 0
+    logger.info("prefetch_transcripts: %d de %d transcrições", stored, len(youtube_video_ids))
+    return stored
+
+
 @celery_app.task(name="process_video", bind=True, max_retries=2)
 def process_video_task(self, video_id: int):
-    """Pipeline de processamento de um vídeo: transcrição, normalização e segmentação."""
+    """Abre o workflow do vídeo e encadeia as etapas do pipeline.
+
+    Cada etapa é uma task própria, em sua fila: um retry reexecuta só a
+    etapa que falhou (ver `VideoWorkflowService`).
+    """
+    from celery import chain
+    from app.core.config import settings
     from app.core.database import AsyncSessionLocal
-    from app.services.video_pipeline_service import VideoPipelineService
+    from app.core.locks import video_lock
+    from app.core.redis import incr_metric
+    from app.services.video_workflow_service import VideoWorkflowService
+
+    # O id da task é o dono do lock; ele se mantém entre retries
+    lock_token = self.request.id
 
     async def _inner():
-        async with AsyncSessionLocal() as db:
-            await VideoPipelineService(db).process(video_id)
+        lock = video_lock(video_id, token=lock_token)
+        if not await lock.acquire():
+            await incr_metric("process_video.duplicates_prevented")
+            return None
+        try:
+            async with AsyncSessionLocal() as db:
+                job_id = await VideoWorkflowService(db).begin(video_id)
+        except Exception:
+            await lock.release()
+            raise
+        if job_id is None:
+            await lock.release()
+        else:
+            # A primeira etapa ainda vai esperar na fila de transcrição
+            await lock.refresh(settings.VIDEO_LOCK_HANDOFF_TTL_SECONDS)
+        return job_id
 
     try:
-        _run(_inner())
-        logger.info("process_video concluído: video_id=%s", video_id)
+        job_id = _run(_inner())
     except Exception as exc:
         logger.exception("process_video falhou: video_id=%s", video_id)
         raise self.retry(exc=exc, countdown=30)
 
+    if job_id is None:
+        logger.info("process_video ignorado (duplicado ou inexistente): video_id=%s", video_id)
+        return None
+    stage_args = (job_id, video_id, lock_token)
+    chain(
+        fetch_transcript_task.si(*stage_args),
+        prepare_transcript_task.si(*stage_args),
+        extract_ideas_task.si(*stage_args),
+        persist_ideas_task.si(*stage_args),
+        evaluate_video_ideas_task.si(*stage_args),
+    ).apply_async()
+    logger.info("process_video encadeado: video_id=%s job_id=%s", video_id, job_id)
+    return job_id
+
+
+def _run_stage(task, stage: str, job_id: int, video_id: int | None, lock_token: str | None, countdown: int):
+    """Executa uma etapa do workflow; após o último retry, marca o vídeo como falho.
+
+    Enquanto a etapa roda, o lock do vídeo é renovado por heartbeat. Ao
+    concluir com o workflow ainda em andamento, o TTL é estendido para
+    `VIDEO_LOCK_HANDOFF_TTL_SECONDS`, cobrindo a espera da próxima etapa na
+    fila. O lock é liberado quando o workflow termina (concluído, sem
+    transcrição ou falho).
+    """
+    from app.core.config import settings
+    from app.core.database import AsyncSessionLocal
+    from app.core.locks import video_lock
+    from app.services.video_workflow_service import VideoWorkflowService
+
+    lock = video_lock(video_id, token=lock_token) if lock_token else None
+
+    async def _inner():
+        async with AsyncSessionLocal() as db:
+            service = VideoWorkflowService(db)
+            if lock is None:
+                return await getattr(service, stage)(job_id)
+            async with lock.heartbeat():
+                result = await getattr(service, stage)(job_id)
+            if await service.is_running(job_id):
+                # A chain enfileira a próxima etapa assim que esta retorna
+                await lock.refresh(settings.VIDEO_LOCK_HANDOFF_TTL_SECONDS)
+            else:
+                await lock.release()
+            return result
+
+    async def _fail(exc: Exception):
+        async with AsyncSessionLocal() as db:
+            await VideoWorkflowService(db).fail_job(job_id, exc)
+        if lock is not None:
+            await lock.release()
+
+    try:
+        return _run(_inner())
+    except Exception as exc:
+        logger.exception("Etapa %s falhou: job_id=%s", stage, job_id)
+        if task.request.retries >= task.max_retries:
+            _run(_fail(exc))
+            raise
+        if lock is not None:
+            # O retry volta para a fila da etapa
+            try:
+                _run(lock.refresh(settings.VIDEO_LOCK_HANDOFF_TTL_SECONDS))
+            except Exception:
+                logger.warning("Não foi possível estender o lock do vídeo %s", video_id)
+        raise task.retry(exc=exc, countdown=countdown)
+
+
+@celery_app.task(name="fetch_transcript", bind=True, max_retries=2)
+def fetch_transcript_task(self, job_id: int, video_id: int | None = None, lock_token: str | None = None):
+    """Etapa 1: baixa e persiste a transcrição."""
+    return _run_stage(self, "fetch", job_id, video_id, lock_token, countdown=60)
+
+
+@celery_app.task(name="prepare_transcript", bind=True, max_retries=2)
+def prepare_transcript_task(self, job_id: int, video_id: int | None = None, lock_token: str | None = None):
+    """Etapa 2: normaliza e segmenta a transcrição persistida."""
+    return _run_stage(self, "prepare", job_id, video_id, lock_token, countdown=10)
+
+
+@celery_app.task(name="extract_ideas", bind=True, max_retries=3)
+def extract_ideas_task(self, job_id: int, video_id: int | None = None, lock_token: str | None = None):
+    """Etapa 3: extração via LLM; a saída bruta fica salva na análise."""
+    return _run_stage(self, "extract", job_id, video_id, lock_token, countdown=120)
+
+
+@celery_app.task(name="persist_ideas", bind=True, max_retries=2)
+def persist_ideas_task(self, job_id: int, video_id: int | None = None, lock_token: str | None = None):
+    """Etapa 4: persiste as ideias extraídas e finaliza a análise."""
+    return _run_stage(self, "persist", job_id, video_id, lock_token, countdown=10)
+
+
+@celery_app.task(name="evaluate_video_ideas", bind=True, max_retries=2)
+def evaluate_video_ideas_task(self, job_id: int, video_id: int | None = None, lock_token: str | None = None):
+    """Etapa 5: avalia ideias de jogos que já têm resultado registrado."""
+    return _run_stage(self, "evaluate", job_id, video_id, lock_token, countdown=10)
+
+
+@celery_app.task(name="process_video_batch", bind=True)
+def process_video_batch_task(self, video_ids: list[int]):
+    """Processa vários vídeos no mesmo worker com o pipeline em estágios.
+
+    Enfileirado pelo backfill de canais (uma task por página ingerida).
+    """
+    from app.services.staged_pipeline_service import StagedVideoPipeline
+
+    stats = _run(StagedVideoPipeline().run(video_ids))
+    logger.info("process_video_batch concluído: %s", stats)
+    return stats
+
 
 @celery_app.task(name="evaluate_ideas", bind=True)
 def evaluate_ideas_task(self, game_id: int):
@@ -0,0 +1,165 @@
+"""Benchmark: parser json3 com `json.load` vs. parser em streaming.
+
+Grava a fixture de live longa (`benchmarks.long_stream_fixture`) num
+arquivo temporário e compara:
+
+- antes: o parser anterior de `TranscriptService._parse_json3` —
+  `json.load` no arquivo inteiro e uma lista de `TranscriptEntry`
+- depois: `app.services.json3_parser.parse_json3`, que lê em blocos e
+  monta um `TranscriptEntries`
+
+Mede o pico de memória (tracemalloc) e o melhor tempo de N execuções, e
+confere que os dois produzem as mesmas entradas.
+
+Também confere `iter_json3_events` contra `json.loads` com blocos de 1 a
+64 caracteres, em documentos escolhidos para cortar valores no meio —
+entre eles um número partido na borda do bloco (`2.` | `5`), que já fez
+o parser ler `2.` e quebrar no separador. Com `--check`, só roda as
+conferências — serve de verificação em CI; o código de saída é 1 se
+houver divergência.
+
+Uso (de dentro de backend/):
+    python -m benchmarks.bench_json3_parser --hours 4
+    python -m benchmarks.bench_json3_parser --hours 12 --repeat 3
+    python -m benchmarks.bench_json3_parser --check
+"""
+from __future__ import annotations
+
+import argparse
+import gc
+import io
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from app.services.json3_parser import iter_json3_events, parse_json3
+from app.services.transcript_service import TranscriptEntry
+from benchmarks.long_stream_fixture import write_json3
+
+
+_SPLIT_CASES = (
+    # número partido na borda: com bloco de 8, o primeiro termina em `2.`
+    '{"a": 2.5, "events": []}',
+    '{"a": 2.5, "events": [{"tStartMs": 1234567, "dDurationMs": 2.5e3, "segs": [{"utf8": "oi"}]}]}',
+    '{"events": [{"tStartMs": -12.75e-2, "segs": [{"utf8": "a\\"b\\u00e7"}]}], "wireMagic": "pb3"}',
+    '{"wireMagic": "pb3", "pens": [{}], "events": [{"tStartMs": 0, "aAppend": 1}, {"segs": null}]}',
+    '{}',
+)
+
+
+def _random_doc(rng: random.Random) -> str:
+    def number() -> str:
+        return rng.choice(["0", "7", "-3", "2.5", "1e3", "-0.125", "12345678", "6.02E+23", "4.5e-1"])
+
+    events = []
+    for _ in range(rng.randint(0, 4)):
+        event = {"tStartMs": json.loads(number()), "dDurationMs": json.loads(number())}
+        if rng.random() < 0.8:
+            event["segs"] = [{"utf8": rng.choice(["oi", " \n", "é \"x\"", "\\"])} for _ in range(rng.randint(1, 3))]
+        events.append(event)
+    head = ", ".join(f'"k{i}": {number()}' for i in range(rng.randint(0, 3)))
+    body = json.dumps(events, separators=(",", rng.choice([":", ": "])))
+    return "{" + (head + ", " if head else "") + '"events": ' + body + "}"
+
+
+def check_chunked(seed: int = 0, docs: int = 200) -> int:
+    """`iter_json3_events` em blocos de 1..64 vs. `json.loads`."""
+    rng = random.Random(seed)
+    cases = [*_SPLIT_CASES, *(_random_doc(rng) for _ in range(docs))]
+    failures = 0
+    for doc in cases:
+        expected = json.loads(doc).get("events", [])
+        for chunk_size in range(1, 65):
+            try:
+                got = list(iter_json3_events(io.StringIO(doc), chunk_size))
+            except ValueError as exc:
+                got = exc
+            if got != expected:
+                failures += 1
+                print(f"divergência com bloco de {chunk_size}: {doc!r} -> {got!r}")
+                break
+    return failures
+
+
+def _parse_with_load(path: str) -> list[TranscriptEntry]:
+    """Parser anterior (json.load + dict por evento + lista de entradas)."""
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    entries = []
+    for event in data.get("events", []):
+        segs = event.get("segs")
+        if not segs:
+            continue
+        text = "".join(s.get("utf8", "") for s in segs).strip()
+        if not text or text == "\n":
+            continue
+        entries.append(TranscriptEntry(
+            text=text,
+            start=event.get("tStartMs", 0) / 1000,
+            duration=event.get("dDurationMs", 0) / 1000,
+        ))
+    return entries
+
+
+def _peak(fn, path: str) -> int:
+    gc.collect()
+    tracemalloc.start()
+    fn(path)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak
+
+
+def _best_of(fn, path: str, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        gc.collect()
+        t0 = time.perf_counter()
+        fn(path)
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--hours", type=float, default=4.0)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--check", action="store_true", help="só as conferências, sem medir tempo")
+    args = parser.parse_args()
+
+    failures = check_chunked()
+    print(f"blocos de 1 a 64 vs. json.loads: {'ok' if not failures else f'{failures} divergências'}")
+    if args.check:
+        sys.exit(1 if failures else 0)
+
+    fd, path = tempfile.mkstemp(suffix=".json3")
+    os.close(fd)
+    try:
+        size = write_json3(path, args.hours)
+        before = _parse_with_load(path)
+        after = parse_json3(path)
+        assert after == before, "os parsers divergiram"
+        print(f"fixture: live de {args.hours:g}h, {size / 1e6:.1f} MB, {len(after)} entradas")
+
+        rows = [
+            ("antes (json.load)", _parse_with_load),
+            ("depois (streaming)", parse_json3),
+        ]
+        for label, fn in rows:
+            seconds = _best_of(fn, path, args.repeat)
+            peak = _peak(fn, path)
+            print(
+                f"{label:<20} tempo={seconds * 1000:8.1f}ms  "
+                f"vazão={size / seconds / 1e6:6.1f} MB/s  pico={peak / 1e6:7.2f} MB"
+            )
+    finally:
+        os.remove(path)
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
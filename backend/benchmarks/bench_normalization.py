@@ -0,0 +1,146 @@
+"""Micro-benchmark da normalização: passes sequenciais vs. varredura única.
+
+Compara `NormalizationService.normalize` com a implementação de referência
+— os 12 padrões de ruído aplicados um a um com `sub` e os 8 de CTA
+testados um a um em cada sentença — sobre uma transcrição sintética de
+~100 mil caracteres, e confere que a saída é idêntica:
+
+- no corpus golden (`benchmarks/fixtures/normalization_golden.jsonl`,
+  entradas e saídas geradas pela implementação sequencial)
+- na própria transcrição sintética
+
+Também confere a remoção de ruído em janelas contra a sequencial sobre as
+entradas do corpus (independe das saídas gravadas, vale depois de mudar os
+padrões) e se a conferência feita na importação não a desativou. Com
+`--check`, só roda as conferências — serve de verificação em CI; o código
+de saída é 1 se houver divergência.
+
+Uso (de dentro de backend/):
+    python -m benchmarks.bench_normalization --chars 100000
+    python -m benchmarks.bench_normalization --check
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import random
+import re
+import sys
+import time
+
+from app.services.normalization_service import (
+    _CTA_PATTERNS,
+    _NOISE_PATTERNS,
+    NormalizationService,
+    _noise_superset_problem,
+)
+
+GOLDEN_PATH = os.path.join(os.path.dirname(__file__), "fixtures", "normalization_golden.jsonl")
+
+_WORDS = (
+    "hoje vamos falar do jogo entre flamengo e palmeiras a odd está muito boa para o over "
+    "de gols é o time da casa vem de três vitórias seguidas e o visitante tem desfalques "
+    "importantes no meio campo então eu gosto da aposta no escanteio também"
+).split()
+_NOISE = [
+    "[Música]", "[Aplausos]", "uh", "ahh", "hmm", "é é", "Capítulo 3: Análise do jogo\n",
+    "[limpando a garganta]", "8:228 minutos e 22 segundos", "12 minutos", "3 horas", "5:01",
+    "se inscreva no canal", "curta o vídeo", "link na descrição", "telegram do grupo vip", "[risos]",
+]
+
+
+def reference_normalize(raw_text: str) -> str:
+    """Implementação sequencial: um `sub` por padrão, um `search` por CTA."""
+    text = NormalizationService()._fix_encoding(raw_text)
+    for pattern in _NOISE_PATTERNS:
+        text = pattern.sub(" ", text)
+    sentences = re.split(r"(?<=[.!?])\s+", text)
+    text = " ".join(s for s in sentences if not any(p.search(s) for p in _CTA_PATTERNS))
+    return re.sub(r"\s{2,}", " ", text).strip()
+
+
+def synthetic_transcript(chars: int, seed: int = 3) -> str:
+    rng = random.Random(seed)
+    parts: list[str] = []
+    size = 0
+    while size < chars:
+        chunk = " ".join(rng.choices(_WORDS, k=rng.randint(4, 14)))
+        if rng.random() < 0.3:
+            chunk += " " + rng.choice(_NOISE)
+        chunk += rng.choice([". ", "! ", "? ", " ", ", "])
+        parts.append(chunk)
+        size += len(chunk)
+    return "".join(parts)
+
+
+def check_golden(service: NormalizationService) -> int:
+    failures = 0
+    with open(GOLDEN_PATH, encoding="utf-8") as f:
+        for line in f:
+            case = json.loads(line)
+            if service.normalize(case["input"]) != case["expected"]:
+                failures += 1
+                print(f"divergência: {case['input']!r}")
+    return failures
+
+
+def check_windowed(service: NormalizationService, texts: list[str]) -> int:
+    """Remoção em janelas vs. sequencial (as extensões cobrem os padrões?)."""
+    failures = 0
+    problem = _noise_superset_problem()
+    if problem:
+        failures += 1
+        print(f"conferência da importação: {problem}")
+    for text in texts:
+        if service._remove_noise_windowed(text) != service._remove_noise_sequential(text):
+            failures += 1
+            print(f"janelas divergem da sequencial: {text!r}")
+    return failures
+
+
+def _golden_inputs() -> list[str]:
+    with open(GOLDEN_PATH, encoding="utf-8") as f:
+        return [json.loads(line)["input"] for line in f]
+
+
+def _best_of(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--chars", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--check", action="store_true", help="só as conferências, sem medir tempo")
+    args = parser.parse_args()
+
+    service = NormalizationService()
+    failures = check_golden(service)
+    print(f"corpus golden: {'ok' if not failures else f'{failures} divergências'}")
+
+    text = synthetic_transcript(args.chars)
+    windowed = check_windowed(service, [*_golden_inputs(), text])
+    print(f"janelas vs. sequencial: {'ok' if not windowed else f'{windowed} divergências'}")
+    failures += windowed
+    if reference_normalize(text) != service.normalize(text):
+        print("divergência na transcrição sintética")
+        failures += 1
+    if args.check:
+        sys.exit(1 if failures else 0)
+
+    before = _best_of(lambda: reference_normalize(text), args.repeat)
+    after = _best_of(lambda: service.normalize(text), args.repeat)
+    print(f"transcrição de {len(text)} caracteres")
+    print(f"antes (sequencial)      {before * 1000:8.2f} ms")
+    print(f"depois (varredura única) {after * 1000:7.2f} ms  ({before / after:.1f}x)")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""Benchmark: entradas de transcrição em objetos vs. em colunas.
+
+Sobre a fixture de uma live longa (`benchmarks.long_stream_fixture`),
+compara a representação antiga — uma lista de dataclasses `TranscriptEntry`
+com `__dict__` e `full_text` refeito a cada acesso — com `TranscriptEntries`
+(arrays de float + um buffer de texto com offsets):
+
+- memória retida pelas entradas (tracemalloc)
+- tempo para montar as entradas a partir do JSON (`entries_json`/proxy)
+- tempo de `full_text` e de `SegmentationService.segment_by_entries`
+
+Uso (de dentro de backend/):
+    python -m benchmarks.bench_transcript_entries --hours 4
+"""
+from __future__ import annotations
+
+import argparse
+import gc
+import time
+import tracemalloc
+from dataclasses import dataclass
+
+from app.services.segmentation_service import SegmentationService
+from app.services.transcript_service import TranscriptEntries, entries_from_json
+from benchmarks.long_stream_fixture import generate_events
+
+
+@dataclass
+class _DictEntry:
+    """Como o TranscriptEntry era antes: dataclass comum, com __dict__."""
+    text: str
+    start: float
+    duration: float
+
+    @property
+    def end(self) -> float:
+        return self.start + self.duration
+
+
+def _entries_json(hours: float) -> list[dict]:
+    rows = []
+    for event in generate_events(hours):
+        segs = event.get("segs")
+        if not segs:
+            continue
+        text = "".join(s.get("utf8", "") for s in segs).strip()
+        if text:
+            rows.append({"text": text, "start": event["tStartMs"] / 1000, "duration": event.get("dDurationMs", 0) / 1000})
+    return rows
+
+
+def _build_objects(rows: list[dict]) -> list[_DictEntry]:
+    return [_DictEntry(text=r["text"], start=r["start"], duration=r["duration"]) for r in rows]
+
+
+def _retained(build, rows: list[dict]) -> tuple[object, int]:
+    # Os textos dos `rows` já existem; mede só o que a representação acrescenta
+    gc.collect()
+    tracemalloc.start()
+    result = build(rows)
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, current
+
+
+def _best_of(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--hours", type=float, default=4.0)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    rows = _entries_json(args.hours)
+    print(f"fixture: live de {args.hours:g}h, {len(rows)} entradas")
+
+    objects, objects_mem = _retained(_build_objects, rows)
+    columns, columns_mem = _retained(entries_from_json, rows)
+    assert isinstance(columns, TranscriptEntries)
+    assert " ".join(e.text for e in objects) == columns.text
+
+    seg = SegmentationService()
+    normalized = columns.text
+    results = [
+        ("memória retida", f"{objects_mem / 1e6:8.2f} MB", f"{columns_mem / 1e6:8.2f} MB"),
+        (
+            "montagem do JSON",
+            f"{_best_of(lambda: _build_objects(rows), args.repeat) * 1000:8.1f} ms",
+            f"{_best_of(lambda: entries_from_json(rows), args.repeat) * 1000:8.1f} ms",
+        ),
+        (
+            "full_text",
+            f"{_best_of(lambda: ' '.join(e.text for e in objects), args.repeat) * 1000:8.2f} ms",
+            f"{_best_of(lambda: columns.text, args.repeat) * 1000:8.4f} ms",
+        ),
+        (
+            "segmentação",
+            f"{_best_of(lambda: seg.segment_by_entries(objects, normalized), args.repeat) * 1000:8.1f} ms",
+            f"{_best_of(lambda: seg.segment_by_entries(columns, normalized), args.repeat) * 1000:8.1f} ms",
+        ),
+    ]
+    print(f"{'':<18}{'objetos':>14}{'colunas':>14}")
+    for label, before, after in results:
+        print(f"{label:<18}{before:>14}{after:>14}")
+
+
+if __name__ == "__main__":
+    main()
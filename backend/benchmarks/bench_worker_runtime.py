@@ -0,0 +1,93 @@
+"""Benchmark do overhead por task no worker Celery.
+
+Compara o modelo antigo (loop novo + engine novo a cada task, que é o
+único jeito seguro de usar asyncpg com um loop por task) com o runtime
+persistente (`app.workers.runtime`: um loop e um pool por processo).
+
+Cada "task" abre uma sessão e executa `SELECT 1`, isolando o custo de
+infraestrutura do trabalho real.
+
+Uso (de dentro de backend/, com o Postgres do docker-compose no ar):
+    python -m benchmarks.bench_worker_runtime --tasks 200
+    python -m benchmarks.bench_worker_runtime --loop-only   # sem banco
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import statistics
+import time
+
+from sqlalchemy import text
+
+
+async def _noop() -> None:
+    await asyncio.sleep(0)
+
+
+async def _select_one() -> None:
+    from app.core.database import AsyncSessionLocal
+
+    async with AsyncSessionLocal() as db:
+        await db.execute(text("SELECT 1"))
+
+
+def _per_task_loop(n: int, with_db: bool) -> list[float]:
+    """Modelo antigo: loop e engine descartáveis por task."""
+    from app.core import database
+
+    timings = []
+    for _ in range(n):
+        t0 = time.perf_counter()
+        loop = asyncio.new_event_loop()
+        try:
+            if with_db:
+                database.reset_engine()
+                loop.run_until_complete(_select_one())
+                loop.run_until_complete(database.engine.dispose())
+            else:
+                loop.run_until_complete(_noop())
+        finally:
+            loop.close()
+        timings.append(time.perf_counter() - t0)
+    return timings
+
+
+def _persistent_loop(n: int, with_db: bool) -> list[float]:
+    """Modelo novo: runtime do worker com loop e pool persistentes."""
+    from app.workers import runtime
+
+    runtime.start()
+    timings = []
+    try:
+        for _ in range(n):
+            t0 = time.perf_counter()
+            runtime.run(_select_one() if with_db else _noop())
+            timings.append(time.perf_counter() - t0)
+    finally:
+        runtime.shutdown()
+    return timings
+
+
+def _report(label: str, timings: list[float]) -> None:
+    ms = sorted(t * 1000 for t in timings)
+    p95 = ms[int(len(ms) * 0.95) - 1] if len(ms) > 1 else ms[0]
+    print(
+        f"{label:<22} n={len(ms):<5} média={statistics.mean(ms):8.3f}ms "
+        f"mediana={statistics.median(ms):8.3f}ms p95={p95:8.3f}ms"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tasks", type=int, default=200)
+    parser.add_argument("--loop-only", action="store_true", help="mede só o custo do event loop, sem banco")
+    args = parser.parse_args()
+
+    with_db = not args.loop_only
+    _report("antes (loop por task)", _per_task_loop(args.tasks, with_db))
+    _report("depois (persistente)", _persistent_loop(args.tasks, with_db))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""Benchmark: cliente HTTP por chamada vs. cliente compartilhado.
+
+Executa um ciclo de monitoramento sintético (`fetch_new_videos` para N
+canais, com concorrência limitada) contra a API fake local
+(`benchmarks.fake_youtube_api`) de duas formas:
+
+- antes: um `httpx.AsyncClient` novo por chamada (conexão nova a cada vez)
+- depois: o cliente compartilhado de `app.core.http` (keep-alive)
+
+Em HTTP local não há TLS, então o ganho medido aqui é só o do TCP; contra
+a API real, cada conexão nova também paga o handshake TLS.
+
+Uso (de dentro de backend/):
+    python -m benchmarks.bench_youtube_client --channels 200 --concurrency 8
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import time
+from unittest import mock
+
+import httpx
+
+from app.core.config import settings
+from app.core.http import close_http_client
+from benchmarks.fake_youtube_api import FakeYouTubeAPI
+
+
+async def _cycle(channels: int, concurrency: int) -> float:
+    from app.services.youtube_service import YouTubeService
+
+    service = YouTubeService()
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(i: int) -> None:
+        async with semaphore:
+            await service.fetch_new_videos(f"UCbench{i:017d}")
+
+    t0 = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(channels)))
+    return time.perf_counter() - t0
+
+
+async def _per_call_client(channels: int, concurrency: int) -> float:
+    """Simula o comportamento antigo: um cliente novo (e fechado) por request."""
+
+    class _OneShot:
+        async def get(self, *args, **kwargs):
+            async with httpx.AsyncClient(timeout=15) as client:
+                return await client.get(*args, **kwargs)
+
+    with mock.patch("app.services.youtube_service.get_http_client", lambda: _OneShot()):
+        return await _cycle(channels, concurrency)
+
+
+async def _shared_client(channels: int, concurrency: int) -> float:
+    try:
+        await _cycle(1, 1)  # aquece o pool
+        return await _cycle(channels, concurrency)
+    finally:
+        await close_http_client()
+
+
+async def _no_quota_record(self, endpoint: str, calls: int = 1) -> None:
+    """O benchmark não precisa de Redis: o ledger de quota é desligado."""
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--channels", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=8)
+    args = parser.parse_args()
+
+    with FakeYouTubeAPI() as api, mock.patch(
+        "app.services.youtube_quota_service.YouTubeQuotaLedger.record", _no_quota_record
+    ):
+        settings.YOUTUBE_API_BASE_URL = api.base_url
+        settings.YOUTUBE_API_KEY = settings.YOUTUBE_API_KEY or "bench"
+        before = asyncio.run(_per_call_client(args.channels, args.concurrency))
+        after = asyncio.run(_shared_client(args.channels, args.concurrency))
+
+    requests = args.channels * 2
+    for label, elapsed in (("antes (cliente/chamada)", before), ("depois (compartilhado)", after)):
+        print(f"{label:<24} {elapsed * 1000:9.1f}ms  {requests / elapsed:8.1f} req/s")
+    print(f"speedup: {before / after:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
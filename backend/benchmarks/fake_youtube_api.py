@@ -0,0 +1,131 @@
+"""Servidor local que imita a YouTube Data API v3 (para benchmarks).
+
+Responde `channels.list`, `playlistItems.list` e `videos.list` com dados sintéticos e
+determinísticos (playlistItems honra `If-None-Match` com 304). Roda em uma thread, na porta indicada (0 = livre):
+
+    with FakeYouTubeAPI() as api:
+        settings.YOUTUBE_API_BASE_URL = api.base_url
+        ...
+
+Também pode rodar sozinho: `python -m benchmarks.fake_youtube_api 8089`.
+"""
+from __future__ import annotations
+
+import json
+import sys
+import threading
+import urllib.parse
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+VIDEOS_PER_CHANNEL = 120
+_EPOCH = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+
+def _uploads_id(channel_id: str) -> str:
+    return "UU" + channel_id[2:]
+
+
+def _playlist_item(playlist_id: str, index: int) -> dict:
+    video_id = f"{playlist_id[-6:]}{index:05d}"
+    published = (_EPOCH - timedelta(hours=index)).isoformat().replace("+00:00", "Z")
+    return {
+        "kind": "youtube#playlistItem",
+        "etag": f"etag-{video_id}",
+        "snippet": {
+            "publishedAt": published,
+            "title": f"Vídeo {index} de {playlist_id}",
+            "description": "Análise dos jogos do dia. " * 20,
+            "thumbnails": {"high": {"url": f"https://i.ytimg.com/vi/{video_id}/hqdefault.jpg"}},
+            "resourceId": {"kind": "youtube#video", "videoId": video_id},
+        },
+        "contentDetails": {"videoId": video_id, "videoPublishedAt": published},
+    }
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive
+
+    def do_GET(self):
+        url = urllib.parse.urlparse(self.path)
+        params = {k: v[0] for k, v in urllib.parse.parse_qs(url.query).items()}
+        endpoint = url.path.rstrip("/").rsplit("/", 1)[-1]
+
+        if endpoint == "channels":
+            channel_id = params.get("id") or "UC" + params.get("forHandle", "handle").ljust(22, "x")
+            body = {"items": [{
+                "id": channel_id,
+                "contentDetails": {"relatedPlaylists": {"uploads": _uploads_id(channel_id)}},
+            }]}
+        elif endpoint == "playlistItems":
+            playlist_id = params["playlistId"]
+            max_results = int(params.get("maxResults", 5))
+            start = int(params.get("pageToken") or 0)
+            end = min(start + max_results, VIDEOS_PER_CHANNEL)
+            body = {
+                "etag": f"etag-{playlist_id}-{start}",
+                "items": [_playlist_item(playlist_id, i) for i in range(start, end)],
+            }
+            if end < VIDEOS_PER_CHANNEL:
+                body["nextPageToken"] = str(end)
+        elif endpoint == "videos":
+            body = {"items": [
+                {
+                    "id": video_id,
+                    "snippet": {"liveBroadcastContent": "none"},
+                    "contentDetails": {"duration": f"PT{len(video_id)}M30S", "caption": "true"},
+                }
+                for video_id in params.get("id", "").split(",") if video_id
+            ]}
+        else:
+            self.send_response(404)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        etag = body.get("etag")
+        if etag and self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        payload = json.dumps(body).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json; charset=UTF-8")
+        if etag:
+            self.send_header("ETag", etag)
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class FakeYouTubeAPI:
+    def __init__(self, host: str = "127.0.0.1", port: int = 0):
+        self.server = ThreadingHTTPServer((host, port), _Handler)
+        self.server.daemon_threads = True
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}/youtube/v3"
+
+    def __enter__(self) -> "FakeYouTubeAPI":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+
+
+if __name__ == "__main__":
+    port = int(sys.argv[1]) if len(sys.argv) > 1 else 8089
+    api = FakeYouTubeAPI(port=port)
+    print(f"API fake do YouTube em {api.base_url}")
+    api.server.serve_forever()
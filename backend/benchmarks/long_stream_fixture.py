@@ -0,0 +1,54 @@
+"""Fixture sintética de uma live longa, no formato json3 do yt-dlp.
+
+Gera de forma determinística (semente fixa) os eventos de legenda
+automática de uma transmissão de N horas: um evento de janela no início,
+eventos com `segs` palavra a palavra (com `tOffsetMs`) e eventos de
+quebra de linha (`aAppend`), como o YouTube produz. Uma live de 4 horas
+tem ~29 mil eventos com texto e ocupa alguns MB — por isso é gerada em
+vez de versionada.
+"""
+from __future__ import annotations
+
+import json
+import random
+
+_WORDS = (
+    "hoje vamos falar do jogo entre flamengo e palmeiras a odd está muito boa "
+    "para o over de gols o time da casa vem de três vitórias seguidas e o "
+    "visitante tem desfalques importantes no meio campo então eu gosto da "
+    "aposta no escanteio também pessoal deixa o like e se inscreve no canal"
+).split()
+
+
+def generate_events(hours: float = 4.0, seed: int = 42) -> list[dict]:
+    rng = random.Random(seed)
+    events: list[dict] = [{"tStartMs": 0, "dDurationMs": int(hours * 3_600_000), "id": 1, "wpWinPosId": 1, "wsWinStyleId": 1}]
+    t = 0
+    end = int(hours * 3_600_000)
+    while t < end:
+        duration = rng.randint(1200, 3800)
+        words = rng.choices(_WORDS, k=rng.randint(2, 9))
+        segs = [{"utf8": words[0], "acAsrConf": 0}]
+        offset = 0
+        for word in words[1:]:
+            offset += rng.randint(150, 400)
+            segs.append({"utf8": " " + word, "tOffsetMs": offset, "acAsrConf": 0})
+        events.append({"tStartMs": t, "dDurationMs": duration, "wWinId": 1, "segs": segs})
+        events.append({"tStartMs": t + duration - 10, "wWinId": 1, "aAppend": 1, "segs": [{"utf8": "\n"}]})
+        t += rng.randint(400, 1000)
+    return events
+
+
+def write_json3(path: str, hours: float = 4.0, seed: int = 42) -> int:
+    """Grava a fixture em `path` e retorna o tamanho em bytes."""
+    data = {
+        "wireMagic": "pb3",
+        "pens": [{}],
+        "wsWinStyles": [{}, {"mhModeHint": 2, "juJustifCode": 0, "sdScrollDir": 3}],
+        "wpWinPositions": [{}, {"apPoint": 6, "ahHorPos": 20, "avVerPos": 100, "rcRows": 2, "ccCols": 40}],
+        "events": generate_events(hours, seed),
+    }
+    payload = json.dumps(data, ensure_ascii=False, separators=(",", ":"))
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(payload)
+    return len(payload.encode("utf-8"))
@@ -1,17 +1,24 @@
+import logging
 from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from app.core.config import settings
 from app.api.v1.router import api_router
 from app.core.database import AsyncSessionLocal
+from app.core.http import close_http_client
+from app.core.redis import close_redis
 from app.utils.seed import run_seed
 
+logger = logging.getLogger(__name__)
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     async with AsyncSessionLocal() as db:
         await run_seed(db)
     yield
+    await close_http_client()
+    await close_redis()
 
 
 app = FastAPI(
@@ -35,3 +42,20 @@ app.include_router(api_router)
 @app.get("/health")
 async def health():
     return {"status": "ok", "version": "1.0.0"}
+
+
+@app.get("/health/transcript-sources")
+async def transcript_sources_health():
+    """Estado dos circuit breakers das fontes de transcrição (compartilhado pelos workers)."""
+    from app.services.transcript_service import SOURCES, source_breaker
+
+    sources = {}
+    for name in SOURCES:
+        try:
+            sources[name] = await source_breaker(name).snapshot()
+        except Exception as exc:
+            # Sem Redis o estado dos breakers é desconhecido; o health não deve virar 500
+            logger.warning("Estado do breaker da fonte %s indisponível: %s", name, exc)
+            sources[name] = {"state": "unknown", "error": str(exc)}
+    degraded = any(s["state"] != "closed" for s in sources.values())
+    return {"status": "degraded" if degraded else "ok", "sources": sources}
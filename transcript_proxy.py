@@ -2,12 +2,31 @@
 Proxy local de transcrição do YouTube.
 Roda no Windows (IP residencial) e recebe chamadas do Docker container.
 
-Uso: python transcript_proxy.py
+Uso: python transcript_proxy.py [--port 8001] [--workers 4] [--cache-size 500]
 Porta: 8001
+
+Endpoints:
+  GET /transcript/VIDEO_ID        uma transcrição (JSON)
+  GET /transcripts?ids=A,B,C      lote (até 50 ids); responde NDJSON em
+                                  streaming, uma linha por vídeo, na ordem
+                                  em que ficam prontas
+
+Cada requisição roda numa thread própria; os vídeos de um lote são
+buscados em paralelo por um pool de `--workers` threads. As transcrições
+recentes ficam num LRU em memória e as respostas saem com gzip quando o
+cliente aceita.
 """
-from http.server import HTTPServer, BaseHTTPRequestHandler
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import argparse
 import json
+import threading
 import urllib.parse
+import zlib
+
+MAX_BATCH = 50
+
 
 def get_transcript(video_id: str) -> dict:
     try:
@@ -49,28 +68,120 @@ def get_transcript(video_id: str) -> dict:
         return {"error": str(e)}
 
 
+class TranscriptLRU:
+    """LRU thread-safe com as transcrições (e "no_transcript") mais recentes."""
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self._items: OrderedDict[str, dict] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, video_id: str) -> dict | None:
+        with self._lock:
+            result = self._items.get(video_id)
+            if result is not None:
+                self._items.move_to_end(video_id)
+            return result
+
+    def put(self, video_id: str, result: dict) -> None:
+        # Erros transitórios (bloqueio, rede) não são guardados
+        if "error" in result and result["error"] != "no_transcript":
+            return
+        with self._lock:
+            self._items[video_id] = result
+            self._items.move_to_end(video_id)
+            while len(self._items) > self.capacity:
+                self._items.popitem(last=False)
+
+
+cache = TranscriptLRU(500)
+pool: ThreadPoolExecutor | None = None
+
+
+def cached_transcript(video_id: str) -> dict:
+    result = cache.get(video_id)
+    if result is None:
+        result = get_transcript(video_id)
+        cache.put(video_id, result)
+    return result
+
+
 class Handler(BaseHTTPRequestHandler):
     def do_GET(self):
-        parts = self.path.strip("/").split("/")
+        url = urllib.parse.urlparse(self.path)
+        parts = url.path.strip("/").split("/")
         if len(parts) == 2 and parts[0] == "transcript":
             video_id = urllib.parse.unquote(parts[1])
-            result = get_transcript(video_id)
-            body = json.dumps(result).encode()
-            self.send_response(200)
-            self.send_header("Content-Type", "application/json")
-            self.send_header("Content-Length", str(len(body)))
-            self.end_headers()
-            self.wfile.write(body)
+            self._send_json(cached_transcript(video_id))
+        elif parts == ["transcripts"]:
+            params = urllib.parse.parse_qs(url.query)
+            ids = [i for raw in params.get("ids", []) for i in raw.split(",") if i]
+            ids = list(dict.fromkeys(ids))
+            if not ids or len(ids) > MAX_BATCH:
+                self._send_json({"error": f"informe de 1 a {MAX_BATCH} ids"}, status=400)
+                return
+            self._stream_batch(ids)
         else:
             self.send_response(404)
+            self.send_header("Content-Length", "0")
             self.end_headers()
 
+    def _accepts_gzip(self) -> bool:
+        return "gzip" in self.headers.get("Accept-Encoding", "")
+
+    def _send_json(self, result: dict, status: int = 200):
+        body = json.dumps(result).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        if self._accepts_gzip():
+            compressor = zlib.compressobj(6, zlib.DEFLATED, 31)   # 31 = formato gzip
+            body = compressor.compress(body) + compressor.flush()
+            self.send_header("Content-Encoding", "gzip")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _stream_batch(self, ids: list[str]):
+        """Uma linha NDJSON por vídeo, enviada assim que a transcrição fica pronta."""
+        gzip = self._accepts_gzip()
+        compressor = zlib.compressobj(6, zlib.DEFLATED, 31) if gzip else None
+        self.send_response(200)
+        self.send_header("Content-Type", "application/x-ndjson")
+        if gzip:
+            self.send_header("Content-Encoding", "gzip")
+        # Sem Content-Length: o fim da resposta é o fechamento da conexão
+        self.send_header("Connection", "close")
+        self.end_headers()
+        self.close_connection = True
+
+        futures = {pool.submit(cached_transcript, video_id): video_id for video_id in ids}
+        try:
+            for future in as_completed(futures):
+                line = json.dumps({"video_id": futures[future], **future.result()}).encode() + b"\n"
+                if compressor:
+                    # Z_SYNC_FLUSH: o cliente descomprime cada linha sem esperar o fim
+                    line = compressor.compress(line) + compressor.flush(zlib.Z_SYNC_FLUSH)
+                self.wfile.write(line)
+                self.wfile.flush()
+            if compressor:
+                self.wfile.write(compressor.flush())
+        except (BrokenPipeError, ConnectionResetError):
+            for future in futures:
+                future.cancel()
+
     def log_message(self, format, *args):
         print(f"[proxy] {args[0]} {args[1]}")
 
 
 if __name__ == "__main__":
     import sys
+
+    parser = argparse.ArgumentParser(description="Proxy local de transcrição do YouTube")
+    parser.add_argument("--port", type=int, default=8001)
+    parser.add_argument("--workers", type=int, default=4, help="vídeos buscados em paralelo por lote")
+    parser.add_argument("--cache-size", type=int, default=500, help="transcrições mantidas em memória")
+    args = parser.parse_args()
+
     # Instala dependência se necessário
     try:
         from youtube_transcript_api import YouTubeTranscriptApi
@@ -79,8 +190,11 @@ if __name__ == "__main__":
         subprocess.check_call([sys.executable, "-m", "pip", "install", "youtube-transcript-api"])
         from youtube_transcript_api import YouTubeTranscriptApi
 
-    port = 8001
-    server = HTTPServer(("0.0.0.0", port), Handler)
-    print(f"Proxy de transcrição rodando na porta {port}")
-    print(f"Docker acessa via: http://host.docker.internal:{port}/transcript/VIDEO_ID")
+    cache = TranscriptLRU(args.cache_size)
+    pool = ThreadPoolExecutor(max_workers=args.workers)
+    server = ThreadingHTTPServer(("0.0.0.0", args.port), Handler)
+    server.daemon_threads = True
+    print(f"Proxy de transcrição rodando na porta {args.port}")
+    print(f"Docker acessa via: http://host.docker.internal:{args.port}/transcript/VIDEO_ID")
+    print(f"Lotes via: http://host.docker.internal:{args.port}/transcripts?ids=ID1,ID2")
     server.serve_forever()